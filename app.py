@@ -3,14 +3,20 @@ Web Scraper Pro V2 - Fluid Pipeline
 Universal scraping → Domain finding → Data enrichment (seamless flow)
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, render_template, request, jsonify, send_file, session, Response
 from flask_cors import CORS
 import os
 import json
 import threading
 import time
+import queue
+import uuid
+import multiprocessing
 from datetime import datetime
 import pandas as pd
+import config
+from job_scheduler import get_job_scheduler, SchedulerFull, JobCancelled
+from state_store import get_state_store, STAGES
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -20,60 +26,194 @@ CORS(app)
 OUTPUT_FOLDER = 'output'
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-# Global state - Pipeline data in memory
-pipeline_data = {
-    'companies': [],  # From scraping
-    'domains': [],    # From domain finder
-    'enriched': []    # From enrichment
-}
-
-# Job tracking
+# Pre-launch browsers and parsing workers so the first jobs don't pay the cold start
+# (not in the parsing workers themselves: spawn/forkserver re-import this module)
+if multiprocessing.parent_process() is None:
+    if config.DRIVER_POOL_WARM:
+        from universal_scraper import get_universal_driver_pool
+        get_universal_driver_pool().warm(config.DRIVER_POOL_WARM)
+    if config.PARSE_POOL_WARM:
+        from parsing_service import get_parsing_service
+        get_parsing_service().warm()
+
+# Pipeline stage datasets and jobs live in the state store (SQLite by default):
+# they survive restarts and are shared by every gunicorn worker
+state = get_state_store()
+
+# Trackers of the jobs queued or running in this process (writers + SSE subscribers)
 jobs = {}
 job_lock = threading.Lock()
 
+# Live result rows of a running job (SSE 'rows' events): batch size / max delay
+ROWS_FLUSH_SIZE = 50
+ROWS_FLUSH_SECONDS = 1.0
+
+
+class _Subscriber:
+    """Bounded event queue of one SSE client (overflow = client must resume)"""
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
 
 class JobTracker:
-    """Track job progress with in-memory data"""
+    """
+    Progress of a job run by this process, written through to the state store
+
+    Every change bumps `seq`: clients poll with ?since=<last seq> and only get
+    the new logs and rows (state.job_delta), the rows themselves are paginated
+    through /api/jobs/<job_id>/data. Any worker answers those from the store.
+    Changes are also pushed as events to the SSE subscribers of this process
+    (/api/jobs/<job_id>/events), with seq as event id.
+
+    Jobs wait in the scheduler as 'queued' (queue_position = place in line)
+    until a worker of their pool is free. A cancelled running job stops at
+    its next progress update (update raises JobCancelled).
+    """
     def __init__(self, job_id, job_type):
         self.job_id = job_id
         self.job_type = job_type
-        self.status = 'running'
+        self.status = 'queued'
+        self.queue_position = None
+        self.cancel_requested = False
+        self._cancel_checked_at = 0
         self.progress = 0
         self.total = 0
         self.current_item = ''
         self.results = {}
-        self.data = []  # Store results in memory
+        self.rows_total = 0
         self.error = None
         self.started_at = datetime.now()
         self.completed_at = None
-        self.logs = []
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._subscribers = []
+        state.create_job(job_id, job_type)
+
+    def _bump(self):
+        """Next sequence number (lock held)"""
+        self.seq += 1
+        return self.seq
+
+    def _publish(self, event_type, payload):
+        """Push the change of the current seq to every subscriber (lock held)"""
+        event = (self.seq, event_type, payload)
+        for subscriber in self._subscribers:
+            subscriber.push(event)
+
+    def subscribe(self):
+        with self._lock:
+            subscriber = _Subscriber(config.SSE_QUEUE_SIZE)
+            self._subscribers.append(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def set_queue_position(self, position):
+        with self._lock:
+            if self.status != 'queued' or not position or position == self.queue_position:
+                return
+            self.queue_position = position
+            state.update_job(self.job_id, queue_position=position, seq=self._bump())
+            self._publish('queue', {'status': self.status, 'queue_position': position})
+
+    def start(self):
+        """Leave the queue (False when the job was cancelled meanwhile, from any worker)"""
+        with self._lock:
+            if self.status != 'queued':
+                return False
+            self.started_at = datetime.now()
+            if not state.start_job(self.job_id, self._bump(), self.started_at.isoformat()):
+                self.status = 'cancelled'
+                self._publish_status()
+                return False
+            self.status = 'running'
+            self.queue_position = 0
+            self._publish('queue', {'status': self.status, 'queue_position': 0})
+            return True
+
+    def request_cancel(self):
+        self.cancel_requested = True
+
+    def check_cancelled(self):
+        # Cancellation may come from another worker: the store is checked once per second
+        if not self.cancel_requested and time.monotonic() - self._cancel_checked_at >= 1:
+            self._cancel_checked_at = time.monotonic()
+            self.cancel_requested = state.is_cancel_requested(self.job_id)
+        if self.cancel_requested:
+            raise JobCancelled("Job cancelled")
 
     def update(self, progress, total, current_item=''):
-        self.progress = progress
-        self.total = total
-        self.current_item = current_item
+        self.check_cancelled()
+        with self._lock:
+            self.progress = progress
+            self.total = total
+            self.current_item = current_item
+            state.update_job(self.job_id, progress=progress, total=total, current_item=current_item,
+                             seq=self._bump())
+            self._publish('progress', {'progress': progress, 'total': total, 'current_item': current_item})
 
     def add_log(self, message, level='info'):
-        self.logs.append({
-            'timestamp': datetime.now().isoformat(),
-            'level': level,
-            'message': message
-        })
+        with self._lock:
+            entry = {
+                'seq': self._bump(),
+                'timestamp': datetime.now().isoformat(),
+                'level': level,
+                'message': message
+            }
+            state.append_log(self.job_id, entry)
+            self._publish('log', entry)
+
+    def add_rows(self, rows):
+        """Append result rows while the job runs"""
+        rows = list(rows)
+        with self._lock:
+            offset = self.rows_total
+            self.rows_total += len(rows)
+            state.append_job_rows(self.job_id, rows, offset, self._bump())
+            self._publish('rows', {'rows': rows, 'offset': offset, 'total': self.rows_total})
 
     def complete(self, results, data=None):
-        self.status = 'completed'
-        self.progress = self.total
-        self.results = results
-        if data:
-            self.data = data
-        self.completed_at = datetime.now()
+        with self._lock:
+            if data:
+                self.rows_total = len(data)
+                state.replace_job_rows(self.job_id, data, self._bump())
+            self.status = 'completed'
+            self.progress = self.total
+            self.results = results
+            self.completed_at = datetime.now()
+            self._save_status()
+            self._publish_status(rows_reset=bool(data))
 
     def fail(self, error):
-        self.status = 'failed'
-        self.error = str(error)
-        self.completed_at = datetime.now()
-
-    def to_dict(self):
+        with self._lock:
+            self.status = 'cancelled' if isinstance(error, JobCancelled) else 'failed'
+            self.error = str(error)
+            self.completed_at = datetime.now()
+            self._save_status()
+            self._publish_status()
+
+    def _save_status(self):
+        """Write the final state (lock held)"""
+        state.update_job(
+            self.job_id, status=self.status, progress=self.progress, results=self.results, error=self.error,
+            completed_at=self.completed_at.isoformat(), seq=self._bump()
+        )
+
+    def _publish_status(self, rows_reset=False):
+        """Final event: summary + row count (rows are fetched from the data endpoint)"""
+        self._publish('status', {**self._summary(), 'rows_total': self.rows_total, 'rows_reset': rows_reset})
+
+    def _summary(self):
         return {
             'job_id': self.job_id,
             'job_type': self.job_type,
@@ -82,14 +222,83 @@ class JobTracker:
             'total': self.total,
             'current_item': self.current_item,
             'results': self.results,
-            'data': self.data,  # IMPORTANT: Include data in response
             'error': self.error,
+            'queue_position': self.queue_position,
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'logs': self.logs[-50:]
+            'seq': self.seq
         }
 
 
+class _RowBatcher:
+    """
+    Result rows produced one at a time by a job, passed to tracker.add_rows in
+    batches (every ROWS_FLUSH_SIZE rows or ROWS_FLUSH_SECONDS). Fed from the job
+    thread only (bulk result callbacks run in the consuming loop)
+    """
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self._rows = []
+        self._flushed_at = time.monotonic()
+
+    def add(self, *rows):
+        self._rows.extend(rows)
+        if len(self._rows) >= ROWS_FLUSH_SIZE or time.monotonic() - self._flushed_at >= ROWS_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self.tracker.add_rows(self._rows)
+            self._rows = []
+        self._flushed_at = time.monotonic()
+
+
+def _new_job_id(prefix):
+    # Unique across the gunicorn workers, even for jobs posted in the same second
+    return f"{prefix}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+
+
+def _job_priority():
+    """Optional 'priority' of the POST body (lower runs first, default 0)"""
+    try:
+        return int((request.get_json(silent=True) or {}).get('priority', 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _start_job(job_id, pool_name, task):
+    """
+    Queue `task` on the scheduler pool `pool_name`, returns the POST response
+
+    Past the pool's capacity the job is rejected (429) and forgotten. The
+    tracker leaves this process' registry when the job ends (the store keeps it).
+    """
+    tracker = jobs[job_id]
+
+    def run():
+        try:
+            if tracker.start():
+                task()
+        finally:
+            with job_lock:
+                jobs.pop(job_id, None)
+
+    try:
+        position = get_job_scheduler().submit(
+            job_id, pool_name, run, priority=_job_priority(),
+            on_position=tracker.set_queue_position
+        )
+    except SchedulerFull as e:
+        with job_lock:
+            jobs.pop(job_id, None)
+        state.delete_job(job_id)
+        return jsonify({'error': str(e)}), 429
+
+    if position:
+        tracker.add_log(f"Queued ({pool_name} jobs), position {position}")
+    return jsonify({'job_id': job_id, 'status': tracker.status, 'queue_position': position})
+
+
 @app.route('/')
 def index():
     return render_template('index_modern.html')
@@ -98,20 +307,21 @@ def index():
 @app.route('/api/pipeline-status')
 def get_pipeline_status():
     """Get current pipeline data status"""
+    counts = {stage: state.stage_count(stage) for stage in STAGES}
     return jsonify({
-        'companies_count': len(pipeline_data['companies']),
-        'domains_count': len(pipeline_data['domains']),
-        'enriched_count': len(pipeline_data['enriched']),
-        'has_companies': len(pipeline_data['companies']) > 0,
-        'has_domains': len(pipeline_data['domains']) > 0,
-        'has_enriched': len(pipeline_data['enriched']) > 0
+        'companies_count': counts['companies'],
+        'domains_count': counts['domains'],
+        'enriched_count': counts['enriched'],
+        'has_companies': counts['companies'] > 0,
+        'has_domains': counts['domains'] > 0,
+        'has_enriched': counts['enriched'] > 0
     })
 
 
 @app.route('/api/scrape-universal', methods=['POST'])
 def run_universal_scraper():
     """Universal scraper - any website"""
-    job_id = f"scrape_{int(time.time())}"
+    job_id = _new_job_id('scrape')
     data = request.json
     url = data.get('url')
     max_pages = data.get('max_pages', 5)
@@ -133,14 +343,16 @@ def run_universal_scraper():
                 tracker.update(current, total, message)
                 tracker.add_log(message)
 
-            companies = scrape_companies_from_url(url, max_pages, progress_callback)
+            # New companies of each page are streamed while the crawl goes on
+            companies = scrape_companies_from_url(url, max_pages, progress_callback,
+                                                  rows_callback=lambda rows: tracker.add_rows(rows))
 
             tracker.add_log(f"Successfully scraped {len(companies)} companies")
 
             # Store in pipeline
-            pipeline_data['companies'] = companies
-            pipeline_data['domains'] = []  # Reset next stages
-            pipeline_data['enriched'] = []
+            state.put_stage('companies', companies)
+            state.put_stage('domains', [])  # Reset next stages
+            state.put_stage('enriched', [])
 
             tracker.complete({
                 'total_companies': len(companies),
@@ -153,18 +365,15 @@ def run_universal_scraper():
             tracker.fail(e)
             tracker.add_log(f"Error: {str(e)}", 'error')
 
-    thread = threading.Thread(target=scrape_task)
-    thread.start()
-
-    return jsonify({'job_id': job_id})
+    return _start_job(job_id, 'browser', scrape_task)
 
 
 @app.route('/api/find-domains', methods=['POST'])
 def run_domain_finder():
     """Find domains from scraped companies - CASCADE MODE"""
-    job_id = f"domains_{int(time.time())}"
+    job_id = _new_job_id('domains')
 
-    if not pipeline_data['companies']:
+    if not state.stage_count('companies'):
         return jsonify({'error': 'No companies found. Run scraping first.'}), 400
 
     with job_lock:
@@ -175,38 +384,40 @@ def run_domain_finder():
             from domain_finder import PremiumDomainFinder
 
             tracker = jobs[job_id]
-            companies = pipeline_data['companies']
+            companies = state.get_stage('companies')
 
             tracker.add_log(f"🔍 CASCADE MODE: Processing {len(companies)} companies")
             tracker.update(0, len(companies))
 
             finder = PremiumDomainFinder()
 
-            # CASCADE: Traite TOUTES les entreprises, même sans données précédentes
-            cascade_results = []
-
-            for i, company in enumerate(companies):
-                company_name = company.get('name', '')
-                tracker.update(i + 1, len(companies), f"Finding: {company_name}")
-
-                # Recherche du domaine
-                domain_result = finder.find_domain_single(company_name)
+            company_names = [company.get('name', '') for company in companies]
 
+            def cascade_item(index, domain_result):
                 # CASCADE: Combine données précédentes + nouvelles données
-                cascade_item = {
-                    **company,  # Données du scraping (name, url, etc.)
+                return {
+                    **companies[index],  # Données du scraping (name, url, etc.)
                     'domain': domain_result.get('domain', ''),
                     'domain_source': domain_result.get('source', ''),
                     'confidence_score': domain_result.get('confidence_score', 0),
-                    'company_name': company_name  # Ensure company_name field
+                    'company_name': company_names[index]  # Ensure company_name field
                 }
 
-                cascade_results.append(cascade_item)
-                time.sleep(0.5)
+            # Recherche concurrente (limites par service), résultats dans l'ordre d'entrée
+            # Lignes envoyées au fil de l'eau (ordre de complétion), remplacées à la fin
+            live_rows = _RowBatcher(tracker)
+            domain_results = finder.find_domains_bulk(
+                company_names,
+                progress_callback=lambda done, total, message: tracker.update(done, total, f"Found: {message}"),
+                result_callback=lambda index, result: live_rows.add(cascade_item(index, result))
+            )
+
+            # CASCADE: Traite TOUTES les entreprises, même sans données précédentes
+            cascade_results = [cascade_item(index, result) for index, result in enumerate(domain_results)]
 
             # Store in pipeline - CASCADE
-            pipeline_data['domains'] = cascade_results
-            pipeline_data['enriched'] = []  # Reset enrichment
+            state.put_stage('domains', cascade_results)
+            state.put_stage('enriched', [])  # Reset enrichment
 
             found = sum(1 for r in cascade_results if r.get('domain'))
             not_found = len(cascade_results) - found
@@ -224,18 +435,15 @@ def run_domain_finder():
             tracker.fail(e)
             tracker.add_log(f"Error: {str(e)}", 'error')
 
-    thread = threading.Thread(target=domain_task)
-    thread.start()
-
-    return jsonify({'job_id': job_id})
+    return _start_job(job_id, 'io', domain_task)
 
 
 @app.route('/api/enrich', methods=['POST'])
 def run_enricher():
     """Enrich companies with domains - CASCADE MODE"""
-    job_id = f"enrich_{int(time.time())}"
+    job_id = _new_job_id('enrich')
 
-    if not pipeline_data['domains']:
+    if not state.stage_count('domains'):
         return jsonify({'error': 'No domains data. Run domain finder first.'}), 400
 
     with job_lock:
@@ -246,7 +454,7 @@ def run_enricher():
             from company_enricher import CompanyEnricher
 
             tracker = jobs[job_id]
-            all_companies = pipeline_data['domains']
+            all_companies = state.get_stage('domains')
 
             # CASCADE: Identifie ceux à traiter (avec domaines)
             companies_to_enrich = [c for c in all_companies if c.get('domain')]
@@ -256,22 +464,12 @@ def run_enricher():
             tracker.update(0, len(companies_to_enrich))
 
             enricher = CompanyEnricher()
-            enriched_results = []
             no_domain_results = []
 
-            # Enrichit seulement ceux avec domaines
-            for i, company_data in enumerate(companies_to_enrich):
-                company_name = company_data.get('company_name', company_data.get('name', ''))
-                domain = company_data.get('domain', '')
-
-                tracker.update(i + 1, len(companies_to_enrich), f"Enriching: {company_name}")
-
-                # Enrichissement
-                enrich_result = enricher.enrich_single_company(company_name, domain)
-
+            def cascade_item(index, enrich_result):
                 # CASCADE: Combine TOUTES les données précédentes + nouvelles
-                cascade_item = {
-                    **company_data,  # Données du scraping + domain finder
+                return {
+                    **companies_to_enrich[index],  # Données du scraping + domain finder
                     'company_email': enrich_result.get('company_email', ''),
                     'company_phone': enrich_result.get('company_phone', ''),
                     'company_linkedin': enrich_result.get('company_linkedin', ''),
@@ -279,8 +477,17 @@ def run_enricher():
                     'enrichment_status': 'enriched'
                 }
 
-                enriched_results.append(cascade_item)
-                time.sleep(1)
+            # Enrichit seulement ceux avec domaines (en parallèle, ordre conservé)
+            # Lignes envoyées au fil de l'eau (ordre de complétion), remplacées à la fin
+            live_rows = _RowBatcher(tracker)
+            enrich_results = enricher.enrich_companies_bulk(
+                [{'company_name': c.get('company_name', c.get('name', '')), 'domain': c['domain']}
+                 for c in companies_to_enrich],
+                progress_callback=lambda done, total, name: tracker.update(done, total, f"Enriched: {name}"),
+                result_callback=lambda index, result: live_rows.add(cascade_item(index, result))
+            )
+
+            enriched_results = [cascade_item(index, result) for index, result in enumerate(enrich_results)]
 
             # CASCADE: Ajoute aussi ceux SANS domaines (avec champs vides)
             for company_data in companies_without_domain:
@@ -298,7 +505,7 @@ def run_enricher():
             cascade_results = enriched_results + no_domain_results
 
             # Store in pipeline - CASCADE COMPLET
-            pipeline_data['enriched'] = cascade_results
+            state.put_stage('enriched', cascade_results)
 
             emails_found = sum(1 for r in cascade_results if r.get('company_email'))
             phones_found = sum(1 for r in cascade_results if r.get('company_phone'))
@@ -322,16 +529,13 @@ def run_enricher():
             tracker.fail(e)
             tracker.add_log(f"Error: {str(e)}", 'error')
 
-    thread = threading.Thread(target=enrich_task)
-    thread.start()
-
-    return jsonify({'job_id': job_id})
+    return _start_job(job_id, 'io', enrich_task)
 
 
 @app.route('/api/full-pipeline', methods=['POST'])
 def run_full_pipeline():
     """Run complete pipeline: Scrape → Find Domains → Enrich (all in one)"""
-    job_id = f"pipeline_{int(time.time())}"
+    job_id = _new_job_id('pipeline')
     data = request.json
     url = data.get('url')
     max_pages = data.get('max_pages', 10)
@@ -365,9 +569,9 @@ def run_full_pipeline():
 
             if results:
                 # Store in pipeline data
-                pipeline_data['companies'] = [{'name': name} for name in results['companies_scraped']]
-                pipeline_data['domains'] = results['domains_found']
-                pipeline_data['enriched'] = results['companies_enriched']
+                state.put_stage('companies', [{'name': name} for name in results['companies_scraped']])
+                state.put_stage('domains', results['domains_found'])
+                state.put_stage('enriched', results['companies_enriched'])
 
                 tracker.add_log(f"Pipeline complete!")
                 tracker.complete({
@@ -387,10 +591,7 @@ def run_full_pipeline():
             tracker.fail(e)
             tracker.add_log(f"Error: {str(e)}", 'error')
 
-    thread = threading.Thread(target=pipeline_task)
-    thread.start()
-
-    return jsonify({'job_id': job_id})
+    return _start_job(job_id, 'browser', pipeline_task)
 
 
 @app.route('/api/export/<stage>', methods=['POST'])
@@ -410,10 +611,10 @@ def export_data(stage):
 
     actual_stage = stage_map[stage]
 
-    if actual_stage not in pipeline_data or not pipeline_data[actual_stage]:
+    if actual_stage not in STAGES or not state.stage_count(actual_stage):
         return jsonify({'error': f'No data in {stage} stage'}), 400
 
-    data = pipeline_data[actual_stage]
+    data = state.get_stage(actual_stage)
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f"{stage}_{timestamp}"
 
@@ -440,20 +641,154 @@ def export_data(stage):
 
 @app.route('/api/jobs/<job_id>')
 def get_job_status(job_id):
-    if job_id not in jobs:
+    """
+    Job status. With ?since=<seq>: only what changed after that sequence number
+    (new logs, new rows); without: full state (legacy pages)
+    Answered from the state store: any worker can serve any job
+    """
+    since = request.args.get('since', type=int)
+    job = state.job_snapshot(job_id) if since is None else state.job_delta(job_id, since)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
+def _sse(event_id, event_type, payload):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Server-Sent Events stream of a job: progress ticks, log lines, row batches
+
+    The first event ('delta') catches up on everything after Last-Event-ID
+    (sent by EventSource when it reconnects) or ?since=. A client too slow for
+    its bounded queue is disconnected and resumes the same way.
+    Jobs run by another worker (or finished) are followed through the state
+    store: a 'delta' event per change, polled every SSE_POLL_SECONDS.
+    Needs a threaded/gevent gunicorn worker (see gunicorn.conf.py).
+    """
+    if state.get_job(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    try:
+        since = int(request.headers.get('Last-Event-ID') or request.args.get('since') or 0)
+    except ValueError:
+        since = 0
+
+    tracker = jobs.get(job_id)
+    if tracker is None:
+        return _sse_response(_poll_job_events(job_id, since))
+
+    def stream():
+        subscriber = tracker.subscribe()  # Before the snapshot: no event can be missed
+        try:
+            snapshot = state.job_delta(job_id, since)
+            yield 'retry: 2000\n' + _sse(snapshot['seq'], 'delta', snapshot)
+            if snapshot['status'] not in ('queued', 'running'):
+                return
+
+            while not subscriber.overflowed:
+                try:
+                    seq, event_type, payload = subscriber.queue.get(timeout=config.SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if seq <= snapshot['seq']:
+                    continue  # Already in the catch-up delta
+                yield _sse(seq, event_type, payload)
+                if event_type == 'status':
+                    return
+        finally:
+            tracker.unsubscribe(subscriber)
+
+    return _sse_response(stream())
+
+
+def _poll_job_events(job_id, since):
+    """SSE events of a job followed through the state store (one 'delta' per change)"""
+    yield 'retry: 2000\n'
+    idle = 0
+    while True:
+        delta = state.job_delta(job_id, since)
+        if delta is None:
+            return  # Pruned meanwhile
+        if delta['seq'] != since:
+            since = delta['seq']
+            idle = 0
+            yield _sse(since, 'delta', delta)
+        if delta['status'] not in ('queued', 'running'):
+            return
+        time.sleep(config.SSE_POLL_SECONDS)
+        idle += config.SSE_POLL_SECONDS
+        if idle >= config.SSE_KEEPALIVE_SECONDS:
+            idle = 0
+            yield ': keep-alive\n\n'
+
+
+def _sse_response(events):
+    return Response(events, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # No proxy buffering (nginx, Render)
+    })
+
+
+@app.route('/api/jobs/<job_id>/data')
+def get_job_data(job_id):
+    """Result rows of a job, paginated (?offset=0&limit=500)"""
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(max(1, request.args.get('limit', 500, type=int)), 5000)
+    page = state.job_rows(job_id, offset, limit)
+    if page is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(page)
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a job: dropped from the queue, or stopped at its next progress update"""
+    job = state.get_job(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
-    return jsonify(jobs[job_id].to_dict())
+    if job['status'] not in ('queued', 'running'):
+        return jsonify({'error': f"Job already {job['status']}"}), 409
+
+    tracker = jobs.get(job_id)
+    if tracker is None:
+        # Job of another worker: flagged in the store, its process stops it
+        if not state.cancel_queued_job(job_id, datetime.now().isoformat()):
+            state.request_cancel(job_id)
+        return jsonify({'job_id': job_id, 'status': state.get_job(job_id)['status']})
+
+    scheduled = get_job_scheduler().cancel(job_id)
+    tracker.request_cancel()
+    if scheduled == 'queued' or tracker.status == 'queued':
+        tracker.fail(JobCancelled("Job cancelled"))
+        tracker.add_log("Cancelled before start", 'warning')
+        if scheduled == 'queued':  # Never runs: leaves the registry now
+            with job_lock:
+                jobs.pop(job_id, None)
+    else:
+        tracker.add_log("Cancellation requested", 'warning')
+    return jsonify({'job_id': job_id, 'status': tracker.status})
+
+
+@app.route('/api/scheduler')
+def get_scheduler_stats():
+    """Running / waiting jobs of each scheduler pool"""
+    return jsonify(get_job_scheduler().stats())
 
 
 @app.route('/api/jobs/<job_id>/logs')
 def get_job_logs(job_id):
-    """Get all logs for a job"""
-    if job_id not in jobs:
+    """Get the logs of a job (the JOB_LOG_LIMIT latest lines)"""
+    job = state.get_job(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     return jsonify({
         'job_id': job_id,
-        'status': jobs[job_id].status,
-        'logs': jobs[job_id].logs
+        'status': job['status'],
+        'logs': state.logs(job_id)
     })
 
 
@@ -521,7 +856,7 @@ def analyze_patterns():
 @app.route('/api/scrape-supervised', methods=['POST'])
 def scrape_supervised():
     """Scrape with user-defined mapping"""
-    job_id = f"supervised_{int(time.time())}"
+    job_id = _new_job_id('supervised')
     data = request.json
 
     url = data.get('url')
@@ -529,6 +864,7 @@ def scrape_supervised():
     pattern_index = data.get('pattern_index', 0)  # Fallback
     company_column = data.get('company_column', 'text')
     max_pages = data.get('max_pages', 5)
+    analysis_id = data.get('analysis_id')  # Page 1 déjà analysée par /api/analyze-patterns
 
     if not url:
         return jsonify({'error': 'URL required'}), 400
@@ -554,6 +890,7 @@ def scrape_supervised():
             def log_message(message):
                 tracker.add_log(message)
                 print(message)  # Also print to console
+                tracker.check_cancelled()
 
             tracker.update(0, max_pages, f"Initializing scraper...")
 
@@ -563,15 +900,17 @@ def scrape_supervised():
                 pattern_index=pattern_index,  # Fallback si pas de signature
                 company_name_column=company_column,
                 max_pages=max_pages,
-                logger=log_message
+                logger=log_message,
+                analysis_id=analysis_id
             )
+            tracker.check_cancelled()  # scrape_with_mapping swallows the JobCancelled of log_message
 
             tracker.add_log(f"✅ Successfully scraped {len(companies)} companies")
 
             # Store in pipeline
-            pipeline_data['companies'] = companies
-            pipeline_data['domains'] = []
-            pipeline_data['enriched'] = []
+            state.put_stage('companies', companies)
+            state.put_stage('domains', [])
+            state.put_stage('enriched', [])
 
             tracker.complete({
                 'total_companies': len(companies),
@@ -585,10 +924,7 @@ def scrape_supervised():
             import traceback
             tracker.add_log(traceback.format_exc(), 'error')
 
-    thread = threading.Thread(target=supervised_scrape_task)
-    thread.start()
-
-    return jsonify({'job_id': job_id})
+    return _start_job(job_id, 'cpu', supervised_scrape_task)
 
 
 @app.route('/api/export-direct', methods=['POST'])
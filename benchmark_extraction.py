@@ -0,0 +1,141 @@
+"""
+Benchmark: multi-pass vs single-pass company name extraction
+Compares UniversalScraper.collect_candidates_multipass (one tree walk per
+strategy) with extraction_engine.SinglePassExtractor on saved pages
+
+Every page must give identical and non-empty candidates (an empty list on
+both sides proves nothing: equipauto_page.html is rendered client-side and
+has no candidates in its static HTML)
+
+Usage:
+    python3 benchmark_extraction.py                       # fixture page + synthetic page
+    python3 benchmark_extraction.py page1.html page2.html --runs 5
+"""
+
+import argparse
+import random
+import time
+
+from universal_scraper import UniversalScraper
+from extraction_engine import SinglePassExtractor
+
+
+# Small exhibitor page with known company names (list, table and card layouts)
+FIXTURE_PAGE = '''<html><head><title>Liste des exposants - Salon Auto</title></head><body>
+<nav><ul><li><a href="/">Accueil</a></li><li><a href="/contact">Contact</a></li></ul></nav>
+<h1>Exposants 2025</h1>
+<ul class="exhibitor-list">
+<li class="exhibitor"><a href="/exposant/bosch-france">Bosch France</a></li>
+<li class="exhibitor"><a href="/exposant/valeo">Valeo Service</a></li>
+<li class="exhibitor"><a href="/exposant/michelin">Michelin</a></li>
+<li class="exhibitor"><a href="/exposant/norauto">Norauto Groupe</a></li>
+</ul>
+<table class="exposants">
+<tr><td><a href="/fabricant/total-energies">TotalEnergies Marketing</a></td><td>Hall 1</td></tr>
+<tr><td><a href="/fabricant/continental">Continental Automotive</a></td><td>Hall 2</td></tr>
+<tr><td><a href="/fabricant/hella">Hella Gutmann Solutions</a></td><td>Hall 3</td></tr>
+</table>
+<div class="results">
+<div class="card company-card"><h3>Garage Martin Automobiles</h3><a href="/catalogue/produit-s12.html">Voir</a></div>
+<div class="card company-card"><h3>Pneus Dupont SARL</h3><a href="/catalogue/produit-s13.html">Voir</a></div>
+<div class="card company-card"><h3>Carrosserie Leroy</h3><a href="/catalogue/produit-s14.html">Voir</a></div>
+</div>
+<footer><a href="/mentions-legales">Mentions légales</a></footer>
+</body></html>'''
+
+FIXTURE_COMPANIES = [
+    'Bosch France', 'Valeo Service', 'Michelin', 'Norauto Groupe', 'TotalEnergies Marketing',
+    'Continental Automotive', 'Hella Gutmann Solutions', 'Garage Martin Automobiles',
+    'Pneus Dupont SARL', 'Carrosserie Leroy',
+]
+
+
+def build_synthetic_directory(n_companies=3000, seed=42):
+    """Directory-like page exercising all six strategies (lists, tables, cards, titled links)"""
+    rng = random.Random(seed)
+    words = ['Auto', 'Pieces', 'Bosch', 'Valeo', 'Garage', 'Pneus', 'Industrie', 'Tech',
+             'Services', 'Equipements', 'Distribution', 'Freinage', 'Diagnostic', 'Carrosserie']
+
+    def name():
+        return ' '.join(rng.choice(words) for _ in range(rng.randint(1, 3))) + f' {rng.randint(1, 999)}'
+
+    parts = ['<html><body><nav><ul>']
+    for label in ['Accueil', 'Actualités', 'Contact', 'Blog', 'Connexion']:
+        parts.append(f'<li><a href="/{label.lower()}">{label}</a></li>')
+    parts.append('</ul></nav><ul class="exhibitor-list">')
+    for i in range(n_companies // 3):
+        parts.append(f'<li class="item"><a href="/fabricant/c{i}" title="{name()}">{name()}</a></li>')
+    parts.append('</ul><table>')
+    for i in range(n_companies // 3):
+        parts.append(f'<tr><td><a href="/exposant/e{i}">{name()}</a></td><td>Hall {i % 7}</td></tr>')
+    parts.append('</table><div class="results">')
+    for i in range(n_companies // 3):
+        parts.append(f'<div class="card company-card"><h3>{name()}</h3>'
+                     f'<a href="/catalogue/produit-s{i}.html">Voir</a>'
+                     f'<a href="/news/{i}">News</a></div>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def time_it(func, runs):
+    best = float('inf')
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_page(label, html, runs, expected=None):
+    """
+    Time both engines on a page; True when their outputs are identical, non-empty
+    and contain every `expected` name
+    """
+    scraper = UniversalScraper(headless=True)
+
+    multi_time, multi_result = time_it(lambda: scraper.collect_candidates_multipass(html), runs)
+    single_time, single_result = time_it(
+        lambda: SinglePassExtractor(html, scraper.company_indicators).candidates(), runs
+    )
+
+    identical = multi_result == single_result
+    missing = [name for name in expected or [] if name not in single_result]
+    print(f"\n{label} ({len(html) / 1024 / 1024:.2f} MB)")
+    print(f"  Multi-pass:  {multi_time:.3f}s  ({len(multi_result)} candidates)")
+    print(f"  Single-pass: {single_time:.3f}s  ({len(single_result)} candidates)")
+    print(f"  Speedup:     {multi_time / max(single_time, 1e-9):.1f}x")
+    print(f"  Identical output: {'✅' if identical else '❌'}")
+    if not single_result:
+        print("  ❌ No candidates: the comparison proves nothing on this page")
+    if missing:
+        print(f"  ❌ Known names not extracted: {missing}")
+    return identical and bool(single_result) and not missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark company name extraction engines')
+    parser.add_argument('pages', nargs='*', default=[],
+                        help='Saved HTML pages (the built-in fixture page always runs)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per engine (best time kept)')
+    parser.add_argument('--no-synthetic', action='store_true', help='Skip the synthetic directory page')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("EXTRACTION BENCHMARK - multi-pass vs single-pass")
+    print("=" * 60)
+
+    all_identical = benchmark_page('fixture page', FIXTURE_PAGE, args.runs, expected=FIXTURE_COMPANIES)
+    for path in args.pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            all_identical &= benchmark_page(path, f.read(), args.runs)
+
+    if not args.no_synthetic:
+        all_identical &= benchmark_page('synthetic directory', build_synthetic_directory(), args.runs)
+
+    print(f"\n{'✅ All outputs identical' if all_identical else '❌ Output mismatch or empty output'}")
+    return 0 if all_identical else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""
+Benchmark: html.parser vs linear-time lxml repeating-pattern detection
+Compares SmartPatternDetector.find_repeating_patterns_soup (get_text + parents
+per container) with pattern_engine.PatternEngine and StreamingPatternEngine
+(bounded memory) on a corpus of saved pages
+
+Usage:
+    python3 benchmark_patterns.py                          # equipauto_page.html + synthetic pages
+    python3 benchmark_patterns.py saved_pages/*.html --runs 5
+"""
+
+import argparse
+import random
+import time
+
+from smart_pattern_detector import SmartPatternDetector
+from pattern_engine import PatternEngine, StreamingPatternEngine
+from benchmark_extraction import build_synthetic_directory, time_it
+
+
+def build_nested_layout(n_cards=2000, wrappers=5, seed=42):
+    """Card grid wrapped in many layout divs (quadratic case for per-element get_text)"""
+    rng = random.Random(seed)
+    words = ['Auto', 'Pieces', 'Garage', 'Pneus', 'Industrie', 'Services', 'Freinage', 'Diagnostic']
+
+    parts = ['<html><body>']
+    parts.extend(f'<div class="wrapper-{i}"><section class="layout">' for i in range(wrappers))
+    for i in range(n_cards):
+        name = ' '.join(rng.choice(words) for _ in range(2))
+        parts.append(f'<article class="card exhibitor"><div class="card-body">'
+                     f'<h3 class="name">{name} {i}</h3><span class="city">Stand {i % 50}</span>'
+                     f'<a href="/exposant/{i}">Voir</a></div></article>')
+    parts.extend('</section></div>' for _ in range(wrappers))
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def benchmark_page(label, html, runs, detector):
+    soup_time, soup_result = time_it(lambda: detector.find_repeating_patterns_soup(html), runs)
+    engine_time, engine_result = time_it(lambda: PatternEngine(html).patterns(), runs)
+    stream_time, stream_result = time_it(lambda: StreamingPatternEngine.from_html(html).patterns(), runs)
+
+    identical = soup_result == engine_result == stream_result
+    print(f"\n{label} ({len(html) / 1024 / 1024:.2f} MB)")
+    print(f"  html.parser: {soup_time:.3f}s  ({len(soup_result)} patterns)")
+    print(f"  lxml engine: {engine_time:.3f}s  ({len(engine_result)} patterns)")
+    print(f"  Streaming:   {stream_time:.3f}s  ({len(stream_result)} patterns)")
+    print(f"  Speedup:     {soup_time / engine_time:.1f}x (streaming {soup_time / stream_time:.1f}x)")
+    print(f"  Same ranking: {'✅' if identical else '❌'}")
+    if not identical:
+        print(f"    html.parser: {[(p['signature'], p['count']) for p in soup_result[:5]]}")
+        print(f"    lxml engine: {[(p['signature'], p['count']) for p in engine_result[:5]]}")
+        print(f"    Streaming:   {[(p['signature'], p['count']) for p in stream_result[:5]]}")
+    return identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark repeating-pattern detection engines')
+    parser.add_argument('pages', nargs='*', default=['equipauto_page.html'],
+                        help='Saved HTML pages (default: equipauto_page.html)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per engine (best time kept)')
+    parser.add_argument('--no-synthetic', action='store_true', help='Skip the synthetic pages')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PATTERN DETECTION BENCHMARK - html.parser vs lxml engine")
+    print("=" * 60)
+
+    detector = SmartPatternDetector()
+    all_identical = True
+    for path in args.pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            all_identical &= benchmark_page(path, f.read(), args.runs, detector)
+
+    if not args.no_synthetic:
+        all_identical &= benchmark_page('synthetic directory', build_synthetic_directory(), args.runs, detector)
+        all_identical &= benchmark_page('synthetic nested layout', build_nested_layout(), args.runs, detector)
+
+    print(f"\n{'✅ Same ranking on every page' if all_identical else '❌ Ranking mismatch'}")
+
+
+if __name__ == '__main__':
+    main()
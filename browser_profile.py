@@ -0,0 +1,126 @@
+"""
+Lightweight browser profile for scraping sessions
+We only ever read page_source: images, fonts, stylesheets, media and
+third-party trackers are blocked to save bandwidth, load time and memory
+
+- Images: Chrome content settings (default block, per-site exceptions)
+- Fonts, stylesheets, media, ad/analytics hosts: CDP Network.setBlockedURLs,
+  applied before each navigation so the per-site allowlist follows the URL
+"""
+
+import logging
+from urllib.parse import urlparse
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def _host_patterns(entry):
+    """
+    CDP patterns anchored on a host and its subdomains ('host' or 'host/path')
+    A bare '*segment.com*' also matched first-party URLs such as
+    https://example.com/market-segment.com.html or ?ref=hubspot.com
+    """
+    host, _, path = entry.partition('/')
+    suffix = f'/{path}*' if path else '/*'
+    return [f'*://{host}{suffix}', f'*://*.{host}{suffix}']
+
+
+# URL patterns per resource type (CDP wildcard syntax)
+RESOURCE_PATTERNS = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.avif', '*.bmp'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+             *_host_patterns('fonts.googleapis.com'), *_host_patterns('fonts.gstatic.com')],
+    'stylesheet': ['*.css'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.m3u8',
+              *_host_patterns('youtube.com/embed'), *_host_patterns('player.vimeo.com')],
+}
+
+# Known ad / analytics / tracking hosts
+TRACKER_HOSTS = [
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com',
+    'doubleclick.net', 'googlesyndication.com', 'facebook.net', 'connect.facebook.net',
+    'hotjar.com', 'clarity.ms', 'segment.com', 'segment.io', 'mixpanel.com',
+    'linkedin.com/px', 'snap.licdn.com', 'ads.linkedin.com', 'bat.bing.com',
+    'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com', 'quantserve.com',
+    'scorecardresearch.com', 'matomo.cloud', 'hubspot.com', 'hs-analytics.net',
+    'intercom.io', 'crisp.chat', 'tawk.to', 'zopim.com', 'axeptio.eu',
+]
+RESOURCE_PATTERNS['tracker'] = [pattern for host in TRACKER_HOSTS for pattern in _host_patterns(host)]
+
+BLOCKED_TYPES = ('image', 'font', 'stylesheet', 'media', 'tracker')
+
+# Sites that break without some resource types: host -> allowed types ('all' = no blocking)
+SITE_ALLOWLIST = {
+    # Equipauto exhibitor iframe: keep layout so the "Liste" view renders
+    'paris.equipauto.com': {'stylesheet'},
+    'new-liste-exposants.hubj2c.com': {'stylesheet'},
+}
+
+
+def _allowed_types(host):
+    """Resource types allowed on `host` (exact host or parent domain match)"""
+    host = host.lower()
+    for site, allowed in SITE_ALLOWLIST.items():
+        if host == site or host.endswith('.' + site):
+            return BLOCKED_TYPES if 'all' in allowed else allowed
+    return ()
+
+
+def blocked_url_patterns(url=None):
+    """CDP URL patterns to block when loading `url`"""
+    if not config.BLOCK_RESOURCES:
+        return []
+    allowed = _allowed_types(urlparse(url).netloc) if url else ()
+    patterns = []
+    for resource_type in BLOCKED_TYPES:
+        if resource_type not in allowed:
+            patterns.extend(RESOURCE_PATTERNS[resource_type])
+    return patterns
+
+
+def apply_lightweight_profile(chrome_options):
+    """Add the scraping profile (memory flags + image blocking prefs) to Chrome options"""
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_argument('--disable-sync')
+    chrome_options.add_argument('--disable-default-apps')
+    chrome_options.add_argument('--disable-notifications')
+    chrome_options.add_argument('--mute-audio')
+    chrome_options.add_argument('--no-first-run')
+    chrome_options.add_argument('--disable-features=MediaRouter,OptimizationHints,Translate')
+
+    if not config.BLOCK_RESOURCES:
+        return chrome_options
+
+    # Default (not managed/policy) setting: the per-site exceptions below can override it
+    prefs = {
+        'profile.default_content_setting_values.images': 2,
+        'profile.default_content_setting_values.notifications': 2,
+        'profile.default_content_setting_values.geolocation': 2,
+    }
+
+    # Image exceptions for allowlisted sites
+    image_exceptions = {
+        f'[*.]{site},*': {'setting': 1}
+        for site, allowed in SITE_ALLOWLIST.items()
+        if 'image' in allowed or 'all' in allowed
+    }
+    if image_exceptions:
+        prefs['profile.content_settings.exceptions.images'] = image_exceptions
+
+    chrome_options.add_experimental_option('prefs', prefs)
+    return chrome_options
+
+
+def enable_resource_blocking(driver, url=None):
+    """Block resource types/trackers for the next navigation (Chromium CDP)"""
+    patterns = blocked_url_patterns(url)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        return True
+    except Exception as e:
+        logger.debug(f"Resource blocking unavailable: {e}")
+        return False
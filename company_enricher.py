@@ -7,6 +7,14 @@ Data Sources (Priority Order):
 2. Pappers.fr API (Free: 10,000/month) - French companies
 3. Hunter.io API (Free: 50/month) - Email finding
 
+Concurrency:
+- Companies are enriched by a pool of ENRICHER_WORKERS threads
+- A company's candidate pages are fetched in parallel on a process-wide
+  fetch pool (ENRICHER_MAX_CONNECTIONS = global connection limit)
+- Per-host politeness via the shared 'company-sites' rate limiter,
+  keep-alive pooled session and process-wide DNS cache
+- Big pages are parsed in the parsing service worker processes
+
 Usage:
     python3 company_enricher.py
 """
@@ -15,14 +23,23 @@ import json
 import re
 import time
 import logging
+import threading
 import requests
-from bs4 import BeautifulSoup
+from collections import OrderedDict
 import pandas as pd
 from colorama import Fore, init
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, urlparse
 import os
 from dotenv import load_dotenv
+from http_cache import install_cache
+from rate_limiter import get_limiter
+from dns_cache import install_dns_cache
+from contact_page import ContactPage
+from parsing_service import ParseTimeout, parse_in_pool
+from enrichment_store import get_enrichment_store
+import config
 
 init(autoreset=True)
 load_dotenv()
@@ -33,15 +50,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Politeness per external service (shared with domain_finder for company sites):
+# service -> (max concurrent requests per host, min seconds between request starts)
+SERVICE_LIMITS = {
+    'company-sites': (config.COMPANY_SITES_MAX_PER_HOST, config.COMPANY_SITES_MIN_INTERVAL),
+    'pappers-api': (2, 0.1),
+    'hunter-api': (1, 1.0),
+}
+
+# Homepage links worth following, by priority (matched on the href and the anchor text)
+CONTACT_LINK_KEYWORDS = (
+    'contact', 'mentions-legales', 'mentions legales', 'mentions légales', 'legal',
+    'impressum', 'imprint', 'a-propos', 'about', 'qui-sommes-nous', 'qui sommes-nous'
+)
+MISSING_STATUSES = {404, 410}
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+# host -> (expiry, paths answering 404/410), shared by every enricher of the process
+# LRU on hosts, entries expire: a site may publish its contact page later
+MISSING_PAGES_MAX_HOSTS = 5000
+MISSING_PAGES_TTL = 6 * 3600
+_missing_pages = OrderedDict()
+_missing_pages_lock = threading.Lock()
+
+
+def mark_missing(url):
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    now = time.monotonic()
+    with _missing_pages_lock:
+        entry = _missing_pages.get(host)
+        if entry is None or entry[0] <= now:
+            entry = _missing_pages[host] = (now + MISSING_PAGES_TTL, set())
+        entry[1].add(parsed.path or '/')
+        _missing_pages.move_to_end(host)
+        while len(_missing_pages) > MISSING_PAGES_MAX_HOSTS:
+            _missing_pages.popitem(last=False)
+
+
+def is_missing(url):
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    with _missing_pages_lock:
+        entry = _missing_pages.get(host)
+        if entry is None:
+            return False
+        if entry[0] <= time.monotonic():
+            del _missing_pages[host]
+            return False
+        _missing_pages.move_to_end(host)
+        return (parsed.path or '/') in entry[1]
+
+
+def get_fetch_pool():
+    """
+    Process-wide page fetch pool, shared by every enricher (and every job):
+    its size is the global connection limit of the enrichment stage
+    """
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=config.ENRICHER_MAX_CONNECTIONS,
+                                             thread_name_prefix='enrich-fetch')
+        return _fetch_pool
+
 
 class CompanyEnricher:
     """Enrich company data from domains"""
 
-    def __init__(self, pappers_api_key=None, hunter_api_key=None):
+    def __init__(self, pappers_api_key=None, hunter_api_key=None, max_workers=None):
+        self.max_workers = max_workers or config.ENRICHER_WORKERS
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        # Keep-alive: one pooled connection per fetch thread
+        install_cache(self.session, 'enrichment', pool_maxsize=max(10, config.ENRICHER_MAX_CONNECTIONS))
+        install_dns_cache(self.session)
+
+        # Rate limiters per service instead of global sleeps
+        self.limiters = {name: get_limiter(name, *limits) for name, limits in SERVICE_LIMITS.items()}
+        self.fetch_pool = get_fetch_pool()
+
+        # Persistent source answers + field provenance (None when ENRICH_STORE_ENABLED=False)
+        self.store = get_enrichment_store()
+        self._local = threading.local()  # Per-thread: sources that actually answered
 
         # API Keys (optional)
         self.pappers_api_key = pappers_api_key or os.getenv('PAPPERS_API_KEY')
@@ -56,6 +151,7 @@ class CompanyEnricher:
             'phones_found': 0,
             'linkedin_found': 0
         }
+        self._stats_lock = threading.Lock()
 
         # Regex patterns
         self.email_pattern = re.compile(
@@ -78,9 +174,24 @@ class CompanyEnricher:
             '/mentions-legales', '/legal', '/impressum', '/imprint'
         ]
 
+    def count(self, **increments):
+        """Thread-safe stats update"""
+        with self._stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
     def extract_emails_from_text(self, text):
         """Extract emails from text"""
-        emails = self.email_pattern.findall(text.lower())
+        return self.rank_emails(self.email_pattern.findall(text))
+
+    def extract_emails(self, page):
+        """Emails of a ContactPage: mailto/JSON-LD first, then the text"""
+        structured = [e for e in page.structured_emails if self.email_pattern.fullmatch(e.strip())]
+        return self.rank_emails(structured + self.email_pattern.findall(page.text))
+
+    def rank_emails(self, emails):
+        """Lowercase, drop noise, contact/info addresses first, deduplicated"""
+        emails = [email.strip().lower() for email in emails]
 
         # Filter out common noise
         filtered = []
@@ -119,16 +230,35 @@ class CompanyEnricher:
 
         return normalized
 
+    def extract_phones(self, page):
+        """Phones of a ContactPage: tel:/JSON-LD first, then the text"""
+        phones = []
+        for number in page.structured_phones:
+            # "+33 (0)1 23 45 67 89" -> "+33123456789"
+            compact = re.sub(r'[\s.()-]', '', number.replace('(0)', ''))
+            phones.extend(self.extract_phones_from_text(compact))
+        phones.extend(self.extract_phones_from_text(page.text))
+        return list(dict.fromkeys(phones))
+
     def extract_linkedin_urls(self, html, base_url):
         """Extract LinkedIn company and profile URLs"""
-        soup = BeautifulSoup(html, 'lxml')
-
+        try:
+            page = parse_in_pool(ContactPage, html)
+        except ParseTimeout as e:
+            logger.warning(f"LinkedIn extraction skipped for {base_url}: {e}")
+            return None, []
+        return self.extract_linkedin(page)
+
+    def extract_linkedin(self, page):
+        """LinkedIn URLs of a ContactPage (links and JSON-LD sameAs)"""
+        return self.linkedin_from_hrefs(page.hrefs + page.same_as)
+
+    def linkedin_from_hrefs(self, hrefs):
+        """LinkedIn company URL and profile URLs among link targets"""
         company_linkedin = None
         profile_urls = []
 
-        # Find all links
-        for link in soup.find_all('a', href=True):
-            href = link['href']
+        for href in hrefs:
 
             # Company LinkedIn
             match = self.linkedin_company_pattern.search(href)
@@ -144,54 +274,138 @@ class CompanyEnricher:
 
         return company_linkedin, profile_urls
 
+    def fetch_page(self, url):
+        """
+        Response for `url` (200 only), or None - runs on the fetch pool
+        404/410 answers are remembered per host and never requested again
+        """
+        if is_missing(url):
+            return None
+        try:
+            with self.limiters['company-sites'].slot(url):
+                response = self.session.get(url, timeout=10)
+            if response.status_code == 200:
+                return response
+            if response.status_code in MISSING_STATUSES:
+                mark_missing(url)
+        except Exception as e:
+            logger.debug(f"Fetch failed for {url}: {e}")
+        return None
+
+    def contact_links(self, anchors, page_url):
+        """Same-site contact/legal pages linked from a page, by keyword priority"""
+        host = urlparse(page_url).netloc.lower()
+        ranked = []
+        for href, text in anchors:
+            url = urljoin(page_url, href).split('#')[0]
+            parsed = urlparse(url)
+            if parsed.scheme not in ('http', 'https') or parsed.netloc.lower() != host:
+                continue
+            haystack = f"{parsed.path.lower()} {text.lower()}"
+            for priority, keyword in enumerate(CONTACT_LINK_KEYWORDS):
+                if keyword in haystack:
+                    ranked.append((priority, url))
+                    break
+        ranked.sort(key=lambda item: item[0])
+        return list(dict.fromkeys(url for _, url in ranked))
+
+    def extract_page(self, html, found):
+        """
+        Add the contact data of one page to `found`, returns its anchors [(href, text)]
+        `html` is the raw body: the charset is detected from the markup (meta tags)
+        """
+        try:
+            page = parse_in_pool(ContactPage, html)
+        except ParseTimeout as e:
+            logger.warning(f"Contact page skipped: {e}")
+            return []
+
+        for email in self.extract_emails(page):
+            if email not in found['emails']:
+                found['emails'].append(email)
+        for phone in self.extract_phones(page):
+            if phone not in found['phones']:
+                found['phones'].append(phone)
+
+        company_linkedin, profiles = self.extract_linkedin(page)
+        found['linkedin_company'] = found['linkedin_company'] or company_linkedin
+        for profile in profiles:
+            if profile not in found['linkedin_profiles']:
+                found['linkedin_profiles'].append(profile)
+
+        found['address'] = found['address'] or page.address
+        return page.anchors
+
+    @staticmethod
+    def is_satisfied(found):
+        """Every field of ENRICHER_REQUIRED_FIELDS has been found"""
+        fields = {
+            'email': found['emails'],
+            'phone': found['phones'],
+            'linkedin': found['linkedin_company'],
+        }
+        return all(fields.get(field) for field in config.ENRICHER_REQUIRED_FIELDS)
+
     def scrape_contact_page(self, domain):
-        """Scrape website for contact information"""
+        """
+        Scrape website for contact information
+
+        Pages are processed as they arrive and crawling stops as soon as the
+        required fields are found: homepage first, then the contact/legal pages
+        it links to (guessed paths only as a fallback), in batches of the
+        per-host limit. Known 404s are skipped.
+        """
         result = {
             'emails': [],
             'phones': [],
             'linkedin_company': None,
             'linkedin_profiles': [],
+            'address': None,
             'method': 'website_scraping'
         }
 
         try:
             base_url = f"https://{domain}"
-
-            # Try homepage first
-            urls_to_try = [base_url]
-
-            # Add contact pages
-            for path in self.contact_paths:
-                urls_to_try.append(urljoin(base_url, path))
-
-            all_text = ""
-            all_html = ""
-
-            for url in urls_to_try[:5]:  # Try first 5 pages
-                try:
-                    response = self.session.get(url, timeout=10)
-                    if response.status_code == 200:
-                        all_html += response.text
-                        soup = BeautifulSoup(response.text, 'lxml')
-                        all_text += soup.get_text() + "\n"
-                        time.sleep(0.5)
-                except:
-                    continue
-
-            if all_text:
-                # Extract data
-                result['emails'] = self.extract_emails_from_text(all_text)[:3]  # Top 3
-                result['phones'] = self.extract_phones_from_text(all_text)[:2]  # Top 2
-                result['linkedin_company'], result['linkedin_profiles'] = \
-                    self.extract_linkedin_urls(all_html, base_url)
-
-                self.stats['website_scraped'] += 1
-                if result['emails']:
-                    self.stats['emails_found'] += len(result['emails'])
-                if result['phones']:
-                    self.stats['phones_found'] += len(result['phones'])
-                if result['linkedin_company'] or result['linkedin_profiles']:
-                    self.stats['linkedin_found'] += 1
+            found = {'emails': [], 'phones': [], 'linkedin_company': None, 'linkedin_profiles': [], 'address': None}
+            pages_read = 0
+
+            # Homepage first: its links tell which pages to read next
+            # (through the fetch pool too: it bounds the stage's open connections)
+            homepage = self.fetch_pool.submit(self.fetch_page, base_url).result()
+            candidates = []
+            if homepage is not None:
+                anchors = self.extract_page(homepage.content, found)
+                pages_read += 1
+                candidates = self.contact_links(anchors, homepage.url)
+
+            # Guessed contact pages as a fallback
+            candidates.extend(urljoin(base_url, path) for path in self.contact_paths)
+            candidates = [url for url in dict.fromkeys(candidates) if not is_missing(url)]
+            candidates = candidates[:config.ENRICHER_MAX_PAGES - 1]
+
+            batch_size = self.limiters['company-sites'].max_per_host
+            for start in range(0, len(candidates), batch_size):
+                if self.is_satisfied(found):
+                    break
+                for page in self.fetch_pool.map(self.fetch_page, candidates[start:start + batch_size]):
+                    if page is not None:
+                        self.extract_page(page.content, found)
+                        pages_read += 1
+
+            if pages_read:
+                self.answered('website')
+                result['emails'] = found['emails'][:3]  # Top 3
+                result['phones'] = found['phones'][:2]  # Top 2
+                result['linkedin_company'] = found['linkedin_company']
+                result['linkedin_profiles'] = found['linkedin_profiles']
+                result['address'] = found['address']  # schema.org PostalAddress, if published
+
+                self.count(
+                    website_scraped=1,
+                    emails_found=len(result['emails']),
+                    phones_found=len(result['phones']),
+                    linkedin_found=1 if result['linkedin_company'] or result['linkedin_profiles'] else 0
+                )
 
         except Exception as e:
             logger.debug(f"Scraping error for {domain}: {e}")
@@ -212,7 +426,8 @@ class CompanyEnricher:
                 'precision': 'standard'
             }
 
-            response = self.session.get(url, params=params, timeout=15)
+            with self.limiters['pappers-api'].slot(url):
+                response = self.session.get(url, params=params, timeout=15)
 
             # Check for quota exceeded
             if response.status_code == 429:
@@ -222,6 +437,7 @@ class CompanyEnricher:
 
             if response.status_code == 200:
                 data = response.json()
+                self.answered('pappers')
 
                 if data.get('resultats'):
                     # Get first result
@@ -253,7 +469,7 @@ class CompanyEnricher:
                         if exec_data['last_name']:
                             result['executives'].append(exec_data)
 
-                    self.stats['pappers_used'] += 1
+                    self.count(pappers_used=1)
                     return result
 
         except Exception as e:
@@ -274,7 +490,8 @@ class CompanyEnricher:
                 'limit': 5
             }
 
-            response = self.session.get(url, params=params, timeout=15)
+            with self.limiters['hunter-api'].slot(url):
+                response = self.session.get(url, params=params, timeout=15)
 
             # Check for quota exceeded
             if response.status_code == 429:
@@ -284,6 +501,7 @@ class CompanyEnricher:
 
             if response.status_code == 200:
                 data = response.json()
+                self.answered('hunter')
 
                 if data.get('data', {}).get('emails'):
                     emails = []
@@ -299,9 +517,7 @@ class CompanyEnricher:
                                 'type': email_data.get('type')
                             })
 
-                    self.stats['hunter_used'] += 1
-                    if emails:
-                        self.stats['emails_found'] += len(emails)
+                    self.count(hunter_used=1, emails_found=len(emails))
 
                     return emails
 
@@ -310,11 +526,10 @@ class CompanyEnricher:
 
         return []
 
-    def enrich_single_company(self, company_name, domain):
-        """Enrich a single company"""
-        logger.info(f"\n{Fore.CYAN}Enriching: {company_name} ({domain})")
-
-        result = {
+    @staticmethod
+    def empty_result(company_name, domain):
+        """Result of a company with nothing found"""
+        return {
             'company_name': company_name,
             'domain': domain,
             'company_email': None,
@@ -328,8 +543,66 @@ class CompanyEnricher:
             'data_sources': []
         }
 
+    def answered(self, source):
+        """Mark `source` as having answered for the company of this thread"""
+        answered = getattr(self._local, 'answered', None)
+        if answered is not None:
+            answered.add(source)
+
+    def from_source(self, domain, source, fetch, stored, fetched_at):
+        """
+        Answer of `source` for `domain`: the stored one while fresh, otherwise
+        fetch() - kept in the store only if the source actually answered
+        (a network error or an exhausted quota is retried next run)
+        """
+        if source in stored:
+            payload, fetched_at[source] = stored[source]
+            logger.debug(f"  {source}: stored answer reused for {domain}")
+            return payload
+
+        payload = fetch()
+        fetched_at[source] = time.time()
+        if self.store is not None and source in self._local.answered:
+            self.store.put_source(domain, source, payload, fetched_at[source])
+        return payload
+
+    def record_fields(self, result, fetched_at):
+        """Store each output field with its source and fetch time"""
+        email_source = 'hunter' if 'hunter' in result['data_sources'] else 'website'
+        address_source = 'pappers' if 'pappers' in result['data_sources'] and result['siren'] else 'website'
+
+        def field(name, source):
+            return result[name], source, fetched_at.get(source)
+
+        self.store.put_fields(result['domain'], result['company_name'], {
+            'company_email': field('company_email', email_source),
+            'company_phone': field('company_phone', 'website'),
+            'company_linkedin': field('company_linkedin', 'website'),
+            'company_address': field('company_address', address_source),
+            'company_city': field('company_city', address_source),
+            'siren': field('siren', 'pappers'),
+            'siret': field('siret', 'pappers'),
+            'executives': field('executives', 'pappers'),
+        }, siren=result['siren'])
+
+    def enrich_single_company(self, company_name, domain):
+        """
+        Enrich a single company
+
+        With the enrichment store, fresh source answers (see
+        enrichment_store.REFRESH_POLICIES) are reused and only stale sources
+        are called again.
+        """
+        logger.info(f"\n{Fore.CYAN}Enriching: {company_name} ({domain})")
+
+        result = self.empty_result(company_name, domain)
+        self._local.answered = set()
+        stored = self.store.fresh_sources(domain) if self.store is not None else {}
+        fetched_at = {}
+
         # Strategy 1: Scrape website (always do this, it's free)
-        web_data = self.scrape_contact_page(domain)
+        web_data = self.from_source(domain, 'website', lambda: self.scrape_contact_page(domain),
+                                    stored, fetched_at)
 
         if web_data['emails']:
             result['company_email'] = web_data['emails'][0]
@@ -345,7 +618,8 @@ class CompanyEnricher:
             logger.info(f"  ✓ LinkedIn: {result['company_linkedin']}")
 
         # Strategy 2: Pappers.fr (French companies only)
-        pappers_data = self.get_pappers_data(company_name, domain)
+        pappers_data = self.from_source(domain, 'pappers', lambda: self.get_pappers_data(company_name, domain),
+                                        stored, fetched_at)
 
         if pappers_data:
             result['siren'] = pappers_data.get('siren')
@@ -359,10 +633,17 @@ class CompanyEnricher:
             for exec in result['executives'][:2]:
                 logger.info(f"    - {exec.get('first_name', '')} {exec.get('last_name', '')} ({exec.get('role', 'N/A')})")
 
+        # Address published on the website (JSON-LD) when Pappers has none
+        if not result['company_address'] and web_data.get('address'):
+            result['company_address'] = web_data['address']['address']
+            result['company_city'] = result['company_city'] or web_data['address']['city']
+            logger.info(f"  ✓ Address (website): {result['company_address']}")
+
         # Strategy 3: Hunter.io (use sparingly, only 50/month)
         # Only use if we don't have email yet
-        if not result['company_email'] and self.hunter_api_key:
-            hunter_emails = self.get_hunter_emails(domain, company_name)
+        if not result['company_email'] and (self.hunter_api_key or 'hunter' in stored):
+            hunter_emails = self.from_source(domain, 'hunter', lambda: self.get_hunter_emails(domain, company_name),
+                                             stored, fetched_at)
 
             if hunter_emails:
                 # Find generic company email
@@ -376,8 +657,8 @@ class CompanyEnricher:
                 # Match executives with emails
                 for exec in result['executives']:
                     for email_data in hunter_emails:
-                        if (email_data.get('last_name', '').lower() == exec.get('last_name', '').lower() and
-                            email_data.get('first_name', '').lower() == exec.get('first_name', '').lower()):
+                        if ((email_data.get('last_name') or '').lower() == (exec.get('last_name') or '').lower() and
+                            (email_data.get('first_name') or '').lower() == (exec.get('first_name') or '').lower()):
                             exec['email'] = email_data['email']
                             logger.info(f"    - Email matched: {exec['email']}")
 
@@ -390,32 +671,70 @@ class CompanyEnricher:
         if not result['data_sources']:
             logger.warning(f"  ✗ No data found")
 
+        if self.store is not None:
+            self.record_fields(result, fetched_at)
+
         return result
 
-    def enrich_companies_bulk(self, companies_data, max_results=None):
-        """Enrich multiple companies"""
+    def enrich_companies_bulk(self, companies_data, max_results=None, progress_callback=None, result_callback=None):
+        """
+        Enrich multiple companies concurrently
+
+        Companies are enriched by a pool of max_workers threads; politeness is
+        enforced by the per-service rate limiters. Companies without domain are
+        skipped, results keep the input order.
+
+        Args:
+            companies_data: List of {'company_name', 'domain'} dicts
+            max_results: Only process the first N companies
+            progress_callback: Optional callback(done, total, message)
+            result_callback: Optional callback(index, result) as each company is enriched
+                (index in the companies with a domain)
+        """
         if max_results:
             companies_data = companies_data[:max_results]
 
         logger.info(f"{Fore.CYAN}{'='*60}")
         logger.info(f"{Fore.CYAN}COMPANY DATA ENRICHER - Professional Free Tier")
-        logger.info(f"{Fore.CYAN}Processing {len(companies_data)} companies...")
+        logger.info(f"{Fore.CYAN}Processing {len(companies_data)} companies ({self.max_workers} workers)...")
         logger.info(f"{Fore.CYAN}{'='*60}\n")
 
-        results = []
+        companies = []
+        for company_data in companies_data:
+            if company_data.get('domain'):
+                companies.append(company_data)
+            else:
+                logger.debug(f"Skipping {company_data.get('company_name')} - no domain")
 
-        for company_data in tqdm(companies_data, desc="Enriching"):
-            company_name = company_data.get('company_name')
-            domain = company_data.get('domain')
+        results = [None] * len(companies)
+        total = len(companies)
 
-            if not domain:
-                logger.debug(f"Skipping {company_name} - no domain")
-                continue
-
-            result = self.enrich_single_company(company_name, domain)
-            results.append(result)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                tqdm(total=total, desc="Enriching") as progress:
+            futures = {
+                executor.submit(self.enrich_single_company, company['company_name'], company['domain']): index
+                for index, company in enumerate(companies)
+            }
 
-            time.sleep(1.5)  # Be respectful to servers
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    index = futures[future]
+                    company_name = companies[index]['company_name']
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        logger.error(f"Enrichment failed for {company_name}: {e}")
+                        results[index] = self.empty_result(company_name, companies[index]['domain'])
+
+                    progress.update(1)
+                    if result_callback:
+                        result_callback(index, results[index])
+                    if progress_callback:
+                        progress_callback(done, total, company_name)
+            except BaseException:
+                # Stopped early (e.g. job cancelled from progress_callback): drop the pending tasks
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
         return results
 
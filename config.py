@@ -11,6 +11,87 @@ HEADLESS_MODE = os.getenv('HEADLESS_MODE', 'True').lower() == 'true'
 PAGE_LOAD_TIMEOUT = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
 IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', '10'))
 
+# Block images/fonts/CSS/media/trackers in scraping browsers (see browser_profile.py)
+BLOCK_RESOURCES = os.getenv('BLOCK_RESOURCES', 'True').lower() == 'true'
+
+# Page readiness (event-driven waits instead of fixed sleeps)
+READY_TIMEOUT = float(os.getenv('READY_TIMEOUT', '15'))  # max seconds per wait
+READY_QUIET_MS = int(os.getenv('READY_QUIET_MS', '500'))  # DOM/network quiet period
+
+# WebDriver pool (shared warm Chrome instances)
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '2'))
+DRIVER_POOL_MAX_AGE = int(os.getenv('DRIVER_POOL_MAX_AGE', '1800'))  # seconds
+DRIVER_POOL_MAX_USES = int(os.getenv('DRIVER_POOL_MAX_USES', '50'))
+DRIVER_POOL_WARM = int(os.getenv('DRIVER_POOL_WARM', '0'))  # drivers pre-launched at startup
+
+# Persistent HTTP cache (see http_cache.py)
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'True').lower() == 'true'
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', 'cache/http_cache.sqlite')
+HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', '500'))
+HTTP_CACHE_TTL_LISTING = int(os.getenv('HTTP_CACHE_TTL_LISTING', '3600'))  # seconds
+HTTP_CACHE_TTL_DOMAINS = int(os.getenv('HTTP_CACHE_TTL_DOMAINS', '604800'))
+HTTP_CACHE_TTL_ENRICHMENT = int(os.getenv('HTTP_CACHE_TTL_ENRICHMENT', '604800'))
+
+# Domain finder (concurrent resolution, see domain_finder.SERVICE_LIMITS)
+DOMAIN_FINDER_WORKERS = int(os.getenv('DOMAIN_FINDER_WORKERS', '8'))
+DOMAIN_CACHE_ENABLED = os.getenv('DOMAIN_CACHE_ENABLED', 'True').lower() == 'true'
+DOMAIN_CACHE_PATH = os.getenv('DOMAIN_CACHE_PATH', 'cache/domains.sqlite')
+DOMAIN_CACHE_TTL = int(os.getenv('DOMAIN_CACHE_TTL', '2592000'))  # seconds (30 days)
+DOMAIN_CACHE_NEGATIVE_TTL = int(os.getenv('DOMAIN_CACHE_NEGATIVE_TTL', '259200'))  # "not found": 3 days
+VERIFY_MAX_BYTES = int(os.getenv('VERIFY_MAX_BYTES', '262144'))  # homepage bytes read per candidate
+VERIFY_READ_SECONDS = float(os.getenv('VERIFY_READ_SECONDS', '8'))
+
+# Company websites politeness (shared by domain verification and enrichment)
+COMPANY_SITES_MAX_PER_HOST = int(os.getenv('COMPANY_SITES_MAX_PER_HOST', '2'))
+COMPANY_SITES_MIN_INTERVAL = float(os.getenv('COMPANY_SITES_MIN_INTERVAL', '0.5'))  # seconds
+
+# Enrichment (concurrent companies + page fetches, see company_enricher.py)
+ENRICHER_WORKERS = int(os.getenv('ENRICHER_WORKERS', '8'))
+ENRICHER_MAX_CONNECTIONS = int(os.getenv('ENRICHER_MAX_CONNECTIONS', '24'))
+DNS_CACHE_TTL = int(os.getenv('DNS_CACHE_TTL', '300'))  # seconds, 0 = disabled
+ENRICHER_MAX_PAGES = int(os.getenv('ENRICHER_MAX_PAGES', '5'))  # pages read per company website
+# Website crawling stops once these fields are found (email, phone, linkedin)
+ENRICHER_REQUIRED_FIELDS = [f.strip() for f in os.getenv('ENRICHER_REQUIRED_FIELDS', 'email,phone,linkedin').split(',') if f.strip()]
+
+# Enrichment store (persistent source answers, see enrichment_store.py)
+ENRICH_STORE_ENABLED = os.getenv('ENRICH_STORE_ENABLED', 'True').lower() == 'true'
+ENRICH_STORE_PATH = os.getenv('ENRICH_STORE_PATH', 'cache/enrichment.sqlite')
+ENRICH_REFRESH_WEBSITE = int(os.getenv('ENRICH_REFRESH_WEBSITE', '2592000'))  # seconds (30 days)
+ENRICH_REFRESH_PAPPERS = int(os.getenv('ENRICH_REFRESH_PAPPERS', '7776000'))  # 90 days
+ENRICH_REFRESH_HUNTER = int(os.getenv('ENRICH_REFRESH_HUNTER', '15552000'))  # 180 days
+
+# Web app job progress (SSE streams, see app.job_events)
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', '1000'))  # pending events per subscriber
+SSE_KEEPALIVE_SECONDS = int(os.getenv('SSE_KEEPALIVE_SECONDS', '15'))
+SSE_POLL_SECONDS = float(os.getenv('SSE_POLL_SECONDS', '1'))  # jobs of other workers, read from the state store
+
+# Web app state store (jobs, logs, stage datasets, see state_store.py)
+STATE_BACKEND = os.getenv('STATE_BACKEND', 'sqlite')
+STATE_DB_PATH = os.getenv('STATE_DB_PATH', 'cache/state.sqlite')  # ':memory:' = single process
+JOB_LOG_LIMIT = int(os.getenv('JOB_LOG_LIMIT', '1000'))  # log lines kept per job
+JOB_ROW_BATCH = int(os.getenv('JOB_ROW_BATCH', '500'))  # rows per stored batch
+JOB_TTL = int(os.getenv('JOB_TTL', '86400'))  # finished jobs kept 1 day
+JOB_PRUNE_INTERVAL = int(os.getenv('JOB_PRUNE_INTERVAL', '600'))  # seconds between prunes
+JOB_HEARTBEAT_SECONDS = int(os.getenv('JOB_HEARTBEAT_SECONDS', '30'))  # process liveness in the store
+JOB_OWNER_TIMEOUT = int(os.getenv('JOB_OWNER_TIMEOUT', '120'))  # silent process = dead, its active jobs fail
+
+# Web app job scheduler (bounded pools, see job_scheduler.py)
+JOB_BROWSER_WORKERS = int(os.getenv('JOB_BROWSER_WORKERS', '1'))  # Chrome jobs
+JOB_IO_WORKERS = int(os.getenv('JOB_IO_WORKERS', '2'))  # domain finding, enrichment
+JOB_CPU_WORKERS = int(os.getenv('JOB_CPU_WORKERS', '1'))  # parsing jobs (GIL bound)
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', '10'))  # waiting jobs per pool before rejecting
+JOB_SCHEDULER_POLL_SECONDS = float(os.getenv('JOB_SCHEDULER_POLL_SECONDS', '1'))  # queue check, jobs of other workers
+
+# Parsing service (HTML parsing in worker processes, see parsing_service.py)
+# One pool per web worker: by default the cores are split between the WEB_CONCURRENCY
+# workers, at most 2 processes each
+_DEFAULT_PARSE_WORKERS = max(1, min(2, (os.cpu_count() or 1) // max(1, int(os.getenv('WEB_CONCURRENCY', '1')))))
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(_DEFAULT_PARSE_WORKERS)))  # 0 = parse in-process
+PARSE_OFFLOAD_MIN_BYTES = int(os.getenv('PARSE_OFFLOAD_MIN_BYTES', '200000'))  # smaller pages parsed in-process
+PARSE_TIMEOUT = int(os.getenv('PARSE_TIMEOUT', '60'))  # seconds per parsing task
+PARSE_START_METHOD = os.getenv('PARSE_START_METHOD', 'forkserver' if os.name == 'posix' else 'spawn')
+PARSE_POOL_WARM = os.getenv('PARSE_POOL_WARM', 'True').lower() == 'true'  # start workers with the web app
+
 # Scraping settings
 MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
 RETRY_DELAY = int(os.getenv('RETRY_DELAY', '5'))
@@ -0,0 +1,151 @@
+"""
+Contact Page - single-parse analysis of a company web page
+One lxml parse and one traversal give everything CompanyEnricher extracts:
+
+- visible text (scripts, styles and templates skipped, like get_text())
+- anchors as (href, text), for LinkedIn links and contact page discovery
+- mailto: / tel: targets
+- schema.org Organization data from JSON-LD (email, telephone, sameAs, address)
+"""
+
+import json
+import logging
+from urllib.parse import unquote
+
+from pattern_engine import parse_html, element_text, SILENT_TAGS
+
+logger = logging.getLogger(__name__)
+
+# schema.org types carrying company contact data
+ORGANIZATION_TYPES = frozenset([
+    'Organization', 'Corporation', 'LocalBusiness', 'Store', 'AutoDealer', 'AutoRepair',
+    'AutomotiveBusiness', 'ProfessionalService', 'NGO', 'EducationalOrganization'
+])
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _organizations(data):
+    """schema.org Organization-like objects of a JSON-LD document (@graph and nesting included)"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            types = {t for t in _as_list(node.get('@type')) if isinstance(t, str)}
+            if types & ORGANIZATION_TYPES:
+                yield node
+            stack.extend(reversed([v for v in node.values() if isinstance(v, (dict, list))]))
+
+
+class ContactPage:
+    """
+    Parsed page: text, anchors, mailto/tel targets and JSON-LD organizations
+
+    Args:
+        html: Page HTML, str or raw bytes (bytes let lxml honour the meta charset)
+    """
+
+    def __init__(self, html):
+        self.text_parts = []
+        self.anchors = []
+        self.mailto = []
+        self.tel = []
+        self.organizations = []
+
+        root = parse_html(html)
+        if root is not None:
+            self._walk(root)
+        self.text = ' '.join(self.text_parts)
+
+    def _walk(self, element):
+        tag = element.tag
+        if tag == 'script':
+            if (element.get('type') or '').strip().lower() == 'application/ld+json':
+                self._read_json_ld(element.text)
+            return
+        if tag in SILENT_TAGS:
+            return
+
+        if tag == 'a':
+            href = (element.get('href') or '').strip()
+            if href:
+                self._read_anchor(href, element)
+
+        if element.text and element.text.strip():
+            self.text_parts.append(element.text)
+        for child in element:
+            if isinstance(child.tag, str):  # Skip comments / processing instructions
+                self._walk(child)
+            if child.tail and child.tail.strip():
+                self.text_parts.append(child.tail)
+
+    def _read_anchor(self, href, element):
+        self.anchors.append((href, element_text(element)))
+        lowered = href.lower()
+        if lowered.startswith('mailto:'):
+            address = unquote(href[7:].split('?')[0]).strip()
+            if address:
+                self.mailto.extend(a.strip() for a in address.split(',') if a.strip())
+        elif lowered.startswith('tel:'):
+            number = unquote(href[4:]).strip()
+            if number:
+                self.tel.append(number)
+
+    def _read_json_ld(self, raw):
+        if not raw or not raw.strip():
+            return
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            logger.debug(f"Invalid JSON-LD: {e}")
+            return
+        self.organizations.extend(_organizations(data))
+
+    @property
+    def hrefs(self):
+        return [href for href, _ in self.anchors]
+
+    @property
+    def structured_emails(self):
+        """mailto: targets then JSON-LD emails"""
+        emails = list(self.mailto)
+        for org in self.organizations:
+            emails.extend(str(e).replace('mailto:', '') for e in _as_list(org.get('email')))
+        return emails
+
+    @property
+    def structured_phones(self):
+        """tel: targets then JSON-LD telephones"""
+        phones = list(self.tel)
+        for org in self.organizations:
+            phones.extend(str(p) for p in _as_list(org.get('telephone')))
+        return phones
+
+    @property
+    def same_as(self):
+        """JSON-LD sameAs profile URLs (LinkedIn, social networks)"""
+        urls = []
+        for org in self.organizations:
+            urls.extend(str(u) for u in _as_list(org.get('sameAs')))
+        return urls
+
+    @property
+    def address(self):
+        """First JSON-LD PostalAddress as {'address', 'city', 'postal_code'}, or None"""
+        for org in self.organizations:
+            for address in _as_list(org.get('address')):
+                if isinstance(address, str) and address.strip():
+                    return {'address': address.strip(), 'city': None, 'postal_code': None}
+                if isinstance(address, dict) and (address.get('streetAddress') or address.get('addressLocality')):
+                    return {
+                        'address': address.get('streetAddress'),
+                        'city': address.get('addressLocality'),
+                        'postal_code': address.get('postalCode')
+                    }
+        return None
@@ -0,0 +1,134 @@
+"""
+Session-scoped DNS cache
+install_dns_cache(session) makes the connections of that requests.Session
+resolve through a TTL memo: enrichment opens connections to hundreds of
+company sites, each host is resolved once. Nothing else in the process
+(Selenium, gunicorn, other sessions) is affected: socket.getaddrinfo is
+left untouched
+
+- Successful lookups are kept DNS_CACHE_TTL seconds (0 disables the cache)
+- Failed lookups are kept a shorter time (negative caching), only when the
+  name definitely doesn't resolve: a transient failure (EAI_AGAIN, resolver
+  timeout) is retried on the next connection
+- resolve() gives the same cached answers to direct checks (DNS tier of the
+  domain verification)
+"""
+
+import socket
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError
+from urllib3.util.connection import allowed_gai_family
+
+import config
+
+NEGATIVE_TTL = 60
+# Definitive answers only: unknown host / no address for the name
+NEGATIVE_ERRORS = {getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA') if hasattr(socket, name)}
+MAX_ENTRIES = 10000
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo through the cache"""
+    ttl = config.DNS_CACHE_TTL
+    if ttl <= 0:
+        return socket.getaddrinfo(host, port, family, type, proto, flags)
+
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+    if entry is not None and entry[0] > now:
+        if isinstance(entry[1], socket.gaierror):
+            raise socket.gaierror(*entry[1].args)
+        return list(entry[1])
+
+    try:
+        result = socket.getaddrinfo(host, port, family, type, proto, flags)
+    except socket.gaierror as e:
+        if e.errno in NEGATIVE_ERRORS:
+            _store(key, (now + NEGATIVE_TTL, e))
+        raise
+    _store(key, (now + ttl, result))
+    return list(result)
+
+
+def resolve(host, port):
+    """Distinct addresses of host (cached), in resolver order; raises socket.gaierror"""
+    infos = cached_getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+def _store(key, entry):
+    with _lock:
+        if len(_cache) >= MAX_ENTRIES:
+            _cache.clear()
+        _cache[key] = entry
+
+
+class _CachedResolutionMixin:
+    """urllib3 connection resolving its host through the cache, then trying each address"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = resolve(host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+
+        error = None
+        for address in addresses:
+            self._dns_host = address  # Socket only: Host header, SNI and certificate keep self.host
+            try:
+                return super()._new_conn()
+            except ConnectTimeoutError as e:  # NewConnectionError included
+                error = e
+            finally:
+                self._dns_host = host
+        raise error
+
+
+class CachedDNSHTTPConnection(_CachedResolutionMixin, HTTPConnection):
+    pass
+
+
+class CachedDNSHTTPSConnection(_CachedResolutionMixin, HTTPSConnection):
+    pass
+
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+POOL_CLASSES = {'http': CachedDNSHTTPConnectionPool, 'https': CachedDNSHTTPSConnectionPool}
+
+
+def install_dns_cache(session):
+    """
+    Resolve the connections of every adapter mounted on `session` through the cache
+
+    Call it after the adapters are mounted (install_cache): the pool managers are
+    switched to connection pools using the cached resolver
+    """
+    if config.DNS_CACHE_TTL <= 0:
+        return session
+    for adapter in session.adapters.values():
+        poolmanager = getattr(adapter, 'poolmanager', None)
+        if poolmanager is not None:
+            poolmanager.pool_classes_by_scheme = dict(POOL_CLASSES)
+    return session
+
+
+def clear_dns_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,144 @@
+"""
+Domain Cache - persistent company name -> domain resolutions
+Trade show lists overlap year to year and across shows: a name already
+resolved is answered from a SQLite file instead of Clearbit + verification
+
+- Keyed by PremiumDomainFinder.clean_company_name(name)
+- Found domains are kept DOMAIN_CACHE_TTL, "not found" DOMAIN_CACHE_NEGATIVE_TTL
+- preload(keys) loads a whole list in one query into an in-memory map,
+  so repeat names of a bulk run resolve without touching the disk
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Result fields stored (company_name is the caller's spelling, never stored)
+CACHED_FIELDS = ('domain', 'confidence_score', 'confidence_label', 'false_positive_rate',
+                 'method', 'validation_reason', 'clearbit_name')
+
+SQLITE_MAX_VARIABLES = 900
+
+
+class DomainCache:
+    """SQLite-backed resolution store with positive/negative TTLs"""
+
+    def __init__(self, path=None, ttl=None, negative_ttl=None):
+        self.path = path or config.DOMAIN_CACHE_PATH
+        self.ttl = ttl if ttl is not None else config.DOMAIN_CACHE_TTL
+        self.negative_ttl = negative_ttl if negative_ttl is not None else config.DOMAIN_CACHE_NEGATIVE_TTL
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS resolutions (
+                key TEXT PRIMARY KEY,
+                domain TEXT,
+                result TEXT,
+                resolved_at REAL
+            )
+        ''')
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'stored': 0}
+
+    def _fresh(self, domain, resolved_at):
+        ttl = self.ttl if domain else self.negative_ttl
+        return time.time() - resolved_at < ttl
+
+    def preload(self, keys):
+        """Load the entries of `keys` into memory (one query per 900 keys), returns the number found"""
+        keys = list(dict.fromkeys(k for k in keys if k))
+        loaded = {}
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_MAX_VARIABLES):
+                chunk = keys[start:start + SQLITE_MAX_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, domain, result, resolved_at FROM resolutions WHERE key IN ({placeholders})',
+                    chunk
+                ).fetchall()
+                for key, domain, result, resolved_at in rows:
+                    loaded[key] = (domain, json.loads(result), resolved_at)
+            self._memory.update(loaded)
+        return len(loaded)
+
+    def get(self, key):
+        """Cached result fields for `key` (dict), or None when missing or expired"""
+        if not key:
+            return None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    'SELECT domain, result, resolved_at FROM resolutions WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = self._memory[key] = (row[0], json.loads(row[1]), row[2])
+
+            if entry is None or not self._fresh(entry[0], entry[2]):
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits' if entry[0] else 'negative_hits'] += 1
+            return dict(entry[1])
+
+    def put(self, key, result):
+        """Store the resolution of `key` (a find_domain_single result)"""
+        if not key:
+            return
+        fields = {field: result.get(field) for field in CACHED_FIELDS}
+        now = time.time()
+        with self._lock:
+            # A "not found" never replaces a fresh domain (same key, other spelling)
+            current = self._memory.get(key)
+            if not fields['domain'] and current and current[0] and self._fresh(current[0], current[2]):
+                return
+            self._conn.execute(
+                'INSERT OR REPLACE INTO resolutions VALUES (?, ?, ?, ?)',
+                (key, fields['domain'], json.dumps(fields, ensure_ascii=False), now)
+            )
+            self._memory[key] = (fields['domain'], fields, now)
+            self.stats['stored'] += 1
+
+    def prune(self):
+        """Delete expired entries, returns how many were removed"""
+        now = time.time()
+        with self._lock:
+            deleted = self._conn.execute(
+                'DELETE FROM resolutions WHERE (domain IS NOT NULL AND resolved_at < ?) '
+                'OR (domain IS NULL AND resolved_at < ?)',
+                (now - self.ttl, now - self.negative_ttl)
+            ).rowcount
+            self._memory.clear()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM resolutions')
+            self._memory.clear()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_domain_cache():
+    """Process-wide DomainCache on config.DOMAIN_CACHE_PATH (None when disabled)"""
+    global _shared_cache
+    if not config.DOMAIN_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = DomainCache()
+        return _shared_cache
@@ -5,13 +5,23 @@ Focus: Maximum quality and accuracy
 import json
 import time
 import logging
+import socket
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 from colorama import Fore, init
 from tqdm import tqdm
-import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
+from http_cache import install_cache
+from rate_limiter import get_limiter
+from domain_cache import get_domain_cache
+from name_matching import normalize_name, normalize_names, TokenScorer, NON_ALNUM_PATTERN
+from dns_cache import install_dns_cache, resolve
+from pattern_engine import parse_html
+from parsing_service import ParseTimeout, parse_in_pool
+import config
 
 init(autoreset=True)
 
@@ -21,17 +31,112 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Politeness per external service (shared by all finders of the process):
+# service -> (max concurrent requests per host, min seconds between request starts)
+SERVICE_LIMITS = {
+    'clearbit-autocomplete': (2, 0.2),
+    'clearbit-logo': (8, 0.02),
+    'company-sites': (config.COMPANY_SITES_MAX_PER_HOST, config.COMPANY_SITES_MIN_INTERVAL),
+}
+
+PARKING_HOSTS = ['sedo.com', 'godaddy.com', 'namecheap.com', 'afternic.com', 'dan.com', 'parkingcrew']
+HTML_TYPES = ('text/html', 'application/xhtml', 'text/plain')
+HEADING_END_TAGS = (b'</h1>', b'</h2>')
+VERIFY_CHUNK = 16 * 1024
+# Early-stopped verification bodies in the HTTP cache: own key, kind ('head'/'capped') in a header
+PARTIAL_BODY_KEY = 'verify-partial:'
+PARTIAL_BODY_HEADER = 'X-Verify-Partial'
+
+# Clearbit Logo fallback: candidate domains probed concurrently
+LOGO_TLDS = ['.com', '.fr', '.net', '.eu']
+MAX_LOGO_CANDIDATES = 8
+PROBE_POOL_SIZE = 16
+
+_probe_pool = None
+_probe_pool_lock = threading.Lock()
+
+# candidate domain -> (expiry, known to Clearbit), definitive 200/404 answers only
+# LRU bounded, entries expire (a company may register its domain later)
+LOGO_MEMO_MAX = 20000
+LOGO_MEMO_TTL = 24 * 3600
+_logo_memo = OrderedDict()
+_logo_memo_lock = threading.Lock()
+
+
+def _logo_memo_get(domain):
+    """Memoized Clearbit answer for `domain`, None when unknown or expired"""
+    with _logo_memo_lock:
+        entry = _logo_memo.get(domain)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _logo_memo[domain]
+            return None
+        _logo_memo.move_to_end(domain)
+        return entry[1]
+
+
+def _logo_memo_put(domain, found):
+    with _logo_memo_lock:
+        _logo_memo[domain] = (time.monotonic() + LOGO_MEMO_TTL, found)
+        _logo_memo.move_to_end(domain)
+        while len(_logo_memo) > LOGO_MEMO_MAX:
+            _logo_memo.popitem(last=False)
+
+
+def get_probe_pool():
+    """Process-wide pool for Clearbit Logo probes (separate from the finder workers)"""
+    global _probe_pool
+    with _probe_pool_lock:
+        if _probe_pool is None:
+            _probe_pool = ThreadPoolExecutor(max_workers=PROBE_POOL_SIZE, thread_name_prefix='logo-probe')
+        return _probe_pool
+
+
+def _visible_text(root):
+    """Page text without scripts/styles (like BeautifulSoup get_text())"""
+    return ' '.join(root.xpath('//text()[not(ancestor::script or ancestor::style or ancestor::template)]'))
+
+
+def page_outline(body):
+    """
+    (visible text, title, h1/h2 texts) of a page body, None when unparsable
+    Plain data: runs in the parsing service workers for big bodies
+    """
+    root = parse_html(body)
+    if root is None:
+        return None
+    title = root.find('.//title')
+    return (
+        _visible_text(root),
+        str(title.text_content()) if title is not None else None,
+        [str(heading.text_content()) for heading in root.iter('h1', 'h2')]
+    )
+
 
 class PremiumDomainFinder:
     """Premium domain finder using multiple reliable sources"""
 
-    def __init__(self):
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or config.DOMAIN_FINDER_WORKERS
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        install_cache(self.session, 'domains', pool_maxsize=max(10, self.max_workers))
+        install_dns_cache(self.session)
         self.results = []
 
+        # Rate limiters per service instead of global sleeps
+        self.limiters = {name: get_limiter(name, *limits) for name, limits in SERVICE_LIMITS.items()}
+
+        # Persistent resolutions (None when DOMAIN_CACHE_ENABLED=False)
+        self.cache = get_domain_cache()
+        self._local = threading.local()  # Per-thread: did the Clearbit lookup answer?
+
+        # Name similarity for confidence scoring (IDF fitted on each bulk list)
+        self.name_scorer = TokenScorer()
+
         # Parking indicators
         self.parking_keywords = [
             'domain is for sale', 'buy this domain', 'domain parking',
@@ -40,40 +145,86 @@ class PremiumDomainFinder:
         ]
 
     def clean_company_name(self, name):
-        """Clean company name"""
-        suffixes = ['ltd', 'limited', 'inc', 'incorporated', 'corp', 'corporation',
-                   'gmbh', 'sa', 'sas', 'sarl', 'srl', 'spa', 's.r.l.', 's.p.a.',
-                   'b.v.', 'bv', 'co', 'cie', 'france']
+        """Clean company name (see name_matching.normalize_name)"""
+        return normalize_name(name)
 
-        name_lower = name.lower()
-        for suffix in suffixes:
-            name_lower = re.sub(rf'\b{suffix}\b', '', name_lower)
+    def candidate_domains(self, company_name):
+        """
+        Domains to probe for a name, by priority: TLD first (.com, .fr, ...),
+        then joined / hyphenated / legal-suffix-kept forms
+        """
+        words = self.clean_company_name(company_name).split()
+        if not words:
+            return []
 
-        name_clean = re.sub(r'[^a-z0-9\s]', ' ', name_lower)
-        name_clean = re.sub(r'\s+', ' ', name_clean).strip()
+        forms = [''.join(words)]
+        if len(words) > 1:
+            forms.append('-'.join(words))
+        with_suffix = ''.join(NON_ALNUM_PATTERN.sub(' ', company_name.lower()).split())
+        if with_suffix not in forms:
+            forms.append(with_suffix)
 
-        return name_clean
+        candidates = [f"{form}{tld}" for tld in LOGO_TLDS for form in forms]
+        return candidates[:MAX_LOGO_CANDIDATES]
 
-    def search_clearbit_logo(self, company_name):
-        """Use Clearbit Logo API (free, no key needed)"""
+    def probe_logo(self, domain, done=None):
+        """
+        True if Clearbit has a logo for `domain`, False if not, None on error (memoized)
+        done: optional threading.Event, once set the probe is skipped (answer already found)
+        """
+        found = _logo_memo_get(domain)
+        if found is not None:
+            return found
+
+        url = f"https://logo.clearbit.com/{domain}"
         try:
-            clean_name = self.clean_company_name(company_name)
-            clean_name = clean_name.replace(' ', '')
+            with self.limiters['clearbit-logo'].slot(url):
+                if done is not None and done.is_set():
+                    return None  # Checked after the rate-limit wait, right before the request
+                response = self.session.head(url, timeout=5)
+        except Exception as e:
+            logger.debug(f"Clearbit logo probe failed for {domain}: {e}")
+            return None
 
-            # Try .com first
-            for tld in ['.com', '.fr', '.net']:
-                domain = f"{clean_name}{tld}"
-                url = f"https://logo.clearbit.com/{domain}"
+        found = response.status_code == 200
+        if response.status_code in (200, 404):
+            _logo_memo_put(domain, found)
+        return found
 
-                try:
-                    response = self.session.head(url, timeout=5)
-                    if response.status_code == 200:
-                        return domain
-                except:
-                    continue
+    def search_clearbit_logo(self, company_name):
+        """
+        Use Clearbit Logo API (free, no key needed)
 
+        Every candidate domain is probed at once; the answer is the first
+        success in priority order. Probes still queued are cancelled and the
+        ones waiting for a rate-limit slot see the `done` flag; a HEAD request
+        already sent can't be interrupted and runs to its (5 s) timeout
+        """
+        candidates = self.candidate_domains(company_name)
+
+        # Memoized answers first: only the unknown candidates go to the network
+        known = [_logo_memo_get(domain) for domain in candidates]
+        for domain, found in zip(candidates, known):
+            if found is None:
+                break
+            if found:
+                return domain
+        if all(found is False for found in known):
+            return None
+
+        pool = get_probe_pool()
+        done = threading.Event()
+        futures = [pool.submit(self.probe_logo, domain, done) for domain in candidates]
+        try:
+            for domain, future in zip(candidates, futures):
+                if future.result():
+                    return domain
         except Exception as e:
             logger.debug(f"Clearbit error for {company_name}: {e}")
+        finally:
+            done.set()
+            for future in futures:
+                future.cancel()
 
         return None
 
@@ -86,8 +237,10 @@ class PremiumDomainFinder:
             query = company_name
             url = f"https://autocomplete.clearbit.com/v1/companies/suggest?query={requests.utils.quote(query)}"
 
-            response = self.session.get(url, timeout=10)
+            with self.limiters['clearbit-autocomplete'].slot(url):
+                response = self.session.get(url, timeout=10)
 
+            self._local.api_answered = response.status_code == 200
             if response.status_code == 200:
                 results = response.json()
 
@@ -101,6 +254,7 @@ class PremiumDomainFinder:
                         return domain, first_result.get('name'), first_result.get('logo')
 
         except Exception as e:
+            self._local.api_answered = False
             logger.debug(f"Clearbit API error for {company_name}: {e}")
 
         return None, None, None
@@ -109,75 +263,204 @@ class PremiumDomainFinder:
         """
         Verify domain is real company website, not parked
 
+        Tiered, cheapest checks first:
+        1. DNS resolution (cached) - dead domains cost no HTTP request
+        2. Status and redirect chain (response headers only) vs parking hosts
+        3. Streamed body: the head (up to the first heading after <title>) settles
+           a company name in the title/headings or a parking page; otherwise the
+           rest is read for the body-text checks, capped at VERIFY_MAX_BYTES /
+           VERIFY_READ_SECONDS
+
         Returns: (is_valid, confidence, reason)
         """
         try:
+            # Tier 1: DNS
+            try:
+                resolve(domain, 443)
+            except socket.gaierror:
+                return False, 0.0, "DNS not resolved"
+
+            # Tier 2: status + redirects, before reading any body byte
             url = f"https://{domain}"
-            response = self.session.get(url, timeout=10, allow_redirects=True)
+            verdict = self._verify_from_partial_body(url, company_name)
+            if verdict:
+                return verdict
+
+            # The slot is held until the body is read: the connection stays busy until then
+            with self.limiters['company-sites'].slot(domain):
+                response = self.session.get(url, timeout=(5, 10), allow_redirects=True, stream=True)
+                with response:
+                    if response.status_code >= 400:
+                        return False, 0.0, "Site not accessible"
+
+                    # Check redirect to parking (every hop of the chain)
+                    hops = [r.headers.get('Location', '') for r in response.history] + [response.url]
+                    for parking_domain in PARKING_HOSTS:
+                        if any(parking_domain in hop for hop in hops):
+                            return False, 0.0, f"Redirects to parking: {parking_domain}"
+
+                    content_type = response.headers.get('Content-Type', '').lower()
+                    if content_type and not content_type.startswith(HTML_TYPES):
+                        return False, 0.3, f"Not an HTML page ({content_type.split(';')[0]})"
+
+                    # Tier 3: size/time-limited body, head first
+                    deadline = time.monotonic() + config.VERIFY_READ_SECONDS
+                    chunks = response.iter_content(VERIFY_CHUNK)
+                    body = bytearray()
+                    complete = self.read_head_of_page(chunks, body, deadline)
+                    stopped_at_heading = (not complete and len(body) < config.VERIFY_MAX_BYTES
+                                          and time.monotonic() <= deadline)
+                    if stopped_at_heading:
+                        outline = parse_in_pool(page_outline, bytes(body))
+                        verdict = outline and self.analyze_page_head(outline, company_name)
+                        if verdict:
+                            self._store_partial_body(url, response, body, 'head')
+                            return verdict
+                        # Nothing conclusive in the head: keyword counts need the whole text
+                        complete = self.read_head_of_page(chunks, body, deadline, stop_at_heading=False)
+
+                    # Complete bodies are stored by the HTTP cache itself
+                    if not complete:
+                        self._store_partial_body(url, response, body, 'capped')
+
+            outline = parse_in_pool(page_outline, bytes(body))
+            if outline is None:
+                return False, 0.3, "Very minimal content"
+            return self.analyze_page_content(outline, company_name, complete)
+
+        except ParseTimeout as e:
+            # Any of the outline parses: no verdict on the content, the domain stays unverified
+            logger.warning(f"Validation of {domain} skipped: {e}")
+            return None, 0.0, "Page parsing timed out"
+        except Exception as e:
+            logger.debug(f"Validation error for {domain}: {e}")
+            return None, 0.0, f"Error: {str(e)}"
+
+    def _partial_cache(self, url):
+        """(HTTPCache, ttl) behind the session for `url`, or (None, 0) without cache"""
+        adapter = self.session.get_adapter(url)
+        return getattr(adapter, 'cache', None), getattr(adapter, 'ttl', 0)
+
+    def _store_partial_body(self, url, response, body, kind):
+        """
+        Keep an early-stopped body (head only or capped read) for later verifications
 
-            if response.status_code >= 400:
-                return False, 0.0, "Site not accessible"
+        Stored under its own key: the HTTP cache never serves a truncated page for `url`
+        """
+        cache, _ = self._partial_cache(url)
+        if cache is None:
+            return
+        headers = dict(response.headers)
+        headers[PARTIAL_BODY_HEADER] = kind
+        try:
+            cache.put(PARTIAL_BODY_KEY + url, response.status_code, headers, bytes(body))
+        except Exception as e:
+            logger.debug(f"Partial body store failed for {url}: {e}")
+
+    def _verify_from_partial_body(self, url, company_name):
+        """Verdict from a fresh cached early-stopped body, or None (fetch the page)"""
+        cache, ttl = self._partial_cache(url)
+        if cache is None:
+            return None
+        entry = cache.get(PARTIAL_BODY_KEY + url)
+        if entry is None or time.time() - entry['stored_at'] >= ttl:
+            return None
+
+        outline = parse_in_pool(page_outline, entry['body'])
+        if entry['headers'].get(PARTIAL_BODY_HEADER) == 'head':
+            # The head settled another name: this one may need the rest of the page
+            return (outline and self.analyze_page_head(outline, company_name)) or None
+        if outline is None:
+            return False, 0.3, "Very minimal content"
+        return self.analyze_page_content(outline, company_name, False)
+
+    @staticmethod
+    def read_head_of_page(chunks, body, deadline, stop_at_heading=True):
+        """
+        Append streamed body chunks to `body` (bytearray) up to the first heading
+        after <title> (stop_at_heading), at most VERIFY_MAX_BYTES and until `deadline`
 
-            # Check redirect to parking
-            final_url = response.url
-            parking_domains = ['sedo.com', 'godaddy.com', 'namecheap.com',
-                             'afternic.com', 'dan.com', 'parkingcrew']
+        Returns: complete - False when reading stopped before the end of the page
+        """
+        title_seen = False
+        for chunk in chunks:
+            body.extend(chunk)
+            if len(body) >= config.VERIFY_MAX_BYTES or time.monotonic() > deadline:
+                return False
+            if stop_at_heading:
+                window = body[-(len(chunk) + 16):].lower()  # Tags split across chunks included
+                title_seen = title_seen or b'</title>' in window
+                if title_seen and any(tag in window for tag in HEADING_END_TAGS):
+                    return False
+        return True
+
+    def analyze_page_head(self, outline, company_name):
+        """
+        Checks that can't change with more text: parking keywords already found,
+        company name in the title/headings. None when the rest of the page is needed
+        """
+        text, title, headings = outline
+        parking_count = sum(1 for keyword in self.parking_keywords if keyword in text.lower())
+        if parking_count >= 2:
+            return False, 0.0, f"Contains {parking_count} parking keywords"
+        return self._name_in_title_or_headings(title, headings, company_name)
 
-            for parking_domain in parking_domains:
-                if parking_domain in final_url:
-                    return False, 0.0, f"Redirects to parking: {parking_domain}"
+    def _name_in_title_or_headings(self, title, headings, company_name):
+        company_words = [w for w in self.clean_company_name(company_name).split() if len(w) > 3]
 
-            # Check content
-            soup = BeautifulSoup(response.text, 'lxml')
-            text_content = soup.get_text().lower()
+        # Check title
+        if title is not None:
+            title_text = title.lower()
+            words_in_title = sum(1 for word in company_words if word in title_text)
 
-            # Check for parking keywords
-            parking_count = sum(1 for keyword in self.parking_keywords
-                              if keyword in text_content)
+            if words_in_title >= min(2, len(company_words)):
+                return True, 0.9, "Company name in title"
 
-            if parking_count >= 2:
-                return False, 0.0, f"Contains {parking_count} parking keywords"
+        # Check headings
+        for heading in headings:
+            heading_text = heading.lower()
+            words_in_heading = sum(1 for word in company_words if word in heading_text)
 
-            # Check for minimal content
-            if len(text_content.strip()) < 200:
-                return False, 0.3, "Very minimal content"
+            if words_in_heading >= 2:
+                return True, 0.7, "Company name in headings"
 
-            # Check for company name match
-            company_clean = self.clean_company_name(company_name).lower()
-            company_words = [w for w in company_clean.split() if len(w) > 3]
+        return None
 
-            # Check title
-            title = soup.find('title')
-            if title:
-                title_text = title.get_text().lower()
-                words_in_title = sum(1 for word in company_words if word in title_text)
+    def analyze_page_content(self, outline, company_name, complete=True):
+        """
+        Parking keywords, content size and company name checks on a page outline
+        (see page_outline; the minimal content check only applies to a page read to the end)
+        """
+        text, title, headings = outline
+        text_content = text.lower()
 
-                if words_in_title >= min(2, len(company_words)):
-                    return True, 0.9, "Company name in title"
+        # Check for parking keywords
+        parking_count = sum(1 for keyword in self.parking_keywords
+                          if keyword in text_content)
 
-            # Check headings
-            headings = soup.find_all(['h1', 'h2'])
-            for heading in headings:
-                heading_text = heading.get_text().lower()
-                words_in_heading = sum(1 for word in company_words if word in heading_text)
+        if parking_count >= 2:
+            return False, 0.0, f"Contains {parking_count} parking keywords"
 
-                if words_in_heading >= 2:
-                    return True, 0.7, "Company name in headings"
+        # Check for minimal content
+        if complete and len(text_content.strip()) < 200:
+            return False, 0.3, "Very minimal content"
 
-            # Check general content match
-            if company_words:
-                words_in_content = sum(1 for word in company_words if word in text_content)
-                match_ratio = words_in_content / len(company_words)
+        # Check for company name match (title, headings)
+        verdict = self._name_in_title_or_headings(title, headings, company_name)
+        if verdict:
+            return verdict
 
-                if match_ratio >= 0.5:
-                    return True, 0.6, f"Company keywords match ({match_ratio:.0%})"
+        # Check general content match
+        company_words = [w for w in self.clean_company_name(company_name).split() if len(w) > 3]
+        if company_words:
+            words_in_content = sum(1 for word in company_words if word in text_content)
+            match_ratio = words_in_content / len(company_words)
 
-            # Has real content but no clear company match
-            return False, 0.4, "Content doesn't match company"
+            if match_ratio >= 0.5:
+                return True, 0.6, f"Company keywords match ({match_ratio:.0%})"
 
-        except Exception as e:
-            logger.debug(f"Validation error for {domain}: {e}")
-            return None, 0.0, f"Error: {str(e)}"
+        # Has real content but no clear company match
+        return False, 0.4, "Content doesn't match company"
 
     def calculate_confidence_score(self, confidence, clearbit_name, company_name, method):
         """
@@ -190,14 +473,14 @@ class PremiumDomainFinder:
 
         # Adjust based on Clearbit name match
         if clearbit_name:
-            company_clean = self.clean_company_name(company_name).lower()
-            clearbit_clean = self.clean_company_name(clearbit_name).lower()
+            company_clean = self.clean_company_name(company_name)
+            clearbit_clean = self.clean_company_name(clearbit_name)
 
-            # Exact match boost
-            if company_clean == clearbit_clean:
+            # Exact match boost (spaces ignored: "Auto Distri" / "AutoDistri")
+            if company_clean.replace(' ', '') == clearbit_clean.replace(' ', ''):
                 score += 0.1
-            # Similar match
-            elif any(word in clearbit_clean for word in company_clean.split() if len(word) > 3):
+            # Similar match: most of the (IDF-weighted) tokens shared
+            elif self.name_scorer.similarity(company_clean, clearbit_clean) >= 0.5:
                 score += 0.05
             # No match - penalty
             else:
@@ -222,9 +505,10 @@ class PremiumDomainFinder:
 
         return score, fp_rate, label
 
-    def find_domain_single(self, company_name):
-        """Find and validate domain for a single company"""
-        result = {
+    @staticmethod
+    def empty_result(company_name):
+        """Result of a company without domain"""
+        return {
             'company_name': company_name,
             'domain': None,
             'confidence_score': 0.0,
@@ -235,6 +519,28 @@ class PremiumDomainFinder:
             'clearbit_name': None
         }
 
+    def find_domain_single(self, company_name):
+        """Find and validate domain for a single company (domain cache first)"""
+        key = self.clean_company_name(company_name)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"Domain cache hit: {company_name} -> {cached['domain']}")
+                return {'company_name': company_name, **cached}
+
+        self._local.api_answered = False
+        result = self.resolve_domain(company_name)
+
+        # "Not found" is only remembered when Clearbit actually answered
+        # (a network error or a 429 must not hide the company for days)
+        if self.cache is not None and (result['domain'] or self._local.api_answered):
+            self.cache.put(key, result)
+        return result
+
+    def resolve_domain(self, company_name):
+        """Find and validate domain for a single company (network)"""
+        result = self.empty_result(company_name)
+
         logger.info(f"\n{Fore.CYAN}Searching: {company_name}")
 
         # Strategy 1: Clearbit Autocomplete API (best method, free)
@@ -270,7 +576,6 @@ class PremiumDomainFinder:
                 logger.warning(f"  {Fore.YELLOW}✗ Rejected: {reason}")
 
         # Strategy 2: Clearbit Logo API fallback
-        time.sleep(0.5)
         domain = self.search_clearbit_logo(company_name)
 
         if domain:
@@ -299,22 +604,65 @@ class PremiumDomainFinder:
         logger.warning(f"  {Fore.YELLOW}✗ No valid domain found")
         return result
 
-    def find_domains_bulk(self, companies, max_results=None):
-        """Find domains for multiple companies"""
+    def find_domains_bulk(self, companies, max_results=None, progress_callback=None, result_callback=None):
+        """
+        Find domains for multiple companies concurrently
+
+        Companies are resolved by a pool of max_workers threads; politeness is
+        enforced by the per-service rate limiters. Results keep the input order.
+
+        Args:
+            companies: List of company names
+            max_results: Only process the first N companies
+            progress_callback: Optional callback(done, total, message)
+            result_callback: Optional callback(index, result) as each company is resolved
+        """
         if max_results:
             companies = companies[:max_results]
 
         logger.info(f"{Fore.CYAN}{'='*60}")
         logger.info(f"{Fore.CYAN}PREMIUM QUALITY MODE - Accuracy over Speed")
-        logger.info(f"{Fore.CYAN}Processing {len(companies)} companies...")
+        logger.info(f"{Fore.CYAN}Processing {len(companies)} companies ({self.max_workers} workers)...")
         logger.info(f"{Fore.CYAN}{'='*60}\n")
 
-        results = []
-
-        for company in tqdm(companies, desc="Processing"):
-            result = self.find_domain_single(company)
-            results.append(result)
-            time.sleep(1)  # Be respectful to APIs
+        results = [None] * len(companies)
+        total = len(companies)
+
+        # Generic words of this list ("auto", "garage"...) weigh less in name matching
+        keys = normalize_names(companies)
+        self.name_scorer = TokenScorer.fit(companies)
+
+        # One query for the whole list: repeat names never touch the disk again
+        if self.cache is not None:
+            preloaded = self.cache.preload(keys)
+            logger.info(f"Domain cache: {preloaded} known names preloaded")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                tqdm(total=total, desc="Processing") as progress:
+            futures = {
+                executor.submit(self.find_domain_single, company): index
+                for index, company in enumerate(companies)
+            }
+
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        logger.error(f"Domain search failed for {companies[index]}: {e}")
+                        results[index] = self.empty_result(companies[index])
+
+                    progress.update(1)
+                    if result_callback:
+                        result_callback(index, results[index])
+                    if progress_callback:
+                        domain = results[index]['domain'] or 'not found'
+                        progress_callback(done, total, f"{companies[index]}: {domain}")
+            except BaseException:
+                # Stopped early (e.g. job cancelled from progress_callback): drop the pending tasks
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
         self.results = results
         return results
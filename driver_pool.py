@@ -0,0 +1,331 @@
+"""
+WebDriver Pool - process-wide pool of warm headless Chrome instances
+Scrapers check a driver out, use it, and check it back in instead of paying a
+cold Chrome start (and a ChromeDriverManager network check) on every job
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def get_chromedriver_path():
+    """Resolve chromedriver once per process (ChromeDriverManager hits the network)"""
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
+
+def launch_chrome(chrome_options, page_load_timeout=30):
+    """Start a Chrome WebDriver with the cached chromedriver binary"""
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+
+class PoolTimeout(Exception):
+    """No driver became available before the checkout timeout"""
+
+
+class _PooledDriver:
+    """A driver plus the bookkeeping used for recycling"""
+    __slots__ = ('driver', 'created_at', 'uses')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Bounded pool of WebDriver instances
+
+    Args:
+        factory: Callable returning a new, configured WebDriver
+        max_size: Maximum number of live drivers (idle + checked out)
+        max_age: Seconds after which a driver is recycled on checkin
+        max_uses: Number of checkouts after which a driver is recycled
+        name: Label used in logs
+    """
+
+    def __init__(self, factory, max_size=2, max_age=1800, max_uses=50, name='chrome'):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.name = name
+
+        self._idle = []
+        self._in_use = {}  # id(driver) -> _PooledDriver
+        self._creating = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Checkout / checkin
+    # ------------------------------------------------------------------
+
+    def checkout(self, timeout=120):
+        """Get a healthy driver, launching one if the pool isn't full"""
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError(f"Driver pool '{self.name}' is closed")
+
+                pooled = None
+                if self._idle:
+                    pooled = self._idle.pop()
+                    self._in_use[id(pooled.driver)] = pooled
+                elif self._live_count() < self.max_size:
+                    self._creating += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"No driver available in pool '{self.name}' after {timeout}s")
+                    self._cond.wait(remaining)
+                    continue
+
+            if pooled is None:
+                pooled = self._create()
+                with self._cond:
+                    self._creating -= 1
+                    pooled.uses += 1
+                    self._in_use[id(pooled.driver)] = pooled
+                return pooled.driver
+
+            if not self._is_healthy(pooled):
+                logger.info(f"[{self.name}] Discarding unhealthy driver")
+                with self._cond:
+                    self._in_use.pop(id(pooled.driver), None)
+                self._discard(pooled)
+                continue
+
+            with self._cond:
+                pooled.uses += 1
+            return pooled.driver
+
+    def checkin(self, driver):
+        """Return a driver: reset its state, or recycle it if old/broken"""
+        with self._cond:
+            pooled = self._in_use.pop(id(driver), None)
+        if pooled is None:
+            # Not ours (or already returned): just close it
+            self._quit(driver)
+            return
+
+        expired = (time.monotonic() - pooled.created_at > self.max_age
+                   or pooled.uses >= self.max_uses)
+
+        if self._closed or expired or not self._reset(driver):
+            self._discard(pooled)
+            return
+
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout=120):
+        """with pool.lease() as driver: ..."""
+        driver = self.checkout(timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def warm(self, count=1, background=True):
+        """Pre-launch up to `count` idle drivers (capped by max_size)"""
+        def _warm():
+            for _ in range(count):
+                with self._cond:
+                    if self._closed or self._live_count() >= self.max_size or len(self._idle) >= count:
+                        return
+                    self._creating += 1
+                try:
+                    pooled = self._create()
+                except Exception as e:
+                    logger.warning(f"[{self.name}] Warm-up failed: {e}")
+                    return
+                with self._cond:
+                    self._creating -= 1
+                    self._idle.append(pooled)
+                    self._cond.notify()
+
+        if background:
+            threading.Thread(target=_warm, name=f'{self.name}-warmup', daemon=True).start()
+        else:
+            _warm()
+
+    def close(self):
+        """Quit every idle driver; checked-out drivers are quit on checkin"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pooled in idle:
+            self._quit(pooled.driver)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'name': self.name,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'creating': self._creating,
+                'max_size': self.max_size
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _live_count(self):
+        return len(self._idle) + len(self._in_use) + self._creating
+
+    def _create(self):
+        """
+        Launch a driver (a creation slot must already be reserved)
+        On success the caller releases the slot when it stores the driver
+        """
+        start = time.monotonic()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._cond:
+                self._creating -= 1
+                self._cond.notify()
+            raise
+        logger.info(f"[{self.name}] Launched driver in {time.monotonic() - start:.1f}s")
+        return _PooledDriver(driver)
+
+    def _discard(self, pooled):
+        self._quit(pooled.driver)
+        with self._cond:
+            self._cond.notify()
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(pooled):
+        """Browser process alive and responding to commands"""
+        try:
+            process = getattr(pooled.driver.service, 'process', None)
+            if process is not None and process.poll() is not None:
+                return False
+            return pooled.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        """
+        Bring a driver back to a blank state: one fresh tab, no cookies, storage or cache
+
+        Storage.clearDataForOrigin takes one concrete origin (no wildcard): every
+        origin of the lease is collected first, from each tab's navigation history,
+        its frames and the cookie domains
+        """
+        try:
+            origins = set()
+            old_handles = driver.window_handles
+            for handle in old_handles:
+                driver.switch_to.window(handle)
+                origins.update(_tab_origins(driver))
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            for cookie in cookies:
+                domain = cookie.get('domain', '').lstrip('.')
+                if domain:
+                    origins.update((f'https://{domain}', f'http://{domain}'))
+
+            # A new tab also drops the per-tab sessionStorage and history
+            driver.switch_to.new_window('tab')
+            for handle in old_handles:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            logger.debug(f"Driver reset: storage of {len(origins)} origins cleared")
+            return True
+        except Exception as e:
+            logger.debug(f"Driver reset failed: {e}")
+            return False
+
+
+def _origin(url):
+    """scheme://host[:port] of an http(s) URL, None for about:, data:, chrome:..."""
+    parsed = urlparse(url or '')
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return None
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
+def _tab_origins(driver):
+    """Origins the current tab visited (navigation history) or still embeds (frame tree)"""
+    urls = [entry.get('url') for entry in
+            driver.execute_cdp_cmd('Page.getNavigationHistory', {}).get('entries', [])]
+    frames = [driver.execute_cdp_cmd('Page.getFrameTree', {}).get('frameTree', {})]
+    while frames:
+        node = frames.pop()
+        urls.append(node.get('frame', {}).get('url'))
+        frames.extend(node.get('childFrames', []))
+    return {origin for origin in map(_origin, urls) if origin}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name, factory, max_size=None, max_age=None, max_uses=None):
+    """Process-wide pool registry: one pool per browser profile name"""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = DriverPool(
+                factory,
+                max_size=max_size or config.DRIVER_POOL_SIZE,
+                max_age=max_age or config.DRIVER_POOL_MAX_AGE,
+                max_uses=max_uses or config.DRIVER_POOL_MAX_USES,
+                name=name
+            )
+        return pool
+
+
+@atexit.register
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
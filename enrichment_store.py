@@ -0,0 +1,160 @@
+"""
+Enrichment Store - persistent per-domain enrichment data
+Every source answer (website scrape, Pappers, Hunter) is kept with its fetch
+time, and every output field with the source it came from
+
+- Refresh policy per source (ENRICH_REFRESH_*): a rerun reuses the fresh
+  source answers and only calls the stale ones again - Hunter (~50 calls/month)
+  and Pappers quotas are only spent once per refresh period
+- fields(domain): field -> {'value', 'source', 'fetched_at'} (provenance);
+  a field that comes back empty is deleted, never served from an older run
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Source -> seconds before its answer is fetched again
+REFRESH_POLICIES = {
+    'website': config.ENRICH_REFRESH_WEBSITE,
+    'pappers': config.ENRICH_REFRESH_PAPPERS,
+    'hunter': config.ENRICH_REFRESH_HUNTER,
+}
+
+
+class EnrichmentStore:
+    """SQLite store: source answers, field provenance, companies"""
+
+    def __init__(self, path=None, policies=None):
+        self.path = path or config.ENRICH_STORE_PATH
+        self.policies = dict(REFRESH_POLICIES, **(policies or {}))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS sources (
+                domain TEXT,
+                source TEXT,
+                payload TEXT,
+                fetched_at REAL,
+                PRIMARY KEY (domain, source)
+            );
+            CREATE TABLE IF NOT EXISTS fields (
+                domain TEXT,
+                field TEXT,
+                value TEXT,
+                source TEXT,
+                fetched_at REAL,
+                PRIMARY KEY (domain, field)
+            );
+            CREATE TABLE IF NOT EXISTS companies (
+                domain TEXT PRIMARY KEY,
+                company_name TEXT,
+                siren TEXT,
+                updated_at REAL
+            );
+        ''')
+        self.stats = {'reused': 0, 'fetched': 0}
+
+    def sources(self, domain):
+        """Stored source answers of `domain`: source -> (payload, fetched_at)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT source, payload, fetched_at FROM sources WHERE domain = ?', (domain,)
+            ).fetchall()
+        return {source: (json.loads(payload), fetched_at) for source, payload, fetched_at in rows}
+
+    def is_fresh(self, source, fetched_at):
+        return time.time() - fetched_at < self.policies.get(source, 0)
+
+    def fresh_sources(self, domain):
+        """Source answers of `domain` still within their refresh policy"""
+        fresh = {source: entry for source, entry in self.sources(domain).items()
+                 if self.is_fresh(source, entry[1])}
+        with self._lock:
+            self.stats['reused'] += len(fresh)
+        return fresh
+
+    def put_source(self, domain, source, payload, fetched_at=None):
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)',
+                (domain, source, json.dumps(payload, ensure_ascii=False), fetched_at)
+            )
+            self.stats['fetched'] += 1
+        return fetched_at
+
+    def put_fields(self, domain, company_name, fields, siren=None):
+        """
+        Record the output fields of `domain`
+
+        Args:
+            fields: field -> (value, source, fetched_at); an empty value deletes the
+                field (and its provenance) recorded by a previous run
+        """
+        rows = []
+        emptied = []
+        for field, (value, source, fetched_at) in fields.items():
+            if value in (None, '', []):
+                emptied.append((domain, field))
+            else:
+                rows.append((domain, field, json.dumps(value, ensure_ascii=False), source, fetched_at))
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany('INSERT OR REPLACE INTO fields VALUES (?, ?, ?, ?, ?)', rows)
+                self._conn.executemany('DELETE FROM fields WHERE domain = ? AND field = ?', emptied)
+                self._conn.execute(
+                    'INSERT INTO companies VALUES (?, ?, ?, ?) ON CONFLICT(domain) DO UPDATE SET '
+                    'company_name = excluded.company_name, '
+                    'siren = COALESCE(excluded.siren, companies.siren), updated_at = excluded.updated_at',
+                    (domain, company_name, siren, now)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def fields(self, domain):
+        """Recorded fields of `domain`: field -> {'value', 'source', 'fetched_at'}"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT field, value, source, fetched_at FROM fields WHERE domain = ?', (domain,)
+            ).fetchall()
+        return {
+            field: {'value': json.loads(value), 'source': source, 'fetched_at': fetched_at}
+            for field, value, source, fetched_at in rows
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.executescript('DELETE FROM sources; DELETE FROM fields; DELETE FROM companies;')
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_enrichment_store():
+    """Process-wide EnrichmentStore on config.ENRICH_STORE_PATH (None when disabled)"""
+    global _shared_store
+    if not config.ENRICH_STORE_ENABLED:
+        return None
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = EnrichmentStore()
+        return _shared_store
@@ -9,6 +9,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from scraper import WebScraper
+from page_readiness import wait_until_ready, wait_for_dom_quiet
+from browser_profile import enable_resource_blocking
 from colorama import Fore
 import config
 
@@ -34,8 +36,9 @@ class EquipautoScraperFast(WebScraper):
             # Navigate to main page
             main_url = 'https://paris.equipauto.com/liste-des-exposants/'
             logger.info(f"{Fore.CYAN}Loading main page: {main_url}")
+            enable_resource_blocking(self.driver, main_url)
             self.driver.get(main_url)
-            time.sleep(3)
+            self.page_timings.append(wait_until_ready(self.driver, main_url, label='main page'))
 
             # Accept cookies if present
             logger.info(f"{Fore.YELLOW}Looking for cookie consent...")
@@ -52,7 +55,7 @@ class EquipautoScraperFast(WebScraper):
                     }
                 """)
                 logger.info(f"{Fore.GREEN}Attempted to click cookie consent")
-                time.sleep(1)
+                wait_for_dom_quiet(self.driver, label='cookies')
             except Exception as e:
                 logger.info(f"{Fore.YELLOW}No cookie consent found")
 
@@ -68,8 +71,8 @@ class EquipautoScraperFast(WebScraper):
                 logger.warning(f"{Fore.YELLOW}Could not find iframe")
                 return all_exhibitors
 
-            # Wait for content to load
-            time.sleep(5)
+            # Wait for content to load (readiness of the iframe document)
+            self.page_timings.append(wait_until_ready(self.driver, main_url, label='iframe'))
 
             # Click on "Liste" button using JavaScript
             logger.info(f"{Fore.YELLOW}Looking for 'Liste' button...")
@@ -86,13 +89,14 @@ class EquipautoScraperFast(WebScraper):
                     }
                 """)
                 logger.info(f"{Fore.GREEN}Clicked 'Liste' button")
-                time.sleep(3)
             except Exception as e:
                 logger.warning(f"{Fore.YELLOW}Error clicking Liste button: {e}")
 
-            # Wait for list to load
+            # Wait for list to load: DOM quiet + element count stable after the click
             logger.info(f"{Fore.YELLOW}Waiting for exhibitor list to load...")
-            time.sleep(5)
+            self.page_timings.append(
+                wait_until_ready(self.driver, main_url, label='exhibitor list', after_action=True, stable_polls=3)
+            )
 
             # Get page source and parse with BeautifulSoup (much faster than Selenium element iteration)
             logger.info(f"{Fore.CYAN}Parsing page source...")
@@ -0,0 +1,319 @@
+"""
+Single-pass extraction engine for UniversalScraper
+Parses the page once, indexes every tag in one traversal and answers the six
+company-name strategies from that index (same output as the multi-pass version)
+"""
+
+import re
+from bisect import bisect_right
+from bs4 import BeautifulSoup
+
+
+# Strategy 1: href regexes that identify a company profile link
+PROFILE_PATTERNS = [
+    r'/fabricant/[^/]+',
+    r'/company/[^/]+',
+    r'/entreprise/[^/]+',
+    r'/exposant/[^/]+',
+    r'/member/[^/]+',
+    r'-s\d+\.html',
+    r'/fournisseur/[^/]+',
+    r'/supplier/[^/]+'
+]
+
+# Substring checks used by the other strategies (on href.lower())
+TITLED_NAV_EXCLUSIONS = ['/news', '/blog', '/contact', '/about', '/articles', '/actualites',
+                         '/search', '/login', '/mon-compte', '/profile']
+LIST_NAV_EXCLUSIONS = ['/news', '/blog', '/actualites', '/articles', '/contact']
+TITLED_PROFILE_MARKERS = ['/fabricant/', '/company/', '/entreprise/', '/exposant/',
+                          '/member/', '/fournisseur/', '/supplier/']
+CONTAINER_PROFILE_MARKERS = TITLED_PROFILE_MARKERS + ['-s']
+TABLE_PROFILE_MARKERS = ['/fabricant/', '/company/', '/exposant/']
+CARD_PROFILE_MARKERS = ['/fabricant/', '/company/', '/exposant/', '/entreprise/', '-s']
+
+CARD_CLASS_PATTERN = 'card|item|box|result|listing|exhibitor'
+
+DEFAULT_COMPANY_INDICATORS = [
+    'company', 'entreprise', 'exhibitor', 'exposant', 'vendor',
+    'supplier', 'fournisseur', 'partner', 'partenaire', 'member',
+    'société', 'business', 'firm', 'organization'
+]
+
+
+def _substring_regex(substrings):
+    """Compile a list of literal substrings into one alternation"""
+    return re.compile('|'.join(re.escape(s) for s in substrings))
+
+
+_PROFILE_RES = [re.compile(p, re.I) for p in PROFILE_PATTERNS]
+_TITLED_NAV_RE = _substring_regex(TITLED_NAV_EXCLUSIONS)
+_LIST_NAV_RE = _substring_regex(LIST_NAV_EXCLUSIONS)
+_TITLED_PROFILE_RE = _substring_regex(TITLED_PROFILE_MARKERS)
+_CONTAINER_PROFILE_RE = _substring_regex(CONTAINER_PROFILE_MARKERS)
+_TABLE_PROFILE_RE = _substring_regex(TABLE_PROFILE_MARKERS)
+_CARD_PROFILE_RE = _substring_regex(CARD_PROFILE_MARKERS)
+_CARD_CLASS_RE = re.compile(CARD_CLASS_PATTERN, re.I)
+
+# One alternation over every profile pattern and nav exclusion: links that don't
+# match it (the vast majority on a directory page) need no further checks
+_ANCHOR_SIGNAL_RE = re.compile(
+    '|'.join(f'(?:{p})' for p in PROFILE_PATTERNS) + '|' +
+    '|'.join(re.escape(s) for s in dict.fromkeys(
+        TITLED_NAV_EXCLUSIONS + LIST_NAV_EXCLUSIONS + CONTAINER_PROFILE_MARKERS)),
+    re.I
+)
+
+_HEADINGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5'])
+
+
+class _AnchorInfo:
+    """Classification of one <a href> computed once per page"""
+    __slots__ = ('profile_mask', 'titled_nav', 'list_nav', 'titled_profile',
+                 'container_profile', 'table_profile', 'card_profile')
+
+    def __init__(self, href):
+        href_lower = href.lower()
+
+        # Fast path: ascii href with no profile/nav signal at all
+        if href.isascii() and not _ANCHOR_SIGNAL_RE.search(href_lower):
+            self.profile_mask = 0
+            self.titled_nav = self.list_nav = False
+            self.titled_profile = self.container_profile = False
+            self.table_profile = self.card_profile = False
+            return
+
+        mask = 0
+        for i, pattern in enumerate(_PROFILE_RES):
+            if pattern.search(href):
+                mask |= 1 << i
+        self.profile_mask = mask
+        self.titled_nav = bool(_TITLED_NAV_RE.search(href_lower))
+        self.list_nav = bool(_LIST_NAV_RE.search(href_lower))
+        self.titled_profile = bool(_TITLED_PROFILE_RE.search(href_lower))
+        self.container_profile = bool(_CONTAINER_PROFILE_RE.search(href_lower))
+        self.table_profile = bool(_TABLE_PROFILE_RE.search(href_lower))
+        self.card_profile = bool(_CARD_PROFILE_RE.search(href_lower))
+
+
+class SinglePassExtractor:
+    """
+    Index a parsed page in one traversal and run the company-name strategies on it
+
+    Every tag gets its pre-order position and the position of its last descendant,
+    so "first <a href> inside this <li>" or "all <tr> of this table" become two
+    bisects on a sorted position list instead of a new walk of the subtree.
+    """
+
+    def __init__(self, html, company_indicators=None, soup=None):
+        self.soup = soup if soup is not None else BeautifulSoup(html, 'lxml')
+        self.company_indicators = company_indicators or DEFAULT_COMPANY_INDICATORS
+        self._indicator_res = [re.compile(ind, re.I) for ind in self.company_indicators]
+        self._indicator_any_re = re.compile(
+            '|'.join(f'(?:{ind})' for ind in self.company_indicators), re.I
+        )
+        self._text_cache = {}
+        self._build_index()
+
+    def _build_index(self):
+        """Single traversal: positions, subtree ends and per-kind position lists"""
+        tags = []
+        subtree_end = []
+        stack = []  # (tag, position) of currently open ancestors
+
+        self.anchors = {}          # position -> _AnchorInfo (only <a> with href)
+        self.anchor_positions = []
+        self.titled_anchor_positions = []
+        self.li_positions = []
+        self.tr_positions = []
+        self.cell_positions = []
+        self.heading_positions = []
+        self.list_positions = []
+        self.table_positions = []
+        self.card_positions = []
+        self.indicator_hits = [[] for _ in self._indicator_res]
+
+        for pos, tag in enumerate(self.soup.find_all(True)):
+            parent = tag.parent
+            while stack and stack[-1][0] is not parent:
+                subtree_end[stack.pop()[1]] = pos - 1
+            stack.append((tag, pos))
+            tags.append(tag)
+            subtree_end.append(pos)
+
+            name = tag.name
+            attrs = tag.attrs
+
+            if name == 'a':
+                href = attrs.get('href')
+                if href is not None:
+                    self.anchors[pos] = _AnchorInfo(href)
+                    self.anchor_positions.append(pos)
+                    if attrs.get('title') is not None:
+                        self.titled_anchor_positions.append(pos)
+            elif name == 'li':
+                self.li_positions.append(pos)
+            elif name == 'tr':
+                self.tr_positions.append(pos)
+            elif name == 'td' or name == 'th':
+                self.cell_positions.append(pos)
+            elif name == 'ul' or name == 'ol':
+                self.list_positions.append(pos)
+            elif name == 'table':
+                self.table_positions.append(pos)
+
+            if name in _HEADINGS:
+                self.heading_positions.append(pos)
+
+            classes = attrs.get('class')
+            if classes:
+                class_str = ' '.join(classes) if isinstance(classes, list) else classes
+                if (name == 'div' or name == 'article') and _CARD_CLASS_RE.search(class_str):
+                    self.card_positions.append(pos)
+                if self._indicator_any_re.search(class_str):
+                    for i, pattern in enumerate(self._indicator_res):
+                        if pattern.search(class_str):
+                            self.indicator_hits[i].append(pos)
+
+        while stack:
+            subtree_end[stack.pop()[1]] = len(tags) - 1
+
+        self.tags = tags
+        self.subtree_end = subtree_end
+
+    # ------------------------------------------------------------------
+    # Index helpers
+    # ------------------------------------------------------------------
+
+    def _descendants(self, positions, pos):
+        """Slice of `positions` lying strictly inside the subtree of `pos`"""
+        lo = bisect_right(positions, pos)
+        hi = bisect_right(positions, self.subtree_end[pos], lo)
+        return positions[lo:hi]
+
+    def _first_descendant(self, positions, pos):
+        """First position of `positions` inside the subtree of `pos`, or None"""
+        i = bisect_right(positions, pos)
+        if i < len(positions) and positions[i] <= self.subtree_end[pos]:
+            return positions[i]
+        return None
+
+    def _text(self, pos):
+        """get_text(strip=True), computed at most once per tag"""
+        text = self._text_cache.get(pos)
+        if text is None:
+            text = self.tags[pos].get_text(strip=True)
+            self._text_cache[pos] = text
+        return text
+
+    def _text_or_title(self, pos):
+        return self._text(pos) or self.tags[pos].get('title', '').strip()
+
+    # ------------------------------------------------------------------
+    # Strategies
+    # ------------------------------------------------------------------
+
+    def candidates(self):
+        """Raw candidate names, in the exact order of the six historical strategies"""
+        found = []
+        self._profile_links(found)
+        self._titled_links(found)
+        self._lists(found)
+        self._indicator_containers(found)
+        self._tables(found)
+        self._cards(found)
+        return found
+
+    def _profile_links(self, found):
+        # Strategy 1: bucket links per pattern, then emit pattern by pattern
+        buckets = [[] for _ in PROFILE_PATTERNS]
+        for pos in self.anchor_positions:
+            mask = self.anchors[pos].profile_mask
+            if mask:
+                for i in range(len(buckets)):
+                    if mask & (1 << i):
+                        buckets[i].append(pos)
+
+        for bucket in buckets:
+            for pos in bucket:
+                text = self._text_or_title(pos)
+                if text and 3 <= len(text) <= 150:
+                    found.append(text)
+
+    def _titled_links(self, found):
+        # Strategy 2: links with title attributes pointing to a profile
+        for pos in self.titled_anchor_positions:
+            info = self.anchors[pos]
+            if info.titled_nav or not info.titled_profile:
+                continue
+
+            title = self.tags[pos].get('title', '').strip()
+            if title and 3 <= len(title) <= 150:
+                found.append(title)
+            else:
+                text = self._text(pos)
+                if text and 3 <= len(text) <= 150:
+                    found.append(text)
+
+    def _lists(self, found):
+        # Strategy 3: lists with more than 10 <li>
+        for list_pos in self.list_positions:
+            items = self._descendants(self.li_positions, list_pos)
+            if len(items) <= 10:
+                continue
+            for item_pos in items:
+                link_pos = self._first_descendant(self.anchor_positions, item_pos)
+                if link_pos is None or self.anchors[link_pos].list_nav:
+                    continue
+                text = self._text_or_title(link_pos)
+                if text and 3 <= len(text) <= 150:
+                    found.append(text)
+
+    def _indicator_containers(self, found):
+        # Strategy 4: containers whose class matches a company indicator
+        for hits in self.indicator_hits:
+            for container_pos in hits:
+                links = self._descendants(self.anchor_positions, container_pos)
+                for link_pos in links[:5]:
+                    if not self.anchors[link_pos].container_profile:
+                        continue
+                    text = self._text(link_pos)
+                    if text and 3 <= len(text) <= 150:
+                        found.append(text)
+
+    def _tables(self, found):
+        # Strategy 5: table rows whose first cell links to a profile
+        for table_pos in self.table_positions:
+            rows = self._descendants(self.tr_positions, table_pos)
+            if len(rows) <= 10:
+                continue
+            for row_pos in rows:
+                cell_pos = self._first_descendant(self.cell_positions, row_pos)
+                if cell_pos is None:
+                    continue
+                link_pos = self._first_descendant(self.anchor_positions, cell_pos)
+                if link_pos is None or not self.anchors[link_pos].table_profile:
+                    continue
+                text = self._text_or_title(link_pos)
+                if text and 3 <= len(text) <= 150:
+                    found.append(text)
+
+    def _cards(self, found):
+        # Strategy 6: card-like containers, heading preferred over link text
+        for card_pos in self.card_positions:
+            link_pos = self._first_descendant(self.anchor_positions, card_pos)
+            if link_pos is None or not self.anchors[link_pos].card_profile:
+                continue
+
+            title_pos = self._first_descendant(self.heading_positions, card_pos)
+            if title_pos is not None:
+                text = self._text(title_pos)
+            else:
+                text = self._text_or_title(link_pos)
+
+            if text and 3 <= len(text) <= 150:
+                found.append(text)
+
+
+def extract_candidates(html, company_indicators=None):
+    """Convenience wrapper: raw candidate names from HTML in one pass"""
+    return SinglePassExtractor(html, company_indicators).candidates()
@@ -0,0 +1,19 @@
+"""
+Gunicorn settings - loaded automatically by `gunicorn app:app` (Procfile, render.yaml)
+
+Job progress is streamed over SSE (/api/jobs/<job_id>/events): each open
+page holds a connection, so workers must be threaded (gthread, default) or
+gevent (GUNICORN_WORKER_CLASS=gevent, needs the gevent package).
+Jobs and pipeline data live in the state store (state_store.py), so several
+workers (WEB_CONCURRENCY) can serve the same jobs. The job scheduler admits
+jobs through the store too: pool limits, JOB_QUEUE_LIMIT and queue order are
+shared by the workers (see job_scheduler.py); the parsing service pools are
+per worker.
+"""
+
+import os
+
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
@@ -0,0 +1,276 @@
+"""
+Persistent HTTP Cache - shared on-disk cache for every requests.Session
+Plug it with install_cache(session, stage): GET responses are stored in a
+SQLite file (zlib-compressed bodies) and reused across runs
+
+- Fresh entries (younger than the stage TTL) are served without any request
+- Stale entries are revalidated with If-None-Match / If-Modified-Since:
+  a 304 refreshes the entry, so unchanged pages cost one empty round-trip
+- Size-bounded: least recently used entries are evicted past HTTP_CACHE_MAX_MB
+- Only HTML pages (and permanent redirects) are cached: API JSON calls
+  (Clearbit, Pappers, Hunter) always go to the network
+- Responses marked Cache-Control: no-store or private are never stored
+- Streamed requests (stream=True) are cached too: the chunks are copied as the
+  caller reads them and stored once the body has been read to the end
+  (bodies over STREAM_CACHE_MAX_BYTES, or abandoned halfway, are not stored)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import config
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_STATUSES = {200, 301, 308}
+CACHEABLE_TYPES = ('text/html', 'application/xhtml', 'text/plain')
+# Streamed bodies buffered for the cache at most (the streaming caller keeps its bounded memory)
+STREAM_CACHE_MAX_BYTES = 8 * 1024 * 1024
+# Cache-Control directives forbidding a shared on-disk copy
+UNCACHEABLE_DIRECTIVES = {'no-store', 'private'}
+
+# Per-stage freshness (seconds)
+STAGE_TTLS = {
+    'listing': config.HTTP_CACHE_TTL_LISTING,
+    'domains': config.HTTP_CACHE_TTL_DOMAINS,
+    'enrichment': config.HTTP_CACHE_TTL_ENRICHMENT,
+}
+
+
+class HTTPCache:
+    """SQLite-backed response store with LRU eviction"""
+
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or config.HTTP_CACHE_PATH
+        self.max_bytes = max_bytes or config.HTTP_CACHE_MAX_MB * 1024 * 1024
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)')
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+    def get(self, url):
+        """Cached entry for `url` as a dict, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?',
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+
+        status, headers, body, etag, last_modified, stored_at = row
+        return {
+            'status': status,
+            'headers': json.loads(headers),
+            'body': zlib.decompress(body),
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': stored_at
+        }
+
+    def put(self, url, status, headers, body):
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, status, json.dumps(dict(headers)), compressed,
+                 headers.get('ETag'), headers.get('Last-Modified'), now, now, len(compressed))
+            )
+            self.stats['stored'] += 1
+            self._evict()
+
+    def count(self, stat, n=1):
+        """Increment a stats counter (adapters of several sessions share the cache)"""
+        with self._lock:
+            self.stats[stat] += n
+
+    def touch(self, url):
+        """Entry revalidated (304): it is fresh again"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+
+    def _evict(self):
+        """Drop least recently used entries until under 90% of max_bytes (lock held)"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall()
+        to_delete = []
+        for url, size in rows:
+            if total <= target:
+                break
+            to_delete.append((url,))
+            total -= size
+        self._conn.executemany('DELETE FROM responses WHERE url = ?', to_delete)
+        self.stats['evicted'] += len(to_delete)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+
+
+def _build_response(request, entry):
+    """requests.Response from a cache entry"""
+    response = Response()
+    response.status_code = entry['status']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response._content = entry['body']
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.reason = 'OK (cached)'
+    response.from_cache = True
+    return response
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter serving GETs from an HTTPCache, with conditional revalidation"""
+
+    def __init__(self, cache, ttl, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.ttl = ttl
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, stream=stream, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None:
+            if time.time() - entry['stored_at'] < self.ttl:
+                self.cache.count('hits')
+                return _build_response(request, entry)
+
+            # Stale: ask the server whether it changed
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.count('revalidated')
+            self.cache.touch(request.url)
+            return _build_response(request, entry)
+
+        self.cache.count('misses')
+        if self._cacheable(response):
+            if stream:
+                self._tee_into_cache(request.url, response)
+            else:
+                self._store(request.url, response, response.content)
+        return response
+
+    def _store(self, url, response, body):
+        try:
+            self.cache.put(url, response.status_code, response.headers, body)
+        except Exception as e:
+            logger.debug(f"HTTP cache store failed for {url}: {e}")
+
+    def _tee_into_cache(self, url, response):
+        """Copy the chunks of a streamed response as they are read, store the body once complete"""
+        iter_content = response.iter_content
+
+        def teeing_iter_content(chunk_size=1, decode_unicode=False):
+            if decode_unicode:
+                yield from iter_content(chunk_size, decode_unicode)
+                return
+            body = bytearray()
+            for chunk in iter_content(chunk_size):
+                if body is not None:
+                    body.extend(chunk)
+                    if len(body) > STREAM_CACHE_MAX_BYTES:
+                        body = None  # Too big to keep a copy
+                yield chunk
+            if body is not None:
+                self._store(url, response, bytes(body))
+
+        # .content / .text read through iter_content as well
+        response.iter_content = teeing_iter_content
+
+    @staticmethod
+    def _cacheable(response):
+        if response.status_code not in CACHEABLE_STATUSES:
+            return False
+        directives = {d.split('=', 1)[0].strip().lower()
+                      for d in response.headers.get('Cache-Control', '').split(',')}
+        if directives & UNCACHEABLE_DIRECTIVES:
+            return False
+        if response.status_code != 200:
+            return True  # Permanent redirects
+        content_type = response.headers.get('Content-Type', '').lower()
+        return content_type.startswith(CACHEABLE_TYPES)
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """Process-wide HTTPCache on config.HTTP_CACHE_PATH"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache()
+        return _shared_cache
+
+
+def install_cache(session, stage, ttl=None, pool_maxsize=10):
+    """
+    Mount the shared cache on a requests.Session
+
+    Args:
+        session: requests.Session to plug
+        stage: 'listing', 'domains' or 'enrichment' (selects the TTL)
+        ttl: Explicit freshness in seconds (overrides the stage TTL)
+        pool_maxsize: Keep-alive connections per host
+
+    With HTTP_CACHE_ENABLED=False a plain pooled HTTPAdapter is mounted instead
+    """
+    if config.HTTP_CACHE_ENABLED:
+        adapter = CachingAdapter(
+            get_shared_cache(),
+            ttl if ttl is not None else STAGE_TTLS.get(stage, config.HTTP_CACHE_TTL_LISTING),
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize
+        )
+    else:
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
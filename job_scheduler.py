@@ -0,0 +1,232 @@
+"""
+Job Scheduler - bounded execution of the web app jobs
+Each POST used to start its own thread: five scrapes meant five Chromes and
+the CPU-heavy parsing of every job fighting over the GIL
+
+- One bounded pool per kind of work: 'browser' (Chrome jobs), 'io' (domain
+  finding, enrichment: HTTP bound), 'cpu' (HTML parsing / pattern extraction)
+- Waiting jobs are ordered by (priority, submission order): lower runs first,
+  FIFO between equal priorities
+- Admission control: past JOB_QUEUE_LIMIT waiting jobs a pool rejects new
+  work (SchedulerFull) instead of queueing forever
+- cancel(job_id): a waiting job is dropped, a running one is reported so the
+  caller can stop it cooperatively (see JobTracker.request_cancel)
+
+Limits, admission and queue order hold across gunicorn workers: they are
+decided in the state store (state_store.enqueue_job / claim_jobs), each
+worker only runs the jobs it was given and polls the store every
+JOB_SCHEDULER_POLL_SECONDS for slots freed by the others. The 'browser' and
+'cpu' limits are per host (Chromes and cores are local), 'io' counts every host.
+"""
+
+import logging
+import threading
+
+import config
+from state_store import get_state_store, process_owner
+
+logger = logging.getLogger(__name__)
+
+# Pool -> concurrent jobs
+POOL_LIMITS = {
+    'browser': config.JOB_BROWSER_WORKERS,
+    'io': config.JOB_IO_WORKERS,
+    'cpu': config.JOB_CPU_WORKERS,
+}
+# Pools limited per host rather than across every host
+HOST_POOLS = ('browser', 'cpu')
+
+
+class SchedulerFull(Exception):
+    """The pool already has JOB_QUEUE_LIMIT jobs waiting"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job whose cancellation was requested"""
+
+
+class _Pool:
+    def __init__(self, name, workers, host):
+        self.name = name
+        self.workers = workers
+        self.host = host  # Limit counted on this host only (None = every host)
+        self.running = set()  # Jobs of this process
+        self.waiting = {}  # job_id -> (task, on_position), in line in the store
+        self.positions = {}  # job_id -> queue position (store order)
+
+
+class JobScheduler:
+    """
+    Bounded pools with priority queues, shared through the state store
+
+    Args:
+        limits: Optional pool -> concurrent jobs map (defaults to POOL_LIMITS)
+        queue_limit: Waiting jobs accepted per pool before SchedulerFull
+        store: State backend holding the queue (defaults to get_state_store())
+        poll_seconds: Queue check period (slots freed by other workers)
+    """
+
+    def __init__(self, limits=None, queue_limit=None, store=None, poll_seconds=None):
+        self.queue_limit = queue_limit if queue_limit is not None else config.JOB_QUEUE_LIMIT
+        self.store = store or get_state_store()
+        self.poll_seconds = poll_seconds or config.JOB_SCHEDULER_POLL_SECONDS
+        self.owner = process_owner()
+        host = self.owner.split(':', 1)[0]
+        self.pools = {name: _Pool(name, max(1, workers), host if name in HOST_POOLS else None)
+                      for name, workers in dict(POOL_LIMITS, **(limits or {})).items()}
+        self._lock = threading.Lock()
+        self._job_pools = {}  # job_id -> pool name, while waiting or running
+        self._wake = threading.Event()
+        threading.Thread(target=self._poll_loop, name='job-scheduler', daemon=True).start()
+
+    def submit(self, job_id, pool_name, task, priority=0, on_position=None):
+        """
+        Queue `task()` on a pool (the job must already be in the store, see JobTracker)
+
+        Args:
+            on_position: Optional callback(position) called with the job's place
+                in the queue (1 = next) every time it changes, 0 when it starts
+
+        Returns:
+            The queue position (0 when started right away)
+
+        Raises:
+            SchedulerFull: the pool has no free worker and a full queue
+        """
+        pool = self.pools[pool_name]
+        with self._lock:
+            if not self.store.enqueue_job(job_id, pool_name, priority, pool.workers, self.queue_limit, pool.host):
+                raise SchedulerFull(f"Too many {pool_name} jobs waiting, try again later")
+            pool.waiting[job_id] = (task, on_position)
+            self._job_pools[job_id] = pool_name
+        self._dispatch(pool)
+        return self.position(job_id)
+
+    def position(self, job_id):
+        """Place of a waiting job in its queue (1 = next), 0 when running, None when unknown"""
+        with self._lock:
+            pool_name = self._job_pools.get(job_id)
+            if pool_name is None:
+                return None
+            pool = self.pools[pool_name]
+            if job_id in pool.running:
+                return 0
+            return pool.positions.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Remove a waiting job from its queue
+
+        Returns:
+            'queued' when the job was dropped before starting, 'running' when it
+            is already running (must be stopped by the task itself), None otherwise
+        """
+        with self._lock:
+            pool_name = self._job_pools.get(job_id)
+            if pool_name is None:
+                return None
+            pool = self.pools[pool_name]
+            if job_id in pool.running:
+                return 'running'
+            pool.waiting.pop(job_id, None)
+            pool.positions.pop(job_id, None)
+            del self._job_pools[job_id]
+        # The store row leaves the queue with the job's cancelled status
+        self._wake.set()
+        return 'queued'
+
+    def stats(self):
+        """Running / waiting jobs per pool: every worker (store) and this one"""
+        stats = {}
+        for name, pool in self.pools.items():
+            running, waiting = self.store.pool_counts(name, pool.host)
+            with self._lock:
+                stats[name] = {
+                    'workers': pool.workers,
+                    'scope': 'host' if pool.host else 'all',
+                    'running': running,
+                    'waiting': waiting,
+                    'running_here': len(pool.running),
+                    'waiting_here': len(pool.waiting)
+                }
+        return stats
+
+    def _dispatch(self, pool):
+        """Start the jobs the store admits for this process, refresh the queue positions"""
+        notifications = []
+        with self._lock:
+            if not pool.waiting:
+                return
+            claimed, positions = self.store.claim_jobs(pool.name, pool.workers, self.owner, pool.host)
+            for job_id in claimed:
+                entry = pool.waiting.pop(job_id, None)
+                if entry is None:  # Cancelled here meanwhile
+                    self.store.release_job(job_id)
+                    continue
+                task, on_position = entry
+                pool.running.add(job_id)
+                if on_position:
+                    notifications.append((on_position, 0))
+                self._start(pool, job_id, task)
+            for job_id in [job_id for job_id in pool.waiting if job_id not in positions]:
+                # No longer queued in the store (cancelled through another worker,
+                # failed): the task sees it when it starts (JobTracker.start) and returns
+                task, _ = pool.waiting.pop(job_id)
+                self._start(pool, job_id, task)
+            pool.positions = positions
+            notifications.extend((pool.waiting[job_id][1], position) for job_id, position in positions.items()
+                                 if pool.waiting[job_id][1])
+        self._notify(notifications)
+
+    def _start(self, pool, job_id, task):
+        threading.Thread(
+            target=self._run, args=(pool, job_id, task), name=f"job-{job_id}", daemon=True
+        ).start()
+
+    def _poll_loop(self):
+        """Dispatch the waiting jobs again: on local events, and periodically for the other workers"""
+        while True:
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            for pool in self.pools.values():
+                try:
+                    self._dispatch(pool)
+                except Exception as e:
+                    logger.error(f"Scheduler dispatch failed ({pool.name}): {e}")
+
+    @staticmethod
+    def _notify(notifications):
+        """Position callbacks, outside the scheduler lock"""
+        for on_position, position in notifications:
+            try:
+                on_position(position)
+            except Exception as e:
+                logger.error(f"Queue position callback failed: {e}")
+
+    def _run(self, pool, job_id, task):
+        try:
+            task()
+        except Exception as e:
+            logger.error(f"Job {job_id} crashed: {e}")
+        finally:
+            with self._lock:
+                pool.running.discard(job_id)
+                self._job_pools.pop(job_id, None)
+            try:
+                self.store.release_job(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id}: pool slot not released: {e}")
+            self._wake.set()
+
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_job_scheduler():
+    """Process-wide JobScheduler"""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = JobScheduler()
+        return _shared_scheduler
@@ -16,7 +16,6 @@ import time
 import logging
 import argparse
 from colorama import Fore, init
-from tqdm import tqdm
 import pandas as pd
 
 # Import our existing modules
@@ -102,15 +101,8 @@ class LeadPipeline:
         logger.info(f"{Fore.CYAN}{'='*70}\n")
         logger.info(f"Processing {len(company_names)} companies...\n")
 
-        results = []
-
-        for i, company_name in enumerate(tqdm(company_names, desc="Finding domains")):
-            if progress_callback:
-                progress_callback(i + 1, len(company_names), f"Finding domain for: {company_name}")
-
-            result = self.domain_finder.find_domain_single(company_name)
-            results.append(result)
-            time.sleep(1)  # Be respectful
+        # Concurrent resolution (per-service rate limits), results in input order
+        results = self.domain_finder.find_domains_bulk(company_names, progress_callback=progress_callback)
 
         # Statistics
         found = sum(1 for r in results if r['domain'])
@@ -150,19 +142,7 @@ class LeadPipeline:
             logger.warning(f"{Fore.YELLOW}No companies with domains to enrich")
             return []
 
-        results = []
-
-        for i, company_data in enumerate(tqdm(companies_with_domains, desc="Enriching")):
-            if progress_callback:
-                progress_callback(i + 1, len(companies_with_domains),
-                                f"Enriching: {company_data['company_name']}")
-
-            result = self.enricher.enrich_single_company(
-                company_data['company_name'],
-                company_data['domain']
-            )
-            results.append(result)
-            time.sleep(1.5)  # Be respectful
+        results = self.enricher.enrich_companies_bulk(companies_with_domains, progress_callback=progress_callback)
 
         # Statistics
         with_email = sum(1 for r in results if r.get('company_email'))
@@ -0,0 +1,133 @@
+"""
+Company name normalization and token-based similarity
+Used by PremiumDomainFinder for cache keys, content checks and confidence scoring
+
+- normalize_name(name): one precompiled pass (legal suffixes alternation,
+  punctuation, spaces), memoized - the same names come back at every step
+- normalize_names(names): same result, vectorized over a pandas Series
+- TokenScorer: token-set similarity (Jaccard / containment), optionally
+  weighted by an IDF fitted on the corpus of names (a show's exhibitor list),
+  so generic words ("garage", "auto", "services") weigh less than distinctive ones
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+
+import pandas as pd
+
+LEGAL_SUFFIXES = ['ltd', 'limited', 'inc', 'incorporated', 'corp', 'corporation',
+                  'gmbh', 'sa', 'sas', 'sarl', 'srl', 'spa', 's.r.l.', 's.p.a.',
+                  'b.v.', 'bv', 'co', 'cie', 'france']
+
+# Longest first so "sas" wins over "sa"; punctuation-aware word boundaries ("s.r.l." included)
+# \w is Unicode-aware like the old \b: an accented letter is part of the word ("Déco" keeps its "co")
+SUFFIX_PATTERN = re.compile(
+    r'(?<!\w)(?:'
+    + '|'.join(re.escape(s) for s in sorted(LEGAL_SUFFIXES, key=len, reverse=True))
+    + r')(?!\w)'
+)
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9\s]')
+SPACES_PATTERN = re.compile(r'\s+')
+
+MIN_TOKEN_LEN = 2
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name):
+    """Lowercase, legal suffixes removed, punctuation -> spaces, single spaces"""
+    if not isinstance(name, str):
+        return ''
+    name_clean = SUFFIX_PATTERN.sub('', name.lower())
+    name_clean = NON_ALNUM_PATTERN.sub(' ', name_clean)
+    return SPACES_PATTERN.sub(' ', name_clean).strip()
+
+
+def normalize_names(names):
+    """normalize_name over many names at once (list or Series), returns a Series"""
+    series = pd.Series(names, dtype=object).fillna('').astype(str)
+    return (series.str.lower()
+            .str.replace(SUFFIX_PATTERN, '', regex=True)
+            .str.replace(NON_ALNUM_PATTERN, ' ', regex=True)
+            .str.replace(SPACES_PATTERN, ' ', regex=True)
+            .str.strip())
+
+
+def name_tokens(name):
+    """Token set of a name (normalized, 1-letter tokens dropped)"""
+    return frozenset(t for t in normalize_name(name).split() if len(t) >= MIN_TOKEN_LEN)
+
+
+class TokenScorer:
+    """
+    Token-set similarity between company names
+
+    Args:
+        idf: Optional token -> weight map (see TokenScorer.fit); unknown
+            tokens get the maximum weight, every token weighs 1 without IDF
+    """
+
+    def __init__(self, idf=None):
+        self.idf = idf or {}
+        self.default_weight = max(self.idf.values()) if self.idf else 1.0
+
+    @classmethod
+    def fit(cls, names):
+        """Scorer with IDF weights computed on a corpus of names"""
+        token_sets = [set(t for t in n.split() if len(t) >= MIN_TOKEN_LEN) for n in normalize_names(names)]
+        df = Counter(token for tokens in token_sets for token in tokens)
+        total = len(token_sets)
+        idf = {token: math.log((total + 1) / (count + 1)) + 1.0 for token, count in df.items()}
+        return cls(idf)
+
+    def weight(self, tokens):
+        return sum(self.idf.get(token, self.default_weight) for token in tokens)
+
+    def jaccard(self, a, b):
+        """Weighted |A ∩ B| / |A ∪ B| of two names (or token sets)"""
+        a, b = self._tokens(a), self._tokens(b)
+        union = self.weight(a | b)
+        return self.weight(a & b) / union if union else 0.0
+
+    def similarity(self, a, b):
+        """
+        Weighted token-set containment |A ∩ B| / min(|A|, |B|): 1.0 when one
+        name's tokens are all in the other ("Acme" vs "Acme Group")
+        """
+        a, b = self._tokens(a), self._tokens(b)
+        smallest = min(self.weight(a), self.weight(b))
+        return self.weight(a & b) / smallest if smallest else 0.0
+
+    def score_candidates(self, name, candidates):
+        """similarity(name, c) for many candidate names (list or Series), as a list"""
+        query = self._tokens(name)
+        query_weight = self.weight(query)
+        scores = []
+        for normalized in normalize_names(candidates):
+            tokens = frozenset(t for t in normalized.split() if len(t) >= MIN_TOKEN_LEN)
+            smallest = min(query_weight, self.weight(tokens))
+            scores.append(self.weight(query & tokens) / smallest if smallest else 0.0)
+        return scores
+
+    @staticmethod
+    def _tokens(value):
+        return value if isinstance(value, frozenset) else name_tokens(value)
+
+
+if __name__ == '__main__':
+    # Regression check: same result as the original per-suffix \b loop, accented names included
+    def legacy_normalize(name):
+        name_lower = name.lower()
+        for suffix in LEGAL_SUFFIXES:
+            if '.' not in suffix:  # The old unescaped dotted patterns never matched
+                name_lower = re.sub(rf'\b{suffix}\b', '', name_lower)
+        return SPACES_PATTERN.sub(' ', NON_ALNUM_PATTERN.sub(' ', name_lower)).strip()
+
+    names = ['Déco Pro', 'Éco Garage', 'Maïsa', 'Corpé', 'Garage Müller GmbH', 'Société Générale SA',
+             'Auto Distri SAS', 'Peugeot France', 'Acme Co.', 'Ïnc Motors', 'Sarl Écurie']
+    expected = [legacy_normalize(n) for n in names]
+    assert [normalize_name(n) for n in names] == expected, list(zip(names, map(normalize_name, names)))
+    assert list(normalize_names(names)) == expected
+    assert normalize_name('Fratelli Rossi S.p.A.') == 'fratelli rossi'
+    print(f"OK: {len(names)} names normalized like the legacy normalizer")
@@ -0,0 +1,167 @@
+"""
+Company name normalizer - shared cleaning for every scraper
+Blacklist, prefixes and regexes are built once at import; normalize_batch()
+turns raw strings into cleaned, deduplicated company names in one O(n) pass
+"""
+
+import re
+
+
+# STRICT BLACKLIST - Everything that is NOT a company name
+BLACKLIST = frozenset({
+    # Navigation
+    'home', 'contact', 'about', 'menu', 'search', 'login', 'accueil',
+    'connexion', 'recherche', 'à propos', 'mentions légales', 'cookies',
+    'politique', 'confidentialité', 'conditions', 'cgv', 'cgu',
+    'afficher', 'show', 'hide', 'masquer', 'tout', 'all',
+
+    # Actions
+    'voir', 'plus', 'more', 'details', 'détails', 'lire la suite', 'read more',
+    'en savoir plus', 'découvrir', 'discover', 'voir tout', 'see all',
+
+    # Pagination
+    'page', 'suivant', 'précédent', 'next', 'previous', 'retour', 'back',
+    'first', 'last', 'premier', 'dernier',
+
+    # Navigation française (batiweb style)
+    'toutes les actualités', 'communiqués', 'dossiers spéciaux',
+    'vie des sociétés', 'immobilier', 'architecture', 'patrimoine',
+    'urbanisme', 'construction', 'énergie', 'conjoncture',
+    'développement durable', 'marchés publics', 'événements et salons',
+    'mon profil', 'déconnexion', 'mon compte', 'mes newsletters',
+    'mes indices-index', 'mes articles', 'mes produits', 'mes communiqués',
+    'mes vidéos', 'budget', 'maprimerenov', 'rénovation énergétique',
+    'fraudes', 'zan',
+
+    # Sections génériques
+    'actualités', 'news', 'articles', 'produits', 'products',
+    'services', 'solutions', 'about us', 'qui sommes-nous',
+    'notre histoire', 'nos valeurs', 'équipe', 'team',
+    'carrières', 'careers', 'emploi', 'jobs',
+    'presse', 'press', 'médias', 'media',
+    'blog', 'newsletter', 'inscription', 'subscribe',
+    'télécharger', 'download', 'documentation', 'ressources',
+    'faq', 'aide', 'help', 'support', 'tutoriels',
+    'légal', 'legal', 'privacy', 'terms',
+
+    # Actions génériques
+    'cliquez ici', 'click here', 'en savoir plus', 'learn more',
+    'contactez-nous', 'contact us', 'demander un devis', 'get a quote',
+    'inscription gratuite', 'free trial', 'essai gratuit',
+
+    # Catégories
+    'catégories', 'categories', 'rubriques', 'sections',
+    'tous les fabricants', 'all manufacturers', 'annuaire',
+    'directory', 'liste', 'list',
+
+    # Mots isolés trop génériques
+    'nouveau', 'new', 'hot', 'top', 'best', 'meilleur',
+    'gratuit', 'free', 'offre', 'offer', 'promo', 'promotion'
+})
+
+# Prefixes to remove (checked in this order, on the lowercased name)
+PREFIXES_TO_REMOVE = ('détails :', 'details:', 'voir:', 'see:')
+
+# Leading/trailing punctuation stripped from every name
+STRIP_CHARS = '.-,;:|[](){}'
+
+MIN_LENGTH = 3
+MAX_LENGTH = 150
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_URL_RE = re.compile(r'http|www\.')
+
+
+class CompanyNameNormalizer:
+    """
+    Cleans and deduplicates candidate company names
+
+    Stateless apart from its precompiled configuration: one module-level
+    instance (company_name_normalizer) is shared by UniversalScraper and
+    SmartPatternDetector.
+    """
+
+    def __init__(self, blacklist=BLACKLIST, prefixes=PREFIXES_TO_REMOVE,
+                 min_length=MIN_LENGTH, max_length=MAX_LENGTH):
+        self.blacklist = frozenset(blacklist)
+        self.prefixes = tuple(prefixes)
+        self.min_length = min_length
+        self.max_length = max_length
+
+    def clean(self, name):
+        """
+        Clean a single raw name
+
+        Returns the cleaned name, or None if it is not a company name
+        (navigation label, number, URL, too short/long...)
+        """
+        company = _WHITESPACE_RE.sub(' ', name).strip()
+
+        # Remove common prefixes
+        if company.lower().startswith(self.prefixes):
+            for prefix in self.prefixes:
+                if company.lower().startswith(prefix):
+                    company = company[len(prefix):].strip()
+
+        # Remove leading/trailing punctuation
+        company = company.strip(STRIP_CHARS)
+
+        if not company:
+            return None
+
+        length = len(company)
+        if length < self.min_length or length > self.max_length:
+            return None
+
+        company_lower = company.lower()
+
+        # Skip blacklisted terms
+        if company_lower in self.blacklist:
+            return None
+
+        # Skip numbers and mostly-numbers (like "Page 2")
+        if company.isdigit():
+            return None
+        if sum(map(str.isdigit, company)) / length > 0.5:
+            return None
+
+        # Skip URLs
+        if _URL_RE.search(company_lower):
+            return None
+
+        return company
+
+    def key(self, name):
+        """Deduplication key (case insensitive)"""
+        return name.lower()
+
+    def normalize_batch(self, raw_names):
+        """
+        Clean and deduplicate a batch of raw names, keeping first-seen order
+
+        Identical raw strings are only cleaned once, so repeated labels on
+        large exhibitor lists cost a dict lookup.
+        """
+        cleaned = []
+        seen = set()
+        memo = {}
+
+        for raw in raw_names:
+            if raw in memo:
+                company = memo[raw]
+            else:
+                company = memo[raw] = self.clean(raw)
+
+            if company is None:
+                continue
+
+            company_lower = company.lower()
+            if company_lower not in seen:
+                cleaned.append(company)
+                seen.add(company_lower)
+
+        return cleaned
+
+
+# Shared instance, built once at import
+company_name_normalizer = CompanyNameNormalizer()
@@ -0,0 +1,188 @@
+"""
+Page Readiness - event-driven waits for Selenium pages
+Replaces fixed time.sleep() calls: returns as soon as the page is actually ready
+
+Signals (read from the page on each poll):
+- document.readyState == 'complete'
+- DOM mutation quiescence (MutationObserver on childList/characterData)
+- network idle (no resource finished loading during the quiet period)
+- element count stabilization (same number of elements on consecutive polls)
+"""
+
+import logging
+import time
+from urllib.parse import urlparse
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+# Per-site overrides (host -> settings), for slow or very dynamic sites
+SITE_PROFILES = {
+    'paris.equipauto.com': {'timeout': 30, 'quiet_ms': 800},
+    'new-liste-exposants.hubj2c.com': {'timeout': 30, 'quiet_ms': 800},
+}
+
+DEFAULT_PROFILE = {
+    'timeout': config.READY_TIMEOUT,
+    'quiet_ms': config.READY_QUIET_MS,
+    'stable_polls': 2,
+    'require_network_idle': True,
+}
+
+# Installs the observers once per document and returns a snapshot of the signals
+# Resource timings are tracked by a PerformanceObserver: the performance buffer
+# stops at 250 entries by default, so long-running pages stopped reporting network
+# activity once it was full
+_SNAPSHOT_JS = """
+var w = window;
+var st = w.__scraperReadiness;
+var latest = function (entries) {
+    for (var i = 0; i < entries.length; i++) {
+        if (entries[i].responseEnd > st.lastNetwork) { st.lastNetwork = entries[i].responseEnd; }
+    }
+};
+if (!st || st.doc !== document) {
+    st = w.__scraperReadiness = {doc: document, lastMutation: performance.now(), lastNetwork: 0, observed: false};
+    try {
+        new MutationObserver(function () { st.lastMutation = performance.now(); })
+            .observe(document.documentElement || document,
+                     {childList: true, subtree: true, characterData: true});
+    } catch (e) {}
+    try { performance.setResourceTimingBufferSize(10000); } catch (e) {}
+    // Observer callbacks are asynchronous: seed with what is already buffered
+    if (performance.getEntriesByType) { latest(performance.getEntriesByType('resource')); }
+    try {
+        new PerformanceObserver(function (list) { latest(list.getEntries()); })
+            .observe({type: 'resource', buffered: true});
+        st.observed = true;
+    } catch (e) {}
+}
+if (arguments[0]) { st.lastMutation = performance.now(); }
+var now = performance.now();
+if (!st.observed && performance.getEntriesByType) {
+    latest(performance.getEntriesByType('resource'));
+}
+var lastNetwork = st.lastNetwork;
+return {
+    readyState: document.readyState,
+    mutationQuietMs: now - st.lastMutation,
+    networkQuietMs: now - lastNetwork,
+    elements: document.getElementsByTagName('*').length
+};
+"""
+
+
+def profile_for(url=None, **overrides):
+    """Readiness settings for `url`: defaults < site profile < explicit overrides"""
+    profile = dict(DEFAULT_PROFILE)
+    if url:
+        host = urlparse(url).netloc.lower()
+        profile.update(SITE_PROFILES.get(host, {}))
+    profile.update({k: v for k, v in overrides.items() if v is not None})
+    return profile
+
+
+def page_snapshot(driver, reset=False):
+    """
+    Current readiness signals of the page (or frame) the driver is on
+    reset=True restarts the mutation quiet period (call right after an interaction)
+    """
+    return driver.execute_script(_SNAPSHOT_JS, reset)
+
+
+def wait_until_ready(driver, url=None, label=None, poll_interval=0.1, after_action=False,
+                     verbose=True, **overrides):
+    """
+    Wait until the page is ready, or until the timeout
+
+    Args:
+        driver: Selenium WebDriver (works in the current frame)
+        url: Used to pick the site profile (defaults to driver.current_url)
+        label: Name of the step, for the timing log
+        after_action: Measure DOM quiet from now (after a click/scroll), not from the last mutation
+        verbose: Log the timing at INFO level (DEBUG otherwise)
+        overrides: timeout, quiet_ms, stable_polls, require_network_idle
+
+    Returns:
+        Timing report: {'label', 'url', 'ready', 'elapsed', 'elements', 'signal'}
+    """
+    if url is None:
+        try:
+            url = driver.current_url
+        except Exception:
+            url = None
+
+    profile = profile_for(url, **overrides)
+    start = time.monotonic()
+    deadline = start + profile['timeout']
+    stable = 0
+    last_count = None
+    snapshot = {}
+    reset = after_action
+
+    while True:
+        try:
+            snapshot = page_snapshot(driver, reset) or {}
+            reset = False
+        except Exception as e:
+            logger.debug(f"Readiness snapshot failed: {e}")
+            snapshot = {}
+
+        count = snapshot.get('elements')
+        stable = stable + 1 if count is not None and count == last_count else 0
+        last_count = count
+
+        ready = (
+            snapshot.get('readyState') == 'complete'
+            and snapshot.get('mutationQuietMs', 0) >= profile['quiet_ms']
+            and (not profile['require_network_idle']
+                 or snapshot.get('networkQuietMs', 0) >= profile['quiet_ms'])
+            and stable >= profile['stable_polls']
+        )
+
+        if ready or time.monotonic() >= deadline:
+            break
+        time.sleep(poll_interval)
+
+    report = {
+        'label': label or 'page',
+        'url': url,
+        'ready': ready,
+        'elapsed': round(time.monotonic() - start, 3),
+        'elements': last_count,
+        'signal': 'ready' if ready else 'timeout'
+    }
+    log = logger.info if verbose else logger.debug
+    log(f"⏱  {report['label']}: {report['signal']} in {report['elapsed']:.2f}s "
+                f"({report['elements']} elements) {url or ''}")
+    return report
+
+
+def wait_for_dom_quiet(driver, quiet_ms=300, timeout=3, label='dom', verbose=False):
+    """Short wait after an interaction (click, scroll): DOM quiet, network ignored"""
+    return wait_until_ready(driver, label=label, timeout=timeout, quiet_ms=quiet_ms, after_action=True,
+                            stable_polls=1, require_network_idle=False, verbose=verbose)
+
+
+def scroll_until_stable(driver, max_steps=20, step_timeout=3, quiet_ms=300):
+    """
+    Scroll to the bottom until the page stops growing (lazy loading / infinite scroll)
+
+    Each step waits for the height to change or the DOM to settle instead of a
+    fixed pause. Returns the number of scroll steps performed.
+    """
+    last_height = driver.execute_script("return document.body.scrollHeight")
+    steps = 0
+
+    for steps in range(1, max_steps + 1):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        wait_for_dom_quiet(driver, quiet_ms=quiet_ms, timeout=step_timeout, label=f'scroll {steps}')
+
+        new_height = driver.execute_script("return document.body.scrollHeight")
+        if new_height == last_height:
+            break
+        last_height = new_height
+
+    return steps
@@ -0,0 +1,178 @@
+"""
+Parsing Service - HTML parsing and extraction in worker processes
+Parsing runs in the Flask process threads otherwise: the GIL serializes it
+and the web UI stalls while a multi-MB directory page parses
+
+- run(func, html, *args): func(html, *args) in a ProcessPoolExecutor worker,
+  the result comes back pickled (plain data: lists, dicts, ContactPage...)
+- Pages under PARSE_OFFLOAD_MIN_BYTES are parsed in-process: below that the
+  pickling round trip costs more than the parse. The size is in bytes for str
+  and bytes pages alike (str measured as UTF-8)
+- Workers are warmed (lxml, bs4 and the extraction modules imported, a first
+  document parsed) by the pool initializer; warm() starts them all up front
+- Per-task timeout (PARSE_TIMEOUT): a stuck worker can't be interrupted, the
+  pool is torn down and recreated, the caller gets ParseTimeout
+- A broken pool (worker killed, e.g. out of memory) is recreated and the task
+  runs in-process
+
+`func` must be a module-level function (or class) so workers can import it
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by every worker before its first task
+WARM_MODULES = ('lxml.html', 'bs4', 'pattern_engine', 'contact_page', 'extraction_engine')
+
+
+class ParseTimeout(TimeoutError):
+    """A parsing task ran longer than PARSE_TIMEOUT"""
+
+
+def _warm_worker():
+    """Pool initializer: imports and a first parse, so the first real task pays neither"""
+    import importlib
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+    from pattern_engine import parse_html
+    parse_html('<html><body><p>warm</p></body></html>')
+
+
+def _ping():
+    return os.getpid()
+
+
+def _smaller_than(html, limit):
+    """Encoded size of the page under `limit` bytes (str counted as UTF-8, encoded only if needed)"""
+    if isinstance(html, str):
+        if len(html) >= limit:
+            return False  # At least one byte per character
+        if len(html) * 4 < limit:
+            return True  # At most four bytes per character
+        return len(html.encode('utf-8', 'surrogatepass')) < limit
+    return len(html) < limit
+
+
+class ParsingService:
+    """
+    Process pool for parsing tasks, with in-process fallback
+
+    Args:
+        workers: Worker processes (0 = everything in-process)
+        min_bytes: Smallest page sent to the pool
+        timeout: Seconds per task before ParseTimeout
+    """
+
+    def __init__(self, workers=None, min_bytes=None, timeout=None):
+        self.workers = workers if workers is not None else config.PARSE_WORKERS
+        self.min_bytes = min_bytes if min_bytes is not None else config.PARSE_OFFLOAD_MIN_BYTES
+        self.timeout = timeout if timeout is not None else config.PARSE_TIMEOUT
+        self._executor = None
+        self._lock = threading.Lock()
+        self.stats = {'offloaded': 0, 'in_process': 0, 'timeouts': 0, 'restarts': 0}
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(config.PARSE_START_METHOD),
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def _reset(self, executor):
+        """Drop a broken or stuck pool (its running workers are terminated)"""
+        with self._lock:
+            if self._executor is not executor:
+                return  # Already replaced by another thread
+            self._executor = None
+            self.stats['restarts'] += 1  # Lock held
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _count(self, stat):
+        """Increment a stats counter (run() is called from many threads)"""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def warm(self):
+        """Start every worker now (initializer included) instead of on the first pages"""
+        if self.workers <= 0:
+            return 0
+        executor = self._pool()
+        pids = {future.result() for future in [executor.submit(_ping) for _ in range(self.workers)]}
+        logger.info(f"Parsing service: {len(pids)} worker processes ready")
+        return len(pids)
+
+    def run(self, func, html, *args, timeout=None):
+        """
+        func(html, *args), in a worker process when the page is big enough
+
+        Raises:
+            ParseTimeout: the worker took longer than the timeout
+        """
+        if self.workers <= 0 or not html or _smaller_than(html, self.min_bytes):
+            self._count('in_process')
+            return func(html, *args)
+
+        executor = self._pool()
+        try:
+            future = executor.submit(func, html, *args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            # Pool broken or shut down by a concurrent reset
+            logger.warning(f"Parsing pool unavailable ({e}), parsing in-process")
+            self._reset(executor)
+            self._count('in_process')
+            return func(html, *args)
+
+        try:
+            result = future.result(timeout=timeout or self.timeout)
+        except FutureTimeout:
+            self._count('timeouts')
+            logger.error(f"Parsing task {getattr(func, '__name__', func)} timed out, restarting the pool")
+            self._reset(executor)
+            raise ParseTimeout(f"Parsing took more than {timeout or self.timeout}s")
+        except BrokenProcessPool as e:
+            logger.warning(f"Parsing worker died ({e}), parsing in-process")
+            self._reset(executor)
+            self._count('in_process')
+            return func(html, *args)
+
+        self._count('offloaded')
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+
+def get_parsing_service():
+    """Process-wide ParsingService"""
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = ParsingService()
+        return _shared_service
+
+
+def parse_in_pool(func, html, *args):
+    """Shortcut: get_parsing_service().run(func, html, *args)"""
+    return get_parsing_service().run(func, html, *args)
@@ -0,0 +1,529 @@
+"""
+Pattern Engine - linear-time repeating-pattern detection (lxml)
+Same ranking as SmartPatternDetector's html.parser implementation, without
+the quadratic get_text() / parents walks on nested layouts
+
+One traversal of the lxml tree computes, for every element:
+- depth (parent depth + 1, top-down)
+- stripped text length (bottom-up: children are summed into their parent)
+- signature (tag + first two sorted classes)
+Items are only extracted for the elements that end up in a pattern
+
+StreamingPatternEngine gives the same result from an incremental parse with
+bounded memory, for multi-MB single-page directories
+
+PatternSummary keeps the results of either engine without the lxml tree
+(picklable: sent back by the parsing service workers)
+"""
+
+import heapq
+import re
+from collections import defaultdict
+
+import lxml.html
+from lxml import etree
+
+CONTAINER_TAGS = ('div', 'article', 'li', 'tr', 'section')
+MIN_REPEAT = 3  # Un pattern doit se répéter au moins 3 fois
+MAX_ITEMS = 50  # Items extraits par pattern (aperçu et scraping)
+MIN_TEXT, MAX_TEXT = 5, 2000
+MAX_DEPTH = 15
+FIELD_TAGS = frozenset(['span', 'div', 'p', 'h1', 'h2', 'h3', 'h4', 'strong'])
+FIELD_LIMIT = 20
+
+# Text ignored by BeautifulSoup.get_text() (scripts, styles, templates)
+SILENT_TAGS = frozenset(['script', 'style', 'template'])
+
+# Liens de pagination: texte "suivant" ou numéro de page dans l'URL
+PAGINATION_WORDS = ('suivant', 'next', '>', '»', 'suiv')
+PAGINATION_HREF_PATTERNS = [re.compile(pattern) for pattern in (r'page[=/-](\d+)', r'p(\d+)', r'/(\d+)/?$')]
+MAX_LINKS = 500  # Liens gardés par StreamingPatternEngine, par type (texte / URL)
+
+
+def pagination_link_kind(href, text):
+    """'text' (lien "suivant"), 'href' (numéro de page dans l'URL) ou None"""
+    if any(word in text.lower() for word in PAGINATION_WORDS):
+        return 'text'
+    if any(pattern.search(href) for pattern in PAGINATION_HREF_PATTERNS):
+        return 'href'
+    return None
+
+
+def parse_html(html):
+    """lxml document for an HTML string (None if there is nothing to parse)"""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Unicode string with an XML encoding declaration
+        return lxml.html.document_fromstring(
+            html.encode('utf-8'), parser=lxml.html.HTMLParser(encoding='utf-8')
+        )
+    except etree.ParserError:
+        return None
+
+
+def _strip_len(value):
+    return len(value.strip()) if value else 0
+
+
+def _is_tag(element):
+    """Real element (comments and processing instructions have a non-str tag)"""
+    return isinstance(element.tag, str)
+
+
+def element_signature(element):
+    """tag + 2 premières classes triées (même format que get_element_signature)"""
+    classes = sorted((element.get('class') or '').split())
+    signature = element.tag
+    if classes:
+        signature += '.' + ' '.join(classes[:2])
+    return signature
+
+
+def element_text(element):
+    """Equivalent of BeautifulSoup get_text(strip=True)"""
+    parts = []
+
+    def walk(node):
+        if node.tag in SILENT_TAGS:
+            return
+        if node.text:
+            stripped = node.text.strip()
+            if stripped:
+                parts.append(stripped)
+        for child in node:
+            if _is_tag(child):
+                walk(child)
+            if child.tail:
+                stripped = child.tail.strip()
+                if stripped:
+                    parts.append(stripped)
+
+    walk(element)
+    return ''.join(parts)
+
+
+def element_data(element):
+    """
+    Données d'un élément (texte, lien, image, data-*, sous-champs)
+    Same fields as SmartPatternDetector.extract_element_data
+    """
+    data = {}
+
+    # Texte principal
+    text = element_text(element)
+    if text and len(text) < 500:
+        data['text'] = text
+
+    # Lien (premier <a> descendant)
+    link = next(element.iterdescendants('a'), None)
+    if link is not None and link.get('href'):
+        data['link'] = link.get('href')
+        link_text = element_text(link)
+        if link_text and link_text != text:
+            data['link_text'] = link_text
+
+    # Image
+    img = next(element.iterdescendants('img'), None)
+    if img is not None:
+        if img.get('src'):
+            data['image'] = img.get('src')
+        if img.get('alt'):
+            data['image_alt'] = img.get('alt')
+
+    # Attributs data-*
+    for attr, value in element.attrib.items():
+        if attr.startswith('data-'):
+            data[attr] = value
+
+    # Sous-éléments avec des classes spécifiques
+    found = 0
+    for child in element.iterdescendants():
+        if child.tag not in FIELD_TAGS:
+            continue
+        found += 1
+        if found > FIELD_LIMIT:
+            break
+
+        child_text = element_text(child)
+        if child_text and child_text != text and len(child_text) > 2:
+            child_classes = (child.get('class') or '').split()
+            key = f"field_{child_classes[0]}" if child_classes else f"field_{child.tag}"
+            if key not in data:
+                data[key] = child_text
+
+    return data
+
+
+def _rank(counts):
+    """Signatures with at least MIN_REPEAT occurrences, most frequent first (stable)"""
+    repeated = [sig for sig, count in counts.items() if count >= MIN_REPEAT]
+    return sorted(repeated, key=counts.get, reverse=True)
+
+
+class PatternEngine:
+    """
+    Repeating-pattern index of one page, built in a single traversal
+
+    Args:
+        html: Page HTML (or pass an already parsed lxml `tree`)
+    """
+
+    def __init__(self, html=None, tree=None):
+        self.tree = tree if tree is not None else parse_html(html)
+        self.elements_by_signature = self._index()
+        self._patterns = None
+
+    def _index(self):
+        """{signature: [elements]} of the candidate containers, in document order"""
+        index = defaultdict(list)
+        if self.tree is None:
+            return index
+
+        # Pre-order list: parents before children (depth), reversed = children first (text)
+        # Depth counts the document node, like len(list(element.parents)) in BeautifulSoup
+        elements = [self.tree]
+        depth = {self.tree: 1}
+        for element in self.tree.iterdescendants():
+            elements.append(element)
+            depth[element] = depth[element.getparent()] + 1
+
+        text_len = {}
+        for element in reversed(elements):
+            if not _is_tag(element) or element.tag in SILENT_TAGS:
+                total = 0
+            else:
+                total = text_len.get(element, 0) + _strip_len(element.text)
+            text_len[element] = total
+            parent = element.getparent()
+            if parent is not None:
+                text_len[parent] = text_len.get(parent, 0) + total + _strip_len(element.tail)
+
+        for element in elements:
+            if element.tag not in CONTAINER_TAGS:
+                continue
+            if not MIN_TEXT <= text_len[element] <= MAX_TEXT:
+                continue
+            if depth[element] > MAX_DEPTH:
+                continue
+            index[element_signature(element)].append(element)
+
+        return index
+
+    @staticmethod
+    def build_pattern(signature, elements):
+        """Pattern (avec données extraites) pour une signature, None si pas assez répété"""
+        if len(elements) < MIN_REPEAT:
+            return None
+
+        items = []
+        for element in elements[:MAX_ITEMS]:
+            data = element_data(element)
+            if data:
+                items.append(data)
+
+        if not items:
+            return None
+
+        return {
+            'signature': signature,
+            'count': len(elements),
+            'items': items,
+            'sample_count': len(items)
+        }
+
+    def patterns(self):
+        """Patterns répétés, triés par nombre d'occurrences (calculés une fois)"""
+        if self._patterns is None:
+            patterns = []
+            for signature, elements in self.elements_by_signature.items():
+                pattern = self.build_pattern(signature, elements)
+                if pattern:
+                    patterns.append(pattern)
+            patterns.sort(key=lambda x: x['count'], reverse=True)
+            self._patterns = patterns
+        return self._patterns
+
+    def ranked_signatures(self):
+        """Signatures répétées, par nombre d'occurrences (sans extraire les items)"""
+        counts = {sig: len(elements) for sig, elements in self.elements_by_signature.items()}
+        return _rank(counts)
+
+    def pattern_for(self, signature):
+        """Pattern d'une seule signature (sans extraire les autres)"""
+        if self._patterns is not None:
+            return next((p for p in self._patterns if p['signature'] == signature), None)
+        return self.build_pattern(signature, self.elements_by_signature.get(signature, []))
+
+    def links(self):
+        """(href, texte) de chaque lien <a href> de la page"""
+        if self.tree is None:
+            return []
+        return [(a.get('href'), element_text(a)) for a in self.tree.iter('a') if a.get('href') is not None]
+
+
+class PatternSummary:
+    """
+    Results of a pattern engine (patterns, ranking, links) without the tree
+    Same interface as PatternEngine
+
+    Args:
+        engine: PatternEngine or StreamingPatternEngine
+        only_signature: Only keep the pattern of this signature
+    """
+
+    def __init__(self, engine, only_signature=None):
+        self.only_signature = only_signature
+        if only_signature:
+            pattern = engine.pattern_for(only_signature)
+            self._patterns = [pattern] if pattern else []
+        else:
+            self._patterns = engine.patterns()
+        self._ranked = engine.ranked_signatures()
+        self._links = engine.links()
+
+    def patterns(self):
+        return self._patterns
+
+    def ranked_signatures(self):
+        return self._ranked
+
+    def pattern_for(self, signature):
+        return next((p for p in self._patterns if p['signature'] == signature), None)
+
+    def links(self):
+        return self._links
+
+
+class StreamingPatternEngine:
+    """
+    Incremental pattern detection for very large pages (bounded memory)
+
+    Feeds the HTML in chunks to lxml's pull parser and processes each element
+    when it closes: per-signature counters, the first MAX_ITEMS item samples
+    (the preview semantics of PatternEngine) and the pagination links. Subtrees are
+    released as soon as no open ancestor can still become a candidate, so the
+    tree never holds more than the open path plus the current candidates.
+
+    Same patterns and ranking as PatternEngine.
+
+    Args:
+        only_signature: Only sample this signature (pages 2+ of a supervised scrape)
+        encoding: Encoding of byte chunks (None = detected by the parser)
+    """
+
+    def __init__(self, only_signature=None, encoding=None):
+        self.only_signature = only_signature
+        self._parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+        self._pending = None
+        self._stack = []  # [element, depth, running text length, may be a candidate]
+        self._live = 0  # Open elements that may still be candidates
+        self._silent = 0  # Open script/style/template elements
+        self._text_len = {}  # Closed elements whose parent is still open
+        self._seq = 0
+        self._start_seq = {}
+        self._counts = defaultdict(int)
+        self._first_seq = {}
+        self._samples = defaultdict(list)  # signature -> heap of (-seq, data)
+        self._links = []
+        self._kept_links = defaultdict(int)  # kind -> links kept
+        self._patterns = None
+        self.released = 0
+        self.bytes_read = 0
+
+    # ------------------------------------------------------------------
+    # Feeding
+    # ------------------------------------------------------------------
+
+    def feed(self, chunk):
+        # libxml2's push parser mishandles a </script> or </style> split across
+        # two feeds: only pass data up to the last '<', the rest waits for the next chunk
+        data = self._pending + chunk if self._pending else chunk
+        cut = data.rfind('<' if isinstance(data, str) else b'<')
+        if cut == 0:
+            self._pending = data
+            return
+        if cut < 0:
+            cut = len(data)
+        self._pending = data[cut:]
+        self._parser.feed(data[:cut])
+        self._process_events()
+
+    def close(self):
+        if self._pending:
+            self._parser.feed(self._pending)
+            self._pending = None
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass  # Empty document
+        self._process_events()
+        return self
+
+    @classmethod
+    def from_html(cls, html, chunk_size=65536, **kwargs):
+        """Run the engine over an HTML string, fed in chunks"""
+        engine = cls(**kwargs)
+        for i in range(0, len(html or ''), chunk_size):
+            engine.feed(html[i:i + chunk_size])
+        return engine.close()
+
+    @classmethod
+    def from_response(cls, response, chunk_size=65536, chunks=None, **kwargs):
+        """
+        Run the engine over a streamed requests response (stream=True)
+
+        Args:
+            chunks: Byte chunks to feed instead of response.iter_content(chunk_size)
+                (lets the caller replay the chunks it already read)
+        """
+        # Only an explicit HTTP charset overrides <meta charset> (requests
+        # falls back to ISO-8859-1 for any text/html)
+        explicit = 'charset' in response.headers.get('Content-Type', '').lower()
+        engine = cls(encoding=response.encoding if explicit else None, **kwargs)
+        for chunk in (chunks if chunks is not None else response.iter_content(chunk_size)):
+            engine.bytes_read += len(chunk)
+            engine.feed(chunk)
+        return engine.close()
+
+    def _process_events(self):
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                self._start(element)
+            else:
+                self._end(element)
+
+    def _start(self, element):
+        depth = len(self._stack) + 1  # Counts the document node, like PatternEngine
+        self._start_seq[element] = self._seq
+        self._seq += 1
+        may_be_candidate = element.tag in CONTAINER_TAGS and depth <= MAX_DEPTH
+        self._live += may_be_candidate
+        self._silent += element.tag in SILENT_TAGS
+        self._stack.append([element, depth, 0, may_be_candidate])
+
+    def _end(self, element):
+        _, depth, running, may_be_candidate = self._stack.pop()
+        self._live -= may_be_candidate
+        seq = self._start_seq.pop(element)
+
+        # Text length: own text (text + children tails) + closed children
+        own = total = 0
+        if element.tag in SILENT_TAGS:
+            self._silent -= 1
+            for child in element:
+                self._text_len.pop(child, None)
+        else:
+            own = _strip_len(element.text)
+            for child in element:
+                own += _strip_len(child.tail)
+                total += self._text_len.pop(child, 0)
+            total += own
+
+        if element.tag == 'a' and element.get('href') is not None:
+            self._keep_link(seq, element.get('href'), element_text(element))
+
+        if may_be_candidate and MIN_TEXT <= total <= MAX_TEXT:
+            self._count(element, seq)
+
+        if not self._stack:
+            return
+        self._text_len[element] = total
+
+        # Running length of open containers (lower bound of their final length):
+        # past MAX_TEXT they can no longer be candidates
+        if self._silent:
+            own = 0  # Text inside a template doesn't count for its ancestors
+        for entry in self._stack:
+            if entry[3]:
+                entry[2] += own
+                if entry[2] > MAX_TEXT:
+                    entry[3] = False
+                    self._live -= 1
+
+        if not self._live:
+            self._release(element)
+
+    def _count(self, element, seq):
+        signature = element_signature(element)
+        self._counts[signature] += 1
+        if signature not in self._first_seq or seq < self._first_seq[signature]:
+            self._first_seq[signature] = seq
+
+        if self.only_signature is not None and signature != self.only_signature:
+            return
+
+        # Keep the MAX_ITEMS first elements in document order (max-heap on seq)
+        samples = self._samples[signature]
+        if len(samples) < MAX_ITEMS:
+            heapq.heappush(samples, (-seq, element_data(element)))
+        elif seq < -samples[0][0]:
+            heapq.heapreplace(samples, (-seq, element_data(element)))
+
+    def _release(self, element):
+        """Drop a processed subtree and its already processed previous siblings"""
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            previous = element.getprevious()
+            self._text_len.pop(previous, None)
+            del parent[0]
+            self.released += 1
+
+    # ------------------------------------------------------------------
+    # Results (same interface as PatternEngine)
+    # ------------------------------------------------------------------
+
+    def patterns(self):
+        """Patterns répétés, triés par nombre d'occurrences"""
+        if self._patterns is None:
+            patterns = []
+            for signature in sorted(self._counts, key=self._first_seq.get):
+                pattern = self._build_pattern(signature)
+                if pattern:
+                    patterns.append(pattern)
+            patterns.sort(key=lambda x: x['count'], reverse=True)
+            self._patterns = patterns
+        return self._patterns
+
+    def _build_pattern(self, signature):
+        count = self._counts.get(signature, 0)
+        if count < MIN_REPEAT:
+            return None
+
+        items = [data for _, data in sorted(self._samples.get(signature, []), reverse=True) if data]
+        if not items:
+            return None
+
+        return {
+            'signature': signature,
+            'count': count,
+            'items': items,
+            'sample_count': len(items)
+        }
+
+    def ranked_signatures(self):
+        """Signatures répétées, par nombre d'occurrences (sans extraire les items)"""
+        return _rank({sig: self._counts[sig] for sig in sorted(self._counts, key=self._first_seq.get)})
+
+    def pattern_for(self, signature):
+        """Pattern d'une seule signature"""
+        if self._patterns is not None:
+            return next((p for p in self._patterns if p['signature'] == signature), None)
+        return self._build_pattern(signature)
+
+    def _keep_link(self, seq, href, text):
+        # Separate budgets: item links matching the URL patterns can't crowd out a "suivant" link
+        kind = pagination_link_kind(href, text)
+        if kind and self._kept_links[kind] < MAX_LINKS:
+            self._kept_links[kind] += 1
+            self._links.append((seq, href, text))
+
+    def links(self):
+        """
+        (href, texte) des liens de pagination candidats, dans l'ordre du document
+        (les autres liens ne sont pas gardés: mémoire bornée, MAX_LINKS par type)
+        """
+        return [(href, text) for _, href, text in sorted(self._links, key=lambda link: link[0])]
@@ -0,0 +1,78 @@
+"""
+Rate limiting helpers shared by the crawlers
+Per-host politeness: bounded concurrency + minimum delay between request starts
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+def host_of(url_or_host):
+    """Host part of a URL (a bare host is returned unchanged)"""
+    if '://' in url_or_host:
+        return urlparse(url_or_host).netloc.lower()
+    return url_or_host.lower()
+
+
+class HostRateLimiter:
+    """
+    Thread-safe per-host limiter
+
+    Args:
+        max_per_host: Maximum concurrent requests to the same host
+        min_interval: Minimum delay (seconds) between two request starts on a host
+    """
+
+    def __init__(self, max_per_host=2, min_interval=0.0):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return sem
+
+    def _reserve_start(self, host):
+        """Reserve the next start slot on `host`, returns how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.min_interval
+            return start - now
+
+    @contextmanager
+    def slot(self, url_or_host):
+        """Hold a request slot for the host of `url_or_host`"""
+        host = host_of(url_or_host)
+        sem = self._semaphore(host)
+        sem.acquire()
+        try:
+            delay = self._reserve_start(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            sem.release()
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name, max_per_host=2, min_interval=0.0):
+    """
+    Process-wide limiter registry: one HostRateLimiter per external service
+    (the first caller's settings win), shared by every job and worker thread
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = HostRateLimiter(max_per_host, min_interval)
+        return limiter
@@ -9,19 +9,19 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import pandas as pd
 from colorama import Fore, Style, init
 from tqdm import tqdm
 import config
+from driver_pool import get_pool, launch_chrome
+from page_readiness import wait_until_ready, wait_for_dom_quiet, scroll_until_stable
+from browser_profile import apply_lightweight_profile, enable_resource_blocking
 
 # Initialize colorama
 init(autoreset=True)
@@ -50,50 +50,59 @@ class WebScraper:
         """
         self.headless = headless if headless is not None else config.HEADLESS_MODE
         self.driver = None
+        self._driver_pool = None
         self.data = []
+        self.page_timings = []  # Readiness timing report per page
 
         # Create output directory
         Path(config.OUTPUT_DIR).mkdir(exist_ok=True)
 
-    def setup_driver(self):
-        """Setup Selenium WebDriver with Chrome"""
-        try:
-            chrome_options = Options()
+    def build_chrome_options(self) -> Options:
+        """Chrome options for WebScraper drivers (from config)"""
+        chrome_options = Options()
+
+        if self.headless:
+            chrome_options.add_argument('--headless=new')
 
-            if self.headless:
-                chrome_options.add_argument('--headless=new')
+        # Basic options
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
 
-            # Basic options
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
+        # Random user agent
+        user_agent = random.choice(config.USER_AGENTS)
+        chrome_options.add_argument(f'user-agent={user_agent}')
 
-            # Random user agent
-            user_agent = random.choice(config.USER_AGENTS)
-            chrome_options.add_argument(f'user-agent={user_agent}')
+        # Proxy support
+        if config.USE_PROXY and config.PROXY_HOST:
+            proxy = f"{config.PROXY_HOST}:{config.PROXY_PORT}"
+            chrome_options.add_argument(f'--proxy-server={proxy}')
+            logger.info(f"Using proxy: {proxy}")
 
-            # Proxy support
-            if config.USE_PROXY and config.PROXY_HOST:
-                proxy = f"{config.PROXY_HOST}:{config.PROXY_PORT}"
-                chrome_options.add_argument(f'--proxy-server={proxy}')
-                logger.info(f"Using proxy: {proxy}")
+        # Exclude automation flags
+        chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
 
-            # Exclude automation flags
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Scraping profile: no images/fonts/CSS/media/trackers, fewer background services
+        return apply_lightweight_profile(chrome_options)
 
-            # Initialize driver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+    def launch_driver(self):
+        """Launch a new configured Chrome (used as the pool factory)"""
+        driver = launch_chrome(self.build_chrome_options(), page_load_timeout=config.PAGE_LOAD_TIMEOUT)
+        driver.implicitly_wait(config.IMPLICIT_WAIT)
 
-            # Set timeouts
-            self.driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
-            self.driver.implicitly_wait(config.IMPLICIT_WAIT)
+        # Execute stealth JavaScript
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
 
-            # Execute stealth JavaScript
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    def setup_driver(self):
+        """Check a Chrome WebDriver out of the shared pool"""
+        try:
+            pool_name = 'webscraper-headless' if self.headless else 'webscraper'
+            self._driver_pool = get_pool(pool_name, self.launch_driver)
+            self.driver = self._driver_pool.checkout()
 
             logger.info(f"{Fore.GREEN}WebDriver initialized successfully")
 
@@ -124,21 +133,13 @@ class WebScraper:
             return []
 
     def scroll_to_bottom(self, pause_time: float = 2.0):
-        """Scroll to bottom of page to load dynamic content"""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-
-        while True:
-            # Scroll down
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(pause_time)
-
-            # Calculate new scroll height
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-
-            if new_height == last_height:
-                break
+        """
+        Scroll to bottom of page to load dynamic content
 
-            last_height = new_height
+        Args:
+            pause_time: Maximum wait per scroll step (returns earlier once the DOM settles)
+        """
+        return scroll_until_stable(self.driver, step_timeout=pause_time)
 
     def handle_iframes(self):
         """Switch to iframes if present"""
@@ -233,8 +234,9 @@ class WebScraper:
             logger.info(f"{Fore.CYAN}Starting to scrape: {url}")
 
             # Load initial page
+            enable_resource_blocking(self.driver, url)
             self.driver.get(url)
-            time.sleep(config.REQUEST_DELAY)
+            self.page_timings.append(wait_until_ready(self.driver, url, label='initial load'))
 
             # Handle iframes if present
             iframe_switched = self.handle_iframes()
@@ -244,7 +246,7 @@ class WebScraper:
                 logger.info(f"{Fore.YELLOW}Scraping page {page_count}...")
 
                 # Wait for content to load
-                time.sleep(config.REQUEST_DELAY)
+                self.page_timings.append(wait_until_ready(self.driver, label=f'page {page_count}'))
 
                 # Scroll to load dynamic content
                 self.scroll_to_bottom(pause_time=1.5)
@@ -266,7 +268,7 @@ class WebScraper:
 
                     if next_button.is_enabled() and next_button.is_displayed():
                         next_button.click()
-                        time.sleep(config.REQUEST_DELAY)
+                        wait_for_dom_quiet(self.driver, label='next page')
                     else:
                         logger.info("Next button not available, pagination complete")
                         break
@@ -322,10 +324,14 @@ class WebScraper:
             logger.error(f"{Fore.RED}Error exporting data: {e}")
 
     def close(self):
-        """Close the WebDriver"""
+        """Return the WebDriver to the pool"""
         if self.driver:
-            self.driver.quit()
-            logger.info("WebDriver closed")
+            if self._driver_pool:
+                self._driver_pool.checkin(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
+            logger.info("WebDriver released")
 
 
 def main():
@@ -3,11 +3,91 @@ Smart Pattern Detector - Like EasyScraper
 Détecte automatiquement les patterns répétitifs sur une page
 """
 
-from bs4 import BeautifulSoup
-from collections import defaultdict
+from bs4 import BeautifulSoup, UnicodeDammit
+from collections import defaultdict, OrderedDict
 import requests
+import threading
 import time
 import re
+import itertools
+import uuid
+from name_normalizer import company_name_normalizer
+from http_cache import install_cache
+from pattern_engine import (PatternEngine, StreamingPatternEngine, PatternSummary,
+                            CONTAINER_TAGS, MIN_REPEAT, MAX_ITEMS,
+                            PAGINATION_WORDS, PAGINATION_HREF_PATTERNS)
+from parsing_service import ParseTimeout, parse_in_pool
+
+# Au-delà de cette taille, détection en streaming (mémoire bornée, arbre libéré au fil du parsing)
+STREAMING_MIN_CHARS = 1_000_000
+# Taille des morceaux lus sur la réponse HTTP
+STREAM_CHUNK_BYTES = 65536
+
+
+def summarize_patterns(html, only_signature=None):
+    """
+    Patterns d'une page sous forme de PatternSummary (sans arbre lxml)
+    Exécuté dans les processus du parsing service pour les grosses pages
+    """
+    if html and len(html) >= STREAMING_MIN_CHARS:
+        engine = StreamingPatternEngine.from_html(html, only_signature=only_signature)
+    else:
+        engine = PatternEngine(html)
+    return PatternSummary(engine, only_signature)
+
+
+class PageAnalysis:
+    """
+    Page analysée une seule fois : résultats du moteur de patterns
+    (PatternSummary : patterns, classement, liens), sans le HTML brut
+    Partagée entre /api/analyze-patterns et /api/scrape-supervised
+    """
+
+    def __init__(self, url, size, engine):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.size = size
+        self.engine = engine
+        self.created_at = time.time()
+        self._lock = threading.Lock()
+
+    def patterns(self):
+        """Patterns triés (calculés une fois)"""
+        with self._lock:
+            return self.engine.patterns()
+
+
+class AnalysisCache:
+    """Cache LRU borné des analyses récentes (en mémoire, par processus)"""
+
+    def __init__(self, max_entries=8, ttl=1800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, analysis):
+        with self._lock:
+            self._entries[analysis.id] = analysis
+            self._entries.move_to_end(analysis.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, analysis_id):
+        if not analysis_id:
+            return None
+        with self._lock:
+            analysis = self._entries.get(analysis_id)
+            if analysis is None:
+                return None
+            if time.time() - analysis.created_at > self.ttl:
+                del self._entries[analysis_id]
+                return None
+            self._entries.move_to_end(analysis_id)
+            return analysis
+
+
+analysis_cache = AnalysisCache()
 
 
 class SmartPatternDetector:
@@ -21,6 +101,7 @@ class SmartPatternDetector:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
+        install_cache(self.session, 'listing')
 
     def get_element_signature(self, element):
         """
@@ -93,46 +174,85 @@ class SmartPatternDetector:
     def find_repeating_patterns(self, html):
         """
         Trouve les patterns qui se répètent sur la page
-        Retourne les patterns avec leurs données
+        Retourne les patterns avec leurs données (moteur linéaire lxml, voir pattern_engine.py)
+        """
+        return self.pattern_engine(html).patterns()
+
+    def pattern_engine(self, html, only_signature=None):
+        """
+        Résultats du moteur de détection adapté à la taille de la page (PatternSummary)
+        Les très grosses pages (annuaires sur une seule page) passent en streaming,
+        et les grosses pages sont parsées dans un processus du parsing service
+        Parsing trop long (ParseTimeout) : résultats vides, la page est ignorée
+        """
+        try:
+            return parse_in_pool(summarize_patterns, html, only_signature)
+        except ParseTimeout as e:
+            print(f"⚠️ Détection des patterns abandonnée: {e}")
+            return PatternSummary(PatternEngine(None), only_signature)
+
+    def find_repeating_patterns_soup(self, html):
+        """
+        Implémentation de référence html.parser (get_text / parents par élément)
+        Conservée pour benchmark_patterns.py
         """
         soup = BeautifulSoup(html, 'html.parser')
+        return self.build_patterns(self.index_signatures(soup))
 
-        # Groupe les éléments par signature
+    def _is_candidate(self, element):
+        """Filtre taille de texte / profondeur d'un conteneur"""
+        # Ignore les éléments trop petits ou trop grands
+        text = element.get_text(strip=True)
+        if not text or len(text) < 5 or len(text) > 2000:
+            return False
+
+        # Ignore les éléments trop imbriqués (probablement pas des items)
+        depth = len(list(element.parents))
+        return depth <= 15
+
+    def index_signatures(self, soup):
+        """
+        Groupe les conteneurs candidats par signature
+        Retourne {signature: [éléments]} dans l'ordre du document
+        """
         elements_by_signature = defaultdict(list)
 
         # Cherche dans tous les conteneurs possibles
-        for element in soup.find_all(['div', 'article', 'li', 'tr', 'section']):
-            # Ignore les éléments trop petits ou trop grands
-            text = element.get_text(strip=True)
-            if not text or len(text) < 5 or len(text) > 2000:
-                continue
+        for element in soup.find_all(CONTAINER_TAGS):
+            if self._is_candidate(element):
+                elements_by_signature[self.get_element_signature(element)].append(element)
 
-            # Ignore les éléments trop imbriqués (probablement pas des items)
-            depth = len(list(element.parents))
-            if depth > 15:
-                continue
+        return elements_by_signature
 
-            signature = self.get_element_signature(element)
-            elements_by_signature[signature].append(element)
+    def build_pattern(self, signature, elements):
+        """Pattern (avec données extraites) pour une signature, None si pas assez répété"""
+        if len(elements) < MIN_REPEAT:
+            return None
+
+        # Extrait les données de chaque élément
+        items = []
+        for elem in elements[:MAX_ITEMS]:
+            data = self.extract_element_data(elem)
+            if data:  # Seulement si on a extrait des données
+                items.append(data)
+
+        if not items:
+            return None
+
+        return {
+            'signature': signature,
+            'count': len(elements),
+            'items': items,
+            'sample_count': len(items)
+        }
 
-        # Trouve les patterns qui se répètent au moins 3 fois
+    def build_patterns(self, elements_by_signature):
+        """Patterns répétés, triés par nombre d'occurrences"""
         patterns = []
         for signature, elements in elements_by_signature.items():
-            if len(elements) >= 3:  # Au moins 3 répétitions
-                # Extrait les données de chaque élément
-                items = []
-                for elem in elements[:50]:  # Max 50 pour l'aperçu
-                    data = self.extract_element_data(elem)
-                    if data:  # Seulement si on a extrait des données
-                        items.append(data)
-
-                if items:
-                    patterns.append({
-                        'signature': signature,
-                        'count': len(elements),
-                        'items': items,
-                        'sample_count': len(items)
-                    })
+            pattern = self.build_pattern(signature, elements)
+            if pattern:
+                patterns.append(pattern)
 
         # Trie par nombre d'occurrences (plus probable = le bon pattern)
         patterns.sort(key=lambda x: x['count'], reverse=True)
@@ -201,20 +321,51 @@ class SmartPatternDetector:
 
         return 'text'
 
+    def fetch_engine(self, url, only_signature=None):
+        """
+        Télécharge une page et détecte ses patterns : (PatternSummary, taille en octets)
+        La réponse est lue en streaming : passé STREAMING_MIN_CHARS, les morceaux vont
+        directement au StreamingPatternEngine et la page n'est jamais gardée entière
+        """
+        with self.session.get(url, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            chunks, size = [], 0
+            stream = response.iter_content(STREAM_CHUNK_BYTES)
+            for chunk in stream:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= STREAMING_MIN_CHARS:
+                    engine = StreamingPatternEngine.from_response(
+                        response, chunks=itertools.chain(chunks, stream), only_signature=only_signature
+                    )
+                    return PatternSummary(engine, only_signature), engine.bytes_read
+
+            # Page normale : charset HTTP, puis <meta charset>, puis détection
+            content_type = response.headers.get('Content-Type', '').lower()
+            encodings = [response.encoding] if 'charset' in content_type else []
+            html = UnicodeDammit(b''.join(chunks), encodings, is_html=True).unicode_markup
+        return self.pattern_engine(html, only_signature=only_signature), size
+
+    def analyze_page(self, url):
+        """Télécharge et parse une page une seule fois, et met les résultats en cache"""
+        engine, size = self.fetch_engine(url)
+        analysis = PageAnalysis(url, size, engine)
+        analysis_cache.put(analysis)
+        return analysis
+
     def analyze_url(self, url):
         """
         Analyse une URL et retourne les patterns détectés avec leurs colonnes
+        Le résultat contient un analysis_id réutilisable par scrape_with_mapping
         """
         try:
             print(f"🔍 Analyse de {url}...")
 
-            # Récupère le HTML avec requests
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            html = response.text
+            # Récupère et parse le HTML (une seule fois)
+            analysis = self.analyze_page(url)
 
             # Détecte les patterns
-            patterns = self.find_repeating_patterns(html)
+            patterns = analysis.patterns()
 
             if not patterns:
                 return {
@@ -237,6 +388,7 @@ class SmartPatternDetector:
             return {
                 'success': True,
                 'url': url,
+                'analysis_id': analysis.id,
                 'patterns': results,
                 'best_pattern': results[0] if results else None
             }
@@ -247,7 +399,7 @@ class SmartPatternDetector:
                 'error': str(e)
             }
 
-    def scrape_with_mapping(self, url, pattern_signature=None, pattern_index=0, company_name_column='text', max_pages=5, logger=None):
+    def scrape_with_mapping(self, url, pattern_signature=None, pattern_index=0, company_name_column='text', max_pages=5, logger=None, analysis_id=None):
         """
         Scrape avec un mapping défini par l'utilisateur
 
@@ -258,6 +410,7 @@ class SmartPatternDetector:
             company_name_column: Nom de la colonne contenant les noms d'entreprises
             max_pages: Nombre max de pages à scraper
             logger: Optional function to log messages
+            analysis_id: Identifiant retourné par analyze_url (évite de re-télécharger la page 1)
         """
         def log(message):
             print(message)
@@ -271,6 +424,10 @@ class SmartPatternDetector:
             else:
                 log(f"🎯 Utilisation de l'index: {pattern_index}")
 
+            analysis = analysis_cache.get(analysis_id)
+            if analysis and analysis.url != url:
+                analysis = None
+
             all_companies = []
             visited_urls = set()
             urls_to_visit = [url]
@@ -284,35 +441,35 @@ class SmartPatternDetector:
                 visited_urls.add(current_url)
                 log(f"📄 Page {len(visited_urls)}/{max_pages}: {current_url}")
 
-                # Récupère le HTML avec requests
-                response = self.session.get(current_url, timeout=15)
-                response.raise_for_status()
-                html = response.text
-                log(f"   HTML chargé: {len(html)} caractères")
-
-                # Détecte les patterns
-                patterns = self.find_repeating_patterns(html)
-                log(f"   Patterns détectés: {len(patterns) if patterns else 0}")
-
-                if not patterns:
-                    log(f"⚠️  Aucun pattern trouvé sur {current_url}")
-                    continue
+                if analysis and current_url == analysis.url:
+                    # Page déjà analysée : patterns et liens réutilisés
+                    engine = analysis.engine
+                    log(f"   Analyse réutilisée: {analysis.size} octets")
+                else:
+                    # Récupère la page avec requests (en streaming)
+                    engine, size = self.fetch_engine(current_url, only_signature=pattern_signature)
+                    log(f"   HTML chargé: {size} octets")
 
                 # Trouve le pattern à utiliser
                 pattern = None
                 if pattern_signature:
-                    # Cherche par signature
-                    for p in patterns:
-                        if p['signature'] == pattern_signature:
-                            pattern = p
-                            log(f"   ✓ Pattern trouvé par signature: {pattern_signature} - {len(p['items'])} items")
-                            break
-
-                    if not pattern:
+                    # Seule la signature choisie est extraite
+                    pattern = engine.pattern_for(pattern_signature)
+
+                    if pattern:
+                        log(f"   ✓ Pattern trouvé par signature: {pattern_signature} - {len(pattern['items'])} items")
+                    else:
                         log(f"⚠️  Pattern '{pattern_signature}' non trouvé sur cette page")
-                        log(f"   Patterns disponibles: {[p['signature'] for p in patterns[:5]]}")
+                        log(f"   Patterns disponibles: {engine.ranked_signatures()[:5]}")
                         continue
                 else:
+                    patterns = engine.patterns()
+                    log(f"   Patterns détectés: {len(patterns)}")
+
+                    if not patterns:
+                        log(f"⚠️  Aucun pattern trouvé sur {current_url}")
+                        continue
+
                     # Utilise l'index
                     if pattern_index >= len(patterns):
                         log(f"⚠️  Pattern index {pattern_index} invalide (max: {len(patterns)-1})")
@@ -324,12 +481,10 @@ class SmartPatternDetector:
                 extracted_count = 0
                 for item in pattern['items']:
                     if company_name_column in item:
-                        company_name = item[company_name_column]
-
-                        # Nettoyage basique
-                        company_name = company_name.strip()
+                        # Nettoyage partagé avec UniversalScraper (blacklist, préfixes, URLs...)
+                        company_name = company_name_normalizer.clean(item[company_name_column])
 
-                        if company_name and len(company_name) > 2:
+                        if company_name:
                             # Simplifié : on ne garde QUE le nom et optionnellement le lien
                             company_data = {'name': company_name}
                             if 'link' in item and item['link']:
@@ -347,7 +502,7 @@ class SmartPatternDetector:
 
                 # Trouve la page suivante
                 if len(visited_urls) < max_pages:
-                    next_urls = self.find_next_page_urls(current_url, html)
+                    next_urls = self.find_next_page_urls(current_url, None, links=engine.links())
                     log(f"   🔗 Pages suivantes trouvées: {len(next_urls)}")
                     for next_url in next_urls:
                         if next_url not in visited_urls and next_url not in urls_to_visit:
@@ -357,12 +512,13 @@ class SmartPatternDetector:
 
             log(f"\n📊 Scraping terminé: {len(all_companies)} entreprises avant déduplication")
 
-            # Déduplique
+            # Déduplique (insensible à la casse)
             seen = set()
             unique_companies = []
             for company in all_companies:
-                if company['name'] not in seen:
-                    seen.add(company['name'])
+                key = company_name_normalizer.key(company['name'])
+                if key not in seen:
+                    seen.add(key)
                     unique_companies.append(company)
 
             log(f"✅ Après déduplication: {len(unique_companies)} entreprises uniques")
@@ -375,33 +531,29 @@ class SmartPatternDetector:
             log(traceback.format_exc())
             return []
 
-    def find_next_page_urls(self, current_url, html):
+    def find_next_page_urls(self, current_url, html, links=None):
         """
         Trouve les URLs de pagination
+        links: (href, texte) déjà extraits de la page (évite un nouveau parsing)
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        if links is None:
+            soup = BeautifulSoup(html, 'html.parser')
+            links = [(a.get('href'), a.get_text(strip=True)) for a in soup.find_all('a', href=True)]
         next_urls = []
 
         # Cherche les liens de pagination
-        pagination_patterns = [
-            r'page[=/-](\d+)',
-            r'p(\d+)',
-            r'/(\d+)/?$'
-        ]
-
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            text = link.get_text(strip=True).lower()
+        for href, text in links:
+            text = text.lower()
 
             # Liens "suivant" / "next"
-            if any(word in text for word in ['suivant', 'next', '>', '»', 'suiv']):
+            if any(word in text for word in PAGINATION_WORDS):
                 full_url = self.make_absolute_url(current_url, href)
                 if full_url:
                     next_urls.append(full_url)
 
             # Liens avec numéros de page
-            for pattern in pagination_patterns:
-                if re.search(pattern, href):
+            for pattern in PAGINATION_HREF_PATTERNS:
+                if pattern.search(href):
                     full_url = self.make_absolute_url(current_url, href)
                     if full_url and full_url != current_url:
                         next_urls.append(full_url)
@@ -0,0 +1,576 @@
+"""
+State Store - durable job and pipeline state of the web app
+Jobs and stage datasets used to live in module-level dicts: lost on restart,
+invisible to the other gunicorn workers ("Job not found") and never pruned
+
+- jobs: one row per job (status, progress, results, seq...), written by the
+  process running the job, readable by every worker
+- job logs: bounded ring buffer per job (JOB_LOG_LIMIT latest lines)
+- rows (job results and stage datasets 'companies' / 'domains' / 'enriched'):
+  zlib-compressed JSON batches of up to JOB_ROW_BATCH rows, tagged with the
+  job seq that wrote them, so deltas and pages only decode what they return
+- prune(): finished jobs older than JOB_TTL are deleted with their logs and rows
+- job queue (pool, priority, admitted): the job scheduler of every worker admits
+  its jobs here (enqueue_job / claim_jobs), so pool limits, JOB_QUEUE_LIMIT and
+  the queue order hold across workers
+- recover_orphans(): jobs left 'queued' / 'running' by a dead process are failed.
+  Every process registers under a random boot id and heartbeats every
+  JOB_HEARTBEAT_SECONDS; an owner silent for JOB_OWNER_TIMEOUT is dead (a
+  redeploy changes the hostname, containers reuse PIDs: neither is proof of life)
+
+Backends are pluggable (STATE_BACKEND, see BACKENDS); SQLite is the default,
+STATE_DB_PATH=':memory:' keeps everything in the process (single worker)
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+
+import config
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('companies', 'domains', 'enriched')
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Columns added after the first release: name -> definition (added to older files on open)
+JOB_MIGRATIONS = {
+    'pool': 'TEXT',
+    'priority': 'INTEGER DEFAULT 0',
+    'queue_order': 'REAL',
+    'admitted': 'INTEGER DEFAULT 0',
+    'host': 'TEXT',
+}
+# jobs.admitted: place of a job in its pool
+WAITING, ADMITTED, RELEASED = 0, 1, 2
+
+# Job columns written by update_job (JSON-encoded: results)
+JOB_FIELDS = ('status', 'progress', 'total', 'current_item', 'results', 'error', 'queue_position',
+              'started_at', 'completed_at', 'seq', 'rows_total', 'rows_reset_seq')
+SUMMARY_FIELDS = ('job_id', 'job_type', 'status', 'progress', 'total', 'current_item', 'results',
+                  'error', 'queue_position', 'started_at', 'completed_at', 'seq')
+
+
+_boot_ids = {}
+
+
+def process_owner():
+    """Identifier of the current process run (host:pid:boot id), recorded on the jobs it runs"""
+    pid = os.getpid()
+    boot_id = _boot_ids.get(pid)
+    if boot_id is None:
+        boot_id = _boot_ids[pid] = uuid.uuid4().hex[:12]
+    return f"{socket.gethostname()}:{pid}:{boot_id}"
+
+
+def _job_rows_key(job_id):
+    return f"job:{job_id}"
+
+
+def _stage_rows_key(stage):
+    return f"stage:{stage}"
+
+
+class SQLiteStateBackend:
+    """SQLite (WAL) backend: one file shared by every worker process of the host"""
+
+    def __init__(self, path=None, log_limit=None, batch_size=None, ttl=None):
+        self.path = path or config.STATE_DB_PATH
+        self.log_limit = log_limit or config.JOB_LOG_LIMIT
+        self.batch_size = batch_size or config.JOB_ROW_BATCH
+        self.ttl = ttl if ttl is not None else config.JOB_TTL
+        directory = os.path.dirname(self.path) if self.path != ':memory:' else ''
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pruned_at = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                job_type TEXT,
+                status TEXT,
+                progress INTEGER DEFAULT 0,
+                total INTEGER DEFAULT 0,
+                current_item TEXT DEFAULT '',
+                results TEXT DEFAULT '{}',
+                error TEXT,
+                queue_position INTEGER,
+                started_at TEXT,
+                completed_at TEXT,
+                seq INTEGER DEFAULT 0,
+                rows_total INTEGER DEFAULT 0,
+                rows_reset_seq INTEGER DEFAULT 0,
+                cancel_requested INTEGER DEFAULT 0,
+                owner TEXT,
+                updated_at REAL,
+                pool TEXT,
+                priority INTEGER DEFAULT 0,
+                queue_order REAL,
+                admitted INTEGER DEFAULT 0,
+                host TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, updated_at);
+            CREATE TABLE IF NOT EXISTS job_logs (
+                job_id TEXT,
+                seq INTEGER,
+                timestamp TEXT,
+                level TEXT,
+                message TEXT,
+                PRIMARY KEY (job_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS row_batches (
+                rows_key TEXT,
+                start INTEGER,
+                count INTEGER,
+                seq INTEGER,
+                payload BLOB,
+                PRIMARY KEY (rows_key, start)
+            );
+            CREATE TABLE IF NOT EXISTS stages (
+                stage TEXT PRIMARY KEY,
+                rows_total INTEGER,
+                updated_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS processes (
+                owner TEXT PRIMARY KEY,
+                heartbeat_at REAL
+            );
+        ''')
+        self._migrate()
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_pool ON jobs(pool, status)')
+        self.heartbeat()
+
+    def _migrate(self):
+        """Add the JOB_MIGRATIONS columns missing from a file created by an older version"""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        for name, definition in JOB_MIGRATIONS.items():
+            if name not in columns:
+                self._conn.execute(f'ALTER TABLE jobs ADD COLUMN {name} {definition}')
+
+    @contextmanager
+    def _transaction(self, immediate=False):
+        """
+        One transaction under the connection lock (reads see a consistent snapshot)
+        immediate: take the write lock up front, for read-then-write decisions
+        that another process must not interleave (job admission)
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            try:
+                yield self._conn
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    # ------------------------------------------------------------------
+    # Row batches
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode(rows):
+        return zlib.compress(json.dumps(rows, ensure_ascii=False, default=str).encode('utf-8'))
+
+    @staticmethod
+    def _decode(payload):
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def _write_rows(self, conn, rows_key, rows, start, seq):
+        conn.executemany(
+            'INSERT OR REPLACE INTO row_batches VALUES (?, ?, ?, ?, ?)',
+            [(rows_key, start + i, len(rows[i:i + self.batch_size]), seq, self._encode(rows[i:i + self.batch_size]))
+             for i in range(0, len(rows), self.batch_size)]
+        )
+
+    @staticmethod
+    def _clear_rows(conn, rows_key):
+        conn.execute('DELETE FROM row_batches WHERE rows_key = ?', (rows_key,))
+
+    def _read_rows(self, conn, rows_key, offset=0, limit=None):
+        """Rows [offset, offset + limit) of `rows_key`, decoding only the overlapping batches"""
+        end = offset + limit if limit is not None else None
+        query = 'SELECT start, payload FROM row_batches WHERE rows_key = ? AND start + count > ?'
+        params = [rows_key, offset]
+        if end is not None:
+            query += ' AND start < ?'
+            params.append(end)
+        rows = []
+        for start, payload in conn.execute(query + ' ORDER BY start', params):
+            batch = self._decode(payload)
+            low = max(offset - start, 0)
+            high = len(batch) if end is None else min(end - start, len(batch))
+            rows.extend(batch[low:high])
+        return rows
+
+    # ------------------------------------------------------------------
+    # Jobs (writer side: the process running the job)
+    # ------------------------------------------------------------------
+
+    def create_job(self, job_id, job_type, status='queued'):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO jobs (job_id, job_type, status, owner, host, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, job_type, status, process_owner(), socket.gethostname(), time.time())
+            )
+        self.prune()
+
+    def update_job(self, job_id, **fields):
+        unknown = set(fields) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        if 'results' in fields:
+            fields['results'] = json.dumps(fields['results'], ensure_ascii=False, default=str)
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f'UPDATE jobs SET {assignments}, updated_at = ? WHERE job_id = ?',
+                (*fields.values(), time.time(), job_id)
+            )
+
+    def delete_job(self, job_id):
+        with self._transaction() as conn:
+            self._delete_job(conn, job_id)
+
+    def _delete_job(self, conn, job_id):
+        conn.execute('DELETE FROM job_logs WHERE job_id = ?', (job_id,))
+        self._clear_rows(conn, _job_rows_key(job_id))
+        conn.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
+
+    def start_job(self, job_id, seq, started_at):
+        """queued -> running, False when the job was cancelled meanwhile (by any worker)"""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'running', queue_position = 0, seq = ?, started_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = 'queued'",
+                (seq, started_at, time.time(), job_id)
+            ).rowcount == 1
+
+    def cancel_queued_job(self, job_id, completed_at):
+        """queued -> cancelled, False when the job already started"""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', error = 'Job cancelled', cancel_requested = 1, "
+                "completed_at = ?, seq = seq + 1, updated_at = ? WHERE job_id = ? AND status = 'queued'",
+                (completed_at, time.time(), job_id)
+            ).rowcount == 1
+
+    def request_cancel(self, job_id):
+        with self._lock:
+            self._conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE job_id = ?', (job_id,))
+
+    def is_cancel_requested(self, job_id):
+        with self._lock:
+            row = self._conn.execute('SELECT cancel_requested FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def append_log(self, job_id, entry):
+        """Add a log line (entry['seq'] becomes the job seq), keeping only the log_limit latest"""
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO job_logs VALUES (?, ?, ?, ?, ?)',
+                (job_id, entry['seq'], entry['timestamp'], entry['level'], entry['message'])
+            )
+            conn.execute('UPDATE jobs SET seq = ?, updated_at = ? WHERE job_id = ?',
+                         (entry['seq'], time.time(), job_id))
+            conn.execute(
+                'DELETE FROM job_logs WHERE job_id = ? AND seq <= ('
+                'SELECT seq FROM job_logs WHERE job_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)',
+                (job_id, job_id, self.log_limit)
+            )
+
+    def append_job_rows(self, job_id, rows, start, seq):
+        with self._transaction() as conn:
+            self._write_rows(conn, _job_rows_key(job_id), rows, start, seq)
+            conn.execute('UPDATE jobs SET rows_total = ?, seq = ?, updated_at = ? WHERE job_id = ?',
+                         (start + len(rows), seq, time.time(), job_id))
+
+    def replace_job_rows(self, job_id, rows, seq):
+        with self._transaction() as conn:
+            self._clear_rows(conn, _job_rows_key(job_id))
+            self._write_rows(conn, _job_rows_key(job_id), rows, 0, seq)
+            conn.execute('UPDATE jobs SET rows_total = ?, rows_reset_seq = ?, seq = ?, updated_at = ? '
+                         'WHERE job_id = ?', (len(rows), seq, seq, time.time(), job_id))
+
+    # ------------------------------------------------------------------
+    # Job queue (admission shared by every worker, see job_scheduler.py)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _pool_filter(pool, host):
+        """WHERE clause of a pool's jobs: on every host, or on `host` only"""
+        if host is None:
+            return 'pool = ?', (pool,)
+        return 'pool = ? AND host = ?', (pool, host)
+
+    def _pool_counts(self, conn, pool, host):
+        where, params = self._pool_filter(pool, host)
+        running, waiting = conn.execute(
+            "SELECT COALESCE(SUM(admitted = ? AND status IN ('queued', 'running')), 0), "
+            "COALESCE(SUM(admitted = ? AND status = 'queued'), 0) "
+            f"FROM jobs WHERE {where}", (ADMITTED, WAITING, *params)
+        ).fetchone()
+        return running, waiting
+
+    def pool_counts(self, pool, host=None):
+        """(running, waiting) jobs of a pool, every worker included"""
+        with self._lock:
+            return self._pool_counts(self._conn, pool, host)
+
+    def enqueue_job(self, job_id, pool, priority, workers, queue_limit, host=None):
+        """
+        Put a queued job in line for `pool`
+
+        Returns:
+            False (job left out of the queue) when the pool has `workers` jobs
+            running and `queue_limit` jobs waiting
+        """
+        with self._transaction(immediate=True) as conn:
+            running, waiting = self._pool_counts(conn, pool, host)
+            if running >= workers and waiting >= queue_limit:
+                return False
+            now = time.time()
+            conn.execute('UPDATE jobs SET pool = ?, priority = ?, queue_order = ?, admitted = ?, updated_at = ? '
+                         'WHERE job_id = ?', (pool, priority, now, WAITING, now, job_id))
+            return True
+
+    def claim_jobs(self, pool, workers, owner, host=None):
+        """
+        Admit the head of the pool's queue, up to `workers` admitted jobs
+
+        Only the jobs of `owner` are admitted: a free slot at the head of the
+        queue held by another process' job waits for that process, so every
+        worker follows the same order (priority, then enqueue time).
+
+        Returns:
+            (job ids of `owner` admitted now, {job_id: queue position} of its
+            jobs still waiting, 1 = next)
+        """
+        where, params = self._pool_filter(pool, host)
+        with self._transaction(immediate=True) as conn:
+            running, _ = self._pool_counts(conn, pool, host)
+            waiting = conn.execute(
+                f"SELECT job_id, owner FROM jobs WHERE {where} AND admitted = ? AND status = 'queued' "
+                "ORDER BY priority, queue_order, job_id", (*params, WAITING)
+            ).fetchall()
+            free = max(0, workers - running)
+            claimed = [job_id for job_id, job_owner in waiting[:free] if job_owner == owner]
+            conn.executemany('UPDATE jobs SET admitted = ? WHERE job_id = ?',
+                             [(ADMITTED, job_id) for job_id in claimed])
+        positions = {job_id: index - free + 1 for index, (job_id, job_owner) in enumerate(waiting)
+                     if index >= free and job_owner == owner}
+        return claimed, positions
+
+    def release_job(self, job_id):
+        """Free the pool slot of a job that ended (whatever status its task left): never admitted again"""
+        with self._lock:
+            self._conn.execute('UPDATE jobs SET admitted = ? WHERE job_id = ?', (RELEASED, job_id))
+
+    # ------------------------------------------------------------------
+    # Jobs (reader side: any worker)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _job_row(conn, job_id):
+        cursor = conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        job = dict(zip([column[0] for column in cursor.description], row))
+        job['results'] = json.loads(job['results'] or '{}')
+        return job
+
+    @staticmethod
+    def _summary(job):
+        return {field: job[field] for field in SUMMARY_FIELDS}
+
+    @staticmethod
+    def _logs(conn, job_id, since=0, limit=None):
+        query = 'SELECT seq, timestamp, level, message FROM job_logs WHERE job_id = ? AND seq > ? ORDER BY seq'
+        rows = conn.execute(query, (job_id, since)).fetchall()
+        if limit is not None:
+            rows = rows[-limit:]
+        return [{'seq': seq, 'timestamp': ts, 'level': level, 'message': message}
+                for seq, ts, level, message in rows]
+
+    def get_job(self, job_id):
+        """Job summary (see JobTracker), None when unknown"""
+        with self._lock:
+            job = self._job_row(self._conn, job_id)
+        return self._summary(job) if job else None
+
+    def logs(self, job_id, since=0):
+        with self._lock:
+            return self._logs(self._conn, job_id, since)
+
+    def job_rows(self, job_id, offset, limit):
+        """Result rows page of a job: {'job_id', 'offset', 'limit', 'total', 'rows', 'seq'}, None when unknown"""
+        with self._transaction() as conn:
+            job = self._job_row(conn, job_id)
+            if job is None:
+                return None
+            return {
+                'job_id': job_id,
+                'offset': offset,
+                'limit': limit,
+                'total': job['rows_total'],
+                'rows': self._read_rows(conn, _job_rows_key(job_id), offset, limit),
+                'seq': job['seq']
+            }
+
+    def job_delta(self, job_id, since, max_rows=500):
+        """
+        Changes after `since` (one consistent snapshot): summary, new logs, new rows
+
+        rows_offset is the index of the first returned row; rows_reset tells the
+        client to drop the rows it has (dataset replaced since)
+        """
+        with self._transaction() as conn:
+            job = self._job_row(conn, job_id)
+            if job is None:
+                return None
+            rows_reset = since < job['rows_reset_seq']
+            if rows_reset:
+                row_start = 0
+            else:
+                row_start = conn.execute(
+                    'SELECT COALESCE(SUM(count), 0) FROM row_batches WHERE rows_key = ? AND seq <= ?',
+                    (_job_rows_key(job_id), since)
+                ).fetchone()[0]
+            return {
+                **self._summary(job),
+                'logs': self._logs(conn, job_id, since),
+                'rows': self._read_rows(conn, _job_rows_key(job_id), row_start, max_rows),
+                'rows_offset': row_start,
+                'rows_total': job['rows_total'],
+                'rows_reset': rows_reset
+            }
+
+    def job_snapshot(self, job_id, log_limit=50):
+        """Full state, whole dataset included (legacy pages)"""
+        with self._transaction() as conn:
+            job = self._job_row(conn, job_id)
+            if job is None:
+                return None
+            return {
+                **self._summary(job),
+                'data': self._read_rows(conn, _job_rows_key(job_id)),
+                'logs': self._logs(conn, job_id, limit=log_limit)
+            }
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def prune(self, force=False):
+        """Delete finished jobs older than the TTL (at most every JOB_PRUNE_INTERVAL unless forced)"""
+        now = time.time()
+        if not force and now - self._pruned_at < config.JOB_PRUNE_INTERVAL:
+            return 0
+        self._pruned_at = now
+        with self._transaction() as conn:
+            expired = [row[0] for row in conn.execute(
+                f"SELECT job_id FROM jobs WHERE status NOT IN ({','.join('?' * len(ACTIVE_STATUSES))}) "
+                "AND updated_at < ?", (*ACTIVE_STATUSES, now - self.ttl)
+            )]
+            for job_id in expired:
+                self._delete_job(conn, job_id)
+        if expired:
+            logger.info(f"State store: {len(expired)} finished jobs pruned")
+        return len(expired)
+
+    def heartbeat(self):
+        """Mark this process alive (and forget the processes silent for JOB_OWNER_TIMEOUT)"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO processes VALUES (?, ?)', (process_owner(), now))
+            conn.execute('DELETE FROM processes WHERE heartbeat_at < ?', (now - config.JOB_OWNER_TIMEOUT,))
+
+    def recover_orphans(self):
+        """Fail the active jobs whose process stopped heartbeating (restart, redeploy, crashed worker)"""
+        now = time.time()
+        with self._transaction() as conn:
+            active = conn.execute(
+                f"SELECT job_id FROM jobs WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))}) "
+                "AND (owner IS NULL OR owner NOT IN (SELECT owner FROM processes WHERE heartbeat_at >= ?))",
+                (*ACTIVE_STATUSES, now - config.JOB_OWNER_TIMEOUT)
+            ).fetchall()
+            orphans = [row[0] for row in active]
+            for job_id in orphans:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Interrupted: the server restarted', "
+                    "seq = seq + 1, updated_at = ? WHERE job_id = ?", (now, job_id)
+                )
+        if orphans:
+            logger.warning(f"State store: {len(orphans)} interrupted jobs marked failed")
+        return len(orphans)
+
+    # ------------------------------------------------------------------
+    # Pipeline stages
+    # ------------------------------------------------------------------
+
+    def put_stage(self, stage, rows):
+        """Replace the dataset of a pipeline stage"""
+        with self._transaction() as conn:
+            self._clear_rows(conn, _stage_rows_key(stage))
+            self._write_rows(conn, _stage_rows_key(stage), list(rows), 0, 0)
+            conn.execute('INSERT OR REPLACE INTO stages VALUES (?, ?, ?)', (stage, len(rows), time.time()))
+
+    def get_stage(self, stage):
+        with self._lock:
+            return self._read_rows(self._conn, _stage_rows_key(stage))
+
+    def stage_count(self, stage):
+        with self._lock:
+            row = self._conn.execute('SELECT rows_total FROM stages WHERE stage = ?', (stage,)).fetchone()
+        return row[0] if row else 0
+
+
+# STATE_BACKEND -> backend class (another backend, e.g. Redis, implements the
+# public methods of SQLiteStateBackend: jobs, logs, rows, stages, maintenance)
+BACKENDS = {
+    'sqlite': SQLiteStateBackend,
+}
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def _heartbeat_loop(store):
+    """Keep this process alive in the store, and fail the jobs of the processes that died"""
+    while True:
+        time.sleep(config.JOB_HEARTBEAT_SECONDS)
+        try:
+            store.heartbeat()
+            store.recover_orphans()
+        except Exception as e:
+            logger.error(f"State store heartbeat failed: {e}")
+
+
+def get_state_store():
+    """
+    Process-wide state backend (STATE_BACKEND), stale jobs recovered on first use
+    and then by a heartbeat thread (every JOB_HEARTBEAT_SECONDS)
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            backend = BACKENDS.get(config.STATE_BACKEND)
+            if backend is None:
+                raise ValueError(f"Unknown STATE_BACKEND: {config.STATE_BACKEND} (available: {sorted(BACKENDS)})")
+            _shared_store = backend()
+            _shared_store.recover_orphans()
+            threading.Thread(target=_heartbeat_loop, args=(_shared_store,), name='state-heartbeat',
+                             daemon=True).start()
+        return _shared_store
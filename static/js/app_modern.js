@@ -11,6 +11,7 @@ let analysisResult = null;
 let selectedPattern = 0;
 let currentJobId = null;
 let pollInterval = null;
+let jobStream = null;
 
 // Initialize
 document.addEventListener('DOMContentLoaded', () => {
@@ -270,7 +271,8 @@ async function startScraping() {
                 pattern_signature: patternSignature,
                 pattern_index: selectedPattern,
                 company_column: companyColumn,
-                max_pages: maxPages
+                max_pages: maxPages,
+                analysis_id: analysisResult.analysis_id
             })
         });
 
@@ -283,7 +285,7 @@ async function startScraping() {
         }
 
         currentJobId = data.job_id;
-        pollJob(handleScrapingComplete);
+        watchJob(handleScrapingComplete);
 
     } catch (error) {
         hideModal();
@@ -294,6 +296,7 @@ async function startScraping() {
 function handleScrapingComplete(job) {
     hideModal();
 
+    if (job.status === 'cancelled') return;
     if (job.status === 'failed') {
         alert('Erreur: ' + job.error);
         return;
@@ -342,7 +345,7 @@ async function startDomainFinder() {
         }
 
         currentJobId = data.job_id;
-        pollJob(handleDomainsComplete);
+        watchJob(handleDomainsComplete);
 
     } catch (error) {
         hideModal();
@@ -353,6 +356,7 @@ async function startDomainFinder() {
 function handleDomainsComplete(job) {
     hideModal();
 
+    if (job.status === 'cancelled') return;
     if (job.status === 'failed') {
         alert('Erreur: ' + job.error);
         return;
@@ -417,7 +421,7 @@ async function startEnrichment() {
         }
 
         currentJobId = data.job_id;
-        pollJob(handleEnrichmentComplete);
+        watchJob(handleEnrichmentComplete);
 
     } catch (error) {
         hideModal();
@@ -428,6 +432,7 @@ async function startEnrichment() {
 function handleEnrichmentComplete(job) {
     hideModal();
 
+    if (job.status === 'cancelled') return;
     if (job.status === 'failed') {
         alert('Erreur: ' + job.error);
         return;
@@ -523,6 +528,7 @@ function showModal(title, message) {
     document.getElementById('modal-title').textContent = title;
     document.getElementById('modal-message').textContent = message;
     document.getElementById('modal-progress').style.width = '0%';
+    document.getElementById('modal-rows').textContent = '';
     document.getElementById('progress-modal').classList.add('show');
 }
 
@@ -537,27 +543,150 @@ function updateModalProgress(percent, message) {
     }
 }
 
+// Result rows received while the job runs ('rows' events / deltas)
+function updateModalRows(count) {
+    document.getElementById('modal-rows').textContent = count > 0 ? `${count} résultat(s) reçu(s)` : '';
+}
+
 //===========================================
-// JOB POLLING
+// JOB PROGRESS (SSE stream, delta polling fallback)
 //===========================================
 
+function isJobFinished(job) {
+    return job.status === 'completed' || job.status === 'failed' || job.status === 'cancelled';
+}
+
+function showQueuePosition(job) {
+    if (job.queue_position) {
+        updateModalProgress(0, `En attente - position ${job.queue_position} dans la file`);
+    }
+}
+
+async function cancelCurrentJob() {
+    if (!currentJobId) {
+        hideModal();
+        return;
+    }
+    try {
+        await fetch(`/api/jobs/${currentJobId}/cancel`, { method: 'POST' });
+        updateModalProgress(0, 'Annulation...');
+    } catch (error) {
+        console.error('Cancel error:', error);
+    }
+}
+
+function watchJob(onComplete) {
+    if (window.EventSource) {
+        streamJob(onComplete);
+    } else {
+        pollJob(onComplete);
+    }
+}
+
+function streamJob(onComplete) {
+    if (jobStream) jobStream.close();
+
+    // EventSource reconnects by itself and resumes from the last event id
+    const jobId = currentJobId;
+    let rows = [];
+    const source = new EventSource(`/api/jobs/${jobId}/events`);
+    jobStream = source;
+
+    const applyRows = (batch, offset, reset) => {
+        if (reset) rows = [];
+        if (offset === rows.length) rows.push(...batch);
+        updateModalRows(rows.length);
+    };
+    const showProgress = (job) => {
+        if (job.status === 'queued') {
+            showQueuePosition(job);
+        } else if (job.total > 0) {
+            updateModalProgress(Math.round((job.progress / job.total) * 100), job.current_item);
+        }
+    };
+    const finish = async (job) => {
+        source.close();
+        jobStream = null;
+        if (job.rows_reset && rows.length >= job.rows_total) rows = [];
+        if (rows.length < job.rows_total) {
+            rows = rows.concat(await fetchJobRows(jobId, rows.length));
+        }
+        job.data = rows;
+        currentJobId = null;
+        if (onComplete) {
+            onComplete(job);
+        }
+    };
+
+    source.addEventListener('delta', (e) => {
+        const job = JSON.parse(e.data);
+        applyRows(job.rows, job.rows_offset, job.rows_reset);
+        showProgress(job);
+        if (isJobFinished(job)) {
+            job.rows_reset = false;
+            finish(job);
+        }
+    });
+    source.addEventListener('progress', (e) => showProgress(JSON.parse(e.data)));
+    source.addEventListener('queue', (e) => {
+        const job = JSON.parse(e.data);
+        if (job.status === 'queued') showQueuePosition(job);
+    });
+    source.addEventListener('rows', (e) => {
+        const batch = JSON.parse(e.data);
+        applyRows(batch.rows, batch.offset, false);
+    });
+    source.addEventListener('status', (e) => {
+        const job = JSON.parse(e.data);
+        if (job.rows_reset) rows = [];
+        job.rows_reset = false;
+        finish(job);
+    });
+    source.onerror = () => {
+        // Stream unavailable (proxy, sync worker...): fall back to polling
+        if (source.readyState === EventSource.CLOSED && jobStream === source) {
+            jobStream = null;
+            pollJob(onComplete);
+        }
+    };
+}
+
 function pollJob(onComplete) {
     if (pollInterval) clearInterval(pollInterval);
 
+    // Delta polling: only new logs/rows since the last seen sequence number
+    const jobId = currentJobId;
+    let since = 0;
+    let rows = [];
+    let busy = false;
+
     pollInterval = setInterval(async () => {
-        if (!currentJobId) return;
+        if (!currentJobId || busy) return;
+        busy = true;
 
         try {
-            const response = await fetch(`/api/jobs/${currentJobId}`);
+            const response = await fetch(`/api/jobs/${jobId}?since=${since}`);
             const job = await response.json();
+            since = job.seq;
 
-            if (job.total > 0) {
+            if (job.rows_reset) rows = [];
+            if (job.rows_offset === rows.length) rows.push(...job.rows);
+            updateModalRows(rows.length);
+
+            if (job.status === 'queued') {
+                showQueuePosition(job);
+            } else if (job.total > 0) {
                 const percent = Math.round((job.progress / job.total) * 100);
                 updateModalProgress(percent, job.current_item);
             }
 
-            if (job.status === 'completed' || job.status === 'failed') {
+            if (isJobFinished(job)) {
                 clearInterval(pollInterval);
+                // Rows beyond the delta limit come from the paginated endpoint
+                if (rows.length < job.rows_total) {
+                    rows = rows.concat(await fetchJobRows(jobId, rows.length));
+                }
+                job.data = rows;
                 if (onComplete) {
                     onComplete(job);
                 }
@@ -565,10 +694,24 @@ function pollJob(onComplete) {
             }
         } catch (error) {
             console.error('Polling error:', error);
+        } finally {
+            busy = false;
         }
     }, 1000);
 }
 
+async function fetchJobRows(jobId, offset) {
+    const rows = [];
+    const limit = 1000;
+    while (true) {
+        const response = await fetch(`/api/jobs/${jobId}/data?offset=${offset + rows.length}&limit=${limit}`);
+        const page = await response.json();
+        rows.push(...page.rows);
+        if (page.rows.length === 0 || offset + rows.length >= page.total) break;
+    }
+    return rows;
+}
+
 //===========================================
 // CONFIG
 //===========================================
@@ -6,30 +6,116 @@ Intelligent scraper that detects pagination and company names automatically
 import re
 import time
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
 from urllib.parse import urljoin, urlparse
 import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
+from bs4 import BeautifulSoup, UnicodeDammit
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from driver_pool import get_pool, launch_chrome
+from page_readiness import wait_until_ready, wait_for_dom_quiet
+from browser_profile import apply_lightweight_profile, enable_resource_blocking
+from extraction_engine import extract_candidates
+from name_normalizer import company_name_normalizer
+from parsing_service import ParseTimeout, parse_in_pool
+from rate_limiter import HostRateLimiter
+from http_cache import install_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'
+
+# Fetch modes
+FETCH_HYBRID = 'hybrid'    # requests first, Selenium only when the static HTML isn't enough
+FETCH_HTTP = 'http'        # requests only
+FETCH_BROWSER = 'browser'  # Selenium only (historical behaviour)
+
+# Markers of pages whose content is rendered client-side
+JS_RENDERED_MARKERS = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt)["\'][^>]*>\s*</div>'
+    r'|enable javascript|activer javascript|javascript is required|ng-app=|data-reactroot',
+    re.I
+)
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1>', re.I | re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Per-domain fetch decision, shared by every scraper of the process so later
+# pages (and later jobs) on a known domain skip the static probe
+_domain_fetch_modes = {}
+_domain_fetch_modes_lock = threading.Lock()
+
+
+def looks_js_rendered(html, min_visible_chars=500):
+    """Heuristic: SPA shell markers, or almost no visible text outside <script>/<style>"""
+    if JS_RENDERED_MARKERS.search(html):
+        return True
+    visible = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub(' ', html))
+    return len(''.join(visible.split())) < min_visible_chars
+
+
+def get_domain_fetch_mode(url):
+    """Cached fetch mode for the domain of `url` (None if not probed yet)"""
+    with _domain_fetch_modes_lock:
+        return _domain_fetch_modes.get(urlparse(url).netloc)
+
+
+def set_domain_fetch_mode(url, mode):
+    with _domain_fetch_modes_lock:
+        _domain_fetch_modes[urlparse(url).netloc] = mode
+
+
+def build_chrome_options(headless=True):
+    """Chrome options used by UniversalScraper drivers"""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+    return apply_lightweight_profile(chrome_options)
+
+
+def get_universal_driver_pool(headless=True):
+    """Process-wide pool of UniversalScraper drivers"""
+    name = 'universal-headless' if headless else 'universal'
+    return get_pool(name, lambda: launch_chrome(build_chrome_options(headless), page_load_timeout=30))
+
 
 class UniversalScraper:
     """Universal scraper for extracting company names from any website"""
 
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, fetch_mode=FETCH_HYBRID, http_timeout=15,
+                 max_workers=4, max_per_host=2, min_host_interval=0.25):
         self.headless = headless
         self.driver = None
+        self._driver_pool = None
         self.companies = []
         self.visited_urls = set()
 
+        # Concurrent pagination crawl (max_workers=1 = serial crawl)
+        self.max_workers = max_workers
+        self.host_limiter = HostRateLimiter(max_per_host, min_host_interval)
+        self._browser_lock = threading.RLock()  # One WebDriver, one page at a time
+        self.page_timings = []  # Readiness timings of browser-loaded pages
+
+        # Static fetch (hybrid mode): pooled keep-alive session
+        self.fetch_mode = fetch_mode
+        self.http_timeout = http_timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8'
+        })
+        install_cache(self.session, 'listing', pool_maxsize=max(10, max_workers))
+
         # Common company name patterns
         self.company_indicators = [
             'company', 'entreprise', 'exhibitor', 'exposant', 'vendor',
@@ -44,28 +130,42 @@ class UniversalScraper:
         ]
 
     def setup_driver(self):
-        """Setup Selenium WebDriver"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)')
-
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.set_page_load_timeout(30)
+        """Check a warm Selenium WebDriver out of the shared pool"""
+        self._driver_pool = get_universal_driver_pool(self.headless)
+        self.driver = self._driver_pool.checkout()
 
     def close(self):
-        """Close the driver"""
+        """Return the driver to the pool and close the HTTP session"""
         if self.driver:
-            self.driver.quit()
+            if self._driver_pool:
+                self._driver_pool.checkin(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
+        self.session.close()
 
     def extract_company_names(self, html):
         """
         Intelligently extract company names from HTML
         STRICT MODE: Only real company names, no navigation/menu items
+
+        The six strategies run on a single-pass index of the page (see
+        extraction_engine.SinglePassExtractor), in a parsing service worker
+        process for big pages
+        """
+        try:
+            found_companies = parse_in_pool(extract_candidates, html, self.company_indicators)
+        except ParseTimeout as e:
+            logger.warning(f"Company extraction skipped for this page: {e}")
+            return []
+
+        # Clean and deduplicate with advanced filtering
+        return company_name_normalizer.normalize_batch(found_companies)
+
+    def collect_candidates_multipass(self, html):
+        """
+        Reference implementation of the six strategies (one tree walk each)
+        Kept to check the single-pass engine output and for benchmark_extraction.py
         """
         soup = BeautifulSoup(html, 'lxml')
         found_companies = []
@@ -201,116 +301,21 @@ class UniversalScraper:
             if text and 3 <= len(text) <= 150:
                 found_companies.append(text)
 
-        # Clean and deduplicate with advanced filtering
-        cleaned = []
-        seen = set()
-
-        # STRICT BLACKLIST - Everything that is NOT a company name
-        blacklist = {
-            # Navigation
-            'home', 'contact', 'about', 'menu', 'search', 'login', 'accueil',
-            'connexion', 'recherche', 'à propos', 'mentions légales', 'cookies',
-            'politique', 'confidentialité', 'conditions', 'cgv', 'cgu',
-            'afficher', 'show', 'hide', 'masquer', 'tout', 'all',
-
-            # Actions
-            'voir', 'plus', 'more', 'details', 'détails', 'lire la suite', 'read more',
-            'en savoir plus', 'découvrir', 'discover', 'voir tout', 'see all',
-
-            # Pagination
-            'page', 'suivant', 'précédent', 'next', 'previous', 'retour', 'back',
-            'first', 'last', 'premier', 'dernier',
-
-            # Navigation française (batiweb style)
-            'toutes les actualités', 'communiqués', 'dossiers spéciaux',
-            'vie des sociétés', 'immobilier', 'architecture', 'patrimoine',
-            'urbanisme', 'construction', 'énergie', 'conjoncture',
-            'développement durable', 'marchés publics', 'événements et salons',
-            'mon profil', 'déconnexion', 'mon compte', 'mes newsletters',
-            'mes indices-index', 'mes articles', 'mes produits', 'mes communiqués',
-            'mes vidéos', 'budget', 'maprimerenov', 'rénovation énergétique',
-            'fraudes', 'zan',
-
-            # Sections génériques
-            'actualités', 'news', 'articles', 'produits', 'products',
-            'services', 'solutions', 'about us', 'qui sommes-nous',
-            'notre histoire', 'nos valeurs', 'équipe', 'team',
-            'carrières', 'careers', 'emploi', 'jobs',
-            'presse', 'press', 'médias', 'media',
-            'blog', 'newsletter', 'inscription', 'subscribe',
-            'télécharger', 'download', 'documentation', 'ressources',
-            'faq', 'aide', 'help', 'support', 'tutoriels',
-            'légal', 'legal', 'privacy', 'terms',
-
-            # Actions génériques
-            'cliquez ici', 'click here', 'en savoir plus', 'learn more',
-            'contactez-nous', 'contact us', 'demander un devis', 'get a quote',
-            'inscription gratuite', 'free trial', 'essai gratuit',
-
-            # Catégories
-            'catégories', 'categories', 'rubriques', 'sections',
-            'tous les fabricants', 'all manufacturers', 'annuaire',
-            'directory', 'liste', 'list',
-
-            # Mots isolés trop génériques
-            'nouveau', 'new', 'hot', 'top', 'best', 'meilleur',
-            'gratuit', 'free', 'offre', 'offer', 'promo', 'promotion'
-        }
-
-        # Prefixes to remove
-        prefixes_to_remove = ['détails :', 'details:', 'voir:', 'see:']
-
-        for company in found_companies:
-            # Clean the text
-            company = re.sub(r'\s+', ' ', company).strip()
-
-            # Remove common prefixes
-            for prefix in prefixes_to_remove:
-                if company.lower().startswith(prefix):
-                    company = company[len(prefix):].strip()
-
-            # Remove leading/trailing punctuation
-            company = company.strip('.-,;:|[](){}')
-
-            # Skip if empty after cleaning
-            if not company:
-                continue
-
-            # Skip if too short or too long
-            if len(company) < 3 or len(company) > 150:
-                continue
-
-            # Skip blacklisted terms
-            if company.lower() in blacklist:
-                continue
-
-            # Skip if it's a number
-            if company.isdigit():
-                continue
-
-            # Skip if it's mostly numbers (like "Page 2")
-            if sum(c.isdigit() for c in company) / len(company) > 0.5:
-                continue
-
-            # Skip URLs
-            if 'http' in company.lower() or 'www.' in company.lower():
-                continue
-
-            # Deduplicate (case insensitive)
-            company_lower = company.lower()
-            if company_lower not in seen:
-                cleaned.append(company)
-                seen.add(company_lower)
-
-        return cleaned
+        return found_companies
 
-    def find_pagination_links(self, current_url):
+    def find_pagination_links(self, current_url, html=None):
         """
         Find pagination links with intelligent pattern detection
         Supports multiple pagination styles
+
+        Args:
+            current_url: URL of the page
+            html: Page HTML when it was fetched without the browser
+                  (None = read the driver's page source)
         """
         try:
-            soup = BeautifulSoup(self.driver.page_source, 'lxml')
+            from_browser = html is None
+            soup = BeautifulSoup(self.driver.page_source if from_browser else html, 'lxml')
             pagination_links = []
             parsed_url = urlparse(current_url)
 
@@ -390,26 +395,28 @@ class UniversalScraper:
                             pagination_links.append(absolute_url)
 
             # Strategy 5: Selenium-based "Next" button click detection
-            try:
-                next_button_xpaths = [
-                    "//a[contains(@class, 'next')]",
-                    "//a[contains(text(), 'Suivant')]",
-                    "//a[contains(text(), 'Next')]",
-                    "//button[contains(@class, 'next')]",
-                    "//a[@rel='next']"
-                ]
-
-                for xpath in next_button_xpaths:
-                    try:
-                        buttons = self.driver.find_elements(By.XPATH, xpath)
-                        for btn in buttons[:2]:  # Max 2 buttons
-                            href = btn.get_attribute('href')
-                            if href and href not in self.visited_urls and href not in pagination_links:
-                                pagination_links.append(href)
-                    except:
-                        continue
-            except:
-                pass
+            # (only when the page was loaded in the browser)
+            if from_browser:
+                try:
+                    next_button_xpaths = [
+                        "//a[contains(@class, 'next')]",
+                        "//a[contains(text(), 'Suivant')]",
+                        "//a[contains(text(), 'Next')]",
+                        "//button[contains(@class, 'next')]",
+                        "//a[@rel='next']"
+                    ]
+
+                    for xpath in next_button_xpaths:
+                        try:
+                            buttons = self.driver.find_elements(By.XPATH, xpath)
+                            for btn in buttons[:2]:  # Max 2 buttons
+                                href = btn.get_attribute('href')
+                                if href and href not in self.visited_urls and href not in pagination_links:
+                                    pagination_links.append(href)
+                        except:
+                            continue
+                except:
+                    pass
 
             # Remove duplicates while preserving order
             seen = set()
@@ -426,7 +433,7 @@ class UniversalScraper:
             logger.debug(f"Error finding pagination: {e}")
             return []
 
-    def scrape_url(self, url, max_pages=10, progress_callback=None):
+    def scrape_url(self, url, max_pages=10, progress_callback=None, rows_callback=None):
         """
         Scrape a URL and automatically handle pagination
 
@@ -434,19 +441,21 @@ class UniversalScraper:
             url: Starting URL
             max_pages: Maximum number of pages to scrape
             progress_callback: Function to call with progress updates
+            rows_callback: Optional callback(names) with the new unique names of each page
 
         Returns:
             List of company names
         """
-        logger.info(f"Starting scrape of: {url}")
+        if self.max_workers > 1:
+            return self.crawl_concurrent(url, max_pages, progress_callback, rows_callback)
 
-        if not self.driver:
-            self.setup_driver()
+        logger.info(f"Starting scrape of: {url}")
 
         self.companies = []
         self.visited_urls = set()
         pages_to_visit = [url]
         pages_scraped = 0
+        seen = set()
 
         while pages_to_visit and pages_scraped < max_pages:
             current_url = pages_to_visit.pop(0)
@@ -460,22 +469,12 @@ class UniversalScraper:
                 if progress_callback:
                     progress_callback(pages_scraped + 1, max_pages, f"Scraping: {current_url[:50]}...")
 
-                # Load the page
-                self.driver.get(current_url)
-                time.sleep(2)  # Wait for JavaScript
-
-                # Accept cookies if present
-                self.accept_cookies()
-
-                # Scroll to load lazy content
-                self.scroll_page()
-
-                # Extract company names
-                html = self.driver.page_source
-                companies = self.extract_company_names(html)
+                # Load the page (static HTTP or browser) and extract company names
+                html, companies, via_browser = self.load_page(current_url)
 
                 logger.info(f"Found {len(companies)} potential companies on this page")
                 self.companies.extend(companies)
+                self._report_new(companies, seen, rows_callback)
 
                 # Mark as visited
                 self.visited_urls.add(current_url)
@@ -483,7 +482,7 @@ class UniversalScraper:
 
                 # Find pagination links for next pages
                 if pages_scraped < max_pages:
-                    next_links = self.find_pagination_links(current_url)
+                    next_links = self.find_pagination_links(current_url, None if via_browser else html)
                     pages_to_visit.extend(next_links)
 
                 time.sleep(1)  # Be respectful
@@ -498,6 +497,186 @@ class UniversalScraper:
         logger.info(f"Total unique companies found: {len(unique_companies)}")
         return unique_companies
 
+    @staticmethod
+    def _report_new(companies, seen, rows_callback):
+        """Pass the names not reported yet to rows_callback (completion order, the result keeps discovery order)"""
+        if not rows_callback:
+            return
+        new = [name for name in dict.fromkeys(companies) if name not in seen]
+        seen.update(new)
+        if new:
+            rows_callback(new)
+
+    def crawl_concurrent(self, url, max_pages=10, progress_callback=None, rows_callback=None):
+        """
+        Bounded-concurrency version of scrape_url
+
+        Pagination links are fetched in parallel by a worker pool (static pages
+        only run concurrently; browser pages share the single WebDriver). Each
+        host is protected by self.host_limiter, and results are merged in
+        discovery order, not completion order.
+
+        Returns:
+            List of company names
+        """
+        logger.info(f"Starting concurrent scrape of: {url} ({self.max_workers} workers)")
+
+        self.companies = []
+        self.visited_urls = set()
+
+        frontier = deque([(0, url)])  # (discovery order, url)
+        queued = {url}
+        next_order = 1
+        page_results = {}
+        in_flight = {}
+        pages_scraped = 0
+        seen = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while frontier or in_flight:
+                # Schedule without overshooting max_pages (failed pages free their slot)
+                while (frontier and len(in_flight) < self.max_workers
+                       and pages_scraped + len(in_flight) < max_pages):
+                    order, page_url = frontier.popleft()
+                    logger.info(f"Scraping page {order + 1}: {page_url}")
+                    in_flight[pool.submit(self._crawl_page, page_url)] = (order, page_url)
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    order, page_url = in_flight.pop(future)
+                    try:
+                        companies, next_links = future.result()
+                    except Exception as e:
+                        logger.error(f"Error scraping {page_url}: {e}")
+                        continue
+
+                    logger.info(f"Found {len(companies)} potential companies on {page_url}")
+                    page_results[order] = companies
+                    self.visited_urls.add(page_url)
+                    pages_scraped += 1
+                    self._report_new(companies, seen, rows_callback)
+
+                    if progress_callback:
+                        progress_callback(pages_scraped, max_pages, f"Scraped: {page_url[:50]}...")
+
+                    for link in next_links:
+                        if link not in queued:
+                            queued.add(link)
+                            frontier.append((next_order, link))
+                            next_order += 1
+
+        # Ordered merge
+        for order in sorted(page_results):
+            self.companies.extend(page_results[order])
+
+        unique_companies = list(dict.fromkeys(self.companies))
+
+        logger.info(f"Total unique companies found: {len(unique_companies)}")
+        return unique_companies
+
+    def _crawl_page(self, url):
+        """Worker: load one page, return (company_names, pagination_links)"""
+        # Pages that may go through the browser hold the driver for load + pagination
+        may_use_browser = self.fetch_mode != FETCH_HTTP and get_domain_fetch_mode(url) != FETCH_HTTP
+        with self._browser_lock if may_use_browser else nullcontext():
+            html, companies, via_browser = self.load_page(url)
+            next_links = self.find_pagination_links(url, None if via_browser and may_use_browser else html)
+        return companies, next_links
+
+    def load_page(self, url):
+        """
+        Load a page with the cheapest method that yields company names
+
+        Hybrid mode: static HTTP first, promoted to Selenium when the HTML is
+        JS-rendered (whole domain) or gives no candidates (this URL). The
+        decision is cached per domain.
+
+        Returns:
+            (html, company_names, via_browser)
+        """
+        if self.fetch_mode == FETCH_BROWSER:
+            return self.load_page_with_browser(url)
+
+        domain_mode = get_domain_fetch_mode(url) if self.fetch_mode == FETCH_HYBRID else FETCH_HTTP
+        if domain_mode == FETCH_BROWSER:
+            return self.load_page_with_browser(url)
+
+        html = self.fetch_static(url)
+        if html is None:
+            if self.fetch_mode == FETCH_HTTP:
+                raise RuntimeError(f"Static fetch failed for {url}")
+            return self.load_page_with_browser(url)
+
+        if self.fetch_mode == FETCH_HTTP:
+            return html, self.extract_company_names(html), False
+
+        # Static extraction first: SPA markers on a server-rendered page are harmless
+        companies = self.extract_company_names(html)
+        if companies:
+            if domain_mode is None:
+                set_domain_fetch_mode(url, FETCH_HTTP)
+            return html, companies, False
+
+        # Nothing extracted and the domain renders client-side: everything goes through the browser
+        if domain_mode is None and looks_js_rendered(html):
+            logger.info(f"JS-rendered page, promoting {urlparse(url).netloc} to Selenium")
+            set_domain_fetch_mode(url, FETCH_BROWSER)
+            return self.load_page_with_browser(url)
+
+        # Static HTML gave nothing: retry this URL in the browser
+        logger.info(f"No candidates in static HTML, retrying with Selenium: {url}")
+        browser_result = self.load_page_with_browser(url)
+        if domain_mode is None:
+            set_domain_fetch_mode(url, FETCH_BROWSER if browser_result[1] else FETCH_HTTP)
+        return browser_result
+
+    def fetch_static(self, url):
+        """Fetch a page with the pooled HTTP session, None if it isn't usable HTML"""
+        try:
+            with self.host_limiter.slot(url):
+                response = self.session.get(url, timeout=self.http_timeout)
+            if response.status_code != 200:
+                logger.debug(f"Static fetch {url}: HTTP {response.status_code}")
+                return None
+            if 'html' not in response.headers.get('Content-Type', 'text/html').lower():
+                return None
+            # Honours the HTTP charset, then <meta charset>, then detection
+            encodings = [response.encoding] if 'charset' in response.headers.get('Content-Type', '').lower() else []
+            return UnicodeDammit(response.content, encodings, is_html=True).unicode_markup
+        except requests.RequestException as e:
+            logger.debug(f"Static fetch error for {url}: {e}")
+            return None
+
+    def load_page_with_browser(self, url):
+        """Load a page in Selenium (cookies, lazy loading) and extract company names"""
+        with self._browser_lock:
+            if not self.driver:
+                self.setup_driver()
+
+            start = time.monotonic()
+            enable_resource_blocking(self.driver, url)
+            self.driver.get(url)
+            ready = wait_until_ready(self.driver, url, label='load')  # Wait for JavaScript
+
+            # Accept cookies if present
+            self.accept_cookies()
+
+            # Scroll to load lazy content
+            self.scroll_page()
+
+            html = self.driver.page_source
+
+            self.page_timings.append({
+                'url': url,
+                'ready': ready['ready'],
+                'ready_wait': ready['elapsed'],
+                'total': round(time.monotonic() - start, 3)
+            })
+        return html, self.extract_company_names(html), True
+
     def accept_cookies(self):
         """Try to accept cookie consent"""
         try:
@@ -514,7 +693,7 @@ class UniversalScraper:
                 try:
                     button = self.driver.find_element(By.XPATH, selector)
                     button.click()
-                    time.sleep(0.5)
+                    wait_for_dom_quiet(self.driver, quiet_ms=200, timeout=2, label='cookies')
                     return
                 except:
                     continue
@@ -524,18 +703,17 @@ class UniversalScraper:
     def scroll_page(self):
         """Scroll page to trigger lazy loading"""
         try:
-            # Scroll to bottom
+            # Scroll to bottom and wait for lazy content to settle
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            wait_for_dom_quiet(self.driver, quiet_ms=300, timeout=3, label='scroll')
 
             # Scroll back to top
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.5)
         except:
             pass
 
 
-def scrape_companies_from_url(url, max_pages=10, progress_callback=None):
+def scrape_companies_from_url(url, max_pages=10, progress_callback=None, rows_callback=None):
     """
     Convenience function to scrape companies from a URL
 
@@ -543,6 +721,7 @@ def scrape_companies_from_url(url, max_pages=10, progress_callback=None):
         url: Starting URL
         max_pages: Maximum pages to scrape
         progress_callback: Optional callback for progress updates
+        rows_callback: Optional callback(companies) with each page's new companies ({'name'} dicts)
 
     Returns:
         List of company dictionaries with 'name' key
@@ -550,7 +729,8 @@ def scrape_companies_from_url(url, max_pages=10, progress_callback=None):
     scraper = UniversalScraper(headless=True)
 
     try:
-        company_names = scraper.scrape_url(url, max_pages, progress_callback)
+        page_rows = (lambda names: rows_callback([{'name': name} for name in names])) if rows_callback else None
+        company_names = scraper.scrape_url(url, max_pages, progress_callback, page_rows)
 
         # Convert to standard format
         companies = [{'name': name} for name in company_names]